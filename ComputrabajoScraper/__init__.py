@@ -1,8 +1,12 @@
 """
 Computrabajo Mexico Job Scraper Package
 """
-from .scraper import scrape_jobs_computrabajo, ComputrabajoScraper
+from .scraper import (ComputrabajoScraper, iter_jobs, iter_jobs_concurrent, scrape_jobs, scrape_jobs_computrabajo,
+                      scrape_jobs_concurrent)
+from .filters import JobFilters, build_filters
+from .writer import JobWriter
 
 __version__ = "1.0.0"
 __author__ = "Your Name"
-__all__ = ["scrape_jobs_computrabajo", "ComputrabajoScraper"] 
\ No newline at end of file
+__all__ = ["iter_jobs", "iter_jobs_concurrent", "scrape_jobs", "scrape_jobs_computrabajo", "scrape_jobs_concurrent",
+           "ComputrabajoScraper", "JobWriter", "JobFilters", "build_filters"] 
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Staged job filters for the Computrabajo crawl
+
+Listing-stage predicates only look at fields of the offer card (title,
+location, company) and run before a job's detail page is requested, so a
+rejected job never costs a network round trip. Detail-stage predicates need
+the description and run once it has been fetched.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ScraperCommon.matching import TermMatcher, is_hr_related, is_mexico_location
+
+Predicate = Callable[[Dict], bool]
+
+
+def title_blacklist(terms: Iterable[str]) -> Predicate:
+    """Reject jobs whose title contains any of terms"""
+    matcher = TermMatcher(terms)
+    return lambda job: not matcher.search(job["title"])
+
+
+def title_whitelist(terms: Iterable[str]) -> Predicate:
+    """Keep only jobs whose title contains one of terms"""
+    matcher = TermMatcher(terms)
+    return lambda job: matcher.search(job["title"])
+
+
+class JobFilters:
+    """Listing and detail predicates, with counts of what each one rejected"""
+
+    def __init__(self, listing: Optional[List[Tuple[str, Predicate]]] = None,
+                 detail: Optional[List[Tuple[str, Predicate]]] = None):
+        self.listing = listing if listing is not None else [
+            ("location", lambda job: is_mexico_location(job["location"])),
+        ]
+        self.detail = detail if detail is not None else [
+            ("hr", lambda job: is_hr_related(job["title"], job["description"])),
+        ]
+        self.checked = 0
+        self.accepted = 0
+        # Jobs rejected before their detail page was requested
+        self.requests_saved = 0
+        self.rejected: Dict[str, int] = {name: 0 for name, _ in self.listing + self.detail}
+
+    def _first_failure(self, stage: List[Tuple[str, Predicate]], job: Dict) -> Optional[str]:
+        for name, predicate in stage:
+            if not predicate(job):
+                self.rejected[name] = self.rejected.get(name, 0) + 1
+                return name
+        return None
+
+    def accept_listing(self, job: Dict, has_detail: bool = True) -> bool:
+        """Run the listing-stage predicates on a job parsed from its card"""
+        self.checked += 1
+        if self._first_failure(self.listing, job) is None:
+            return True
+        if has_detail:
+            self.requests_saved += 1
+        return False
+
+    def accept_detail(self, job: Dict) -> bool:
+        """Run the detail-stage predicates once the job's description is known"""
+        if self._first_failure(self.detail, job) is None:
+            self.accepted += 1
+            return True
+        return False
+
+    def stats(self) -> Dict:
+        return {
+            "checked": self.checked,
+            "accepted": self.accepted,
+            "requests_saved": self.requests_saved,
+            "rejected": dict(self.rejected),
+        }
+
+
+def build_filters(blacklist: Iterable[str] = (), whitelist: Optional[Iterable[str]] = None) -> JobFilters:
+    """Default filters plus optional title blacklist / whitelist at the listing stage"""
+    filters = JobFilters()
+    blacklist = list(blacklist)
+    if blacklist:
+        filters.listing.append(("title_blacklist", title_blacklist(blacklist)))
+    if whitelist:
+        filters.listing.append(("title_whitelist", title_whitelist(whitelist)))
+    filters.rejected = {name: 0 for name, _ in filters.listing + filters.detail}
+    return filters
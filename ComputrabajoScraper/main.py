@@ -1,14 +1,44 @@
 import asyncio
 import re
 import os
+import sys
 
-from models import init_db, save_jobs_to_db
-from scraper import scrape_jobs
+# Make the shared ScraperCommon package importable when run from this folder
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from ScraperCommon.http_cache import HttpCache
+from ScraperCommon.rate_limiter import HostRateLimiter
+from ScraperCommon.retry_queue import RetryQueue, drain_retry_queue
+from filters import build_filters
+from models import init_db, load_known_links
+from scraper import computrabajo_retry_handlers, make_client, scrape_jobs, scrape_jobs_concurrent
+from writer import JobWriter
+
+# Detail page cache shared with the OCC runners
+HTTP_CACHE_DIR = os.path.join(PROJECT_ROOT, "exports", "http_cache")
+
+# Failed pages are kept here and retried with backoff instead of being dropped
+RETRY_QUEUE_FILE = os.path.join(PROJECT_ROOT, "exports", "retry_queue.db")
+
+# Keep jobs.db and skip the detail request of every job it already holds;
+# set to False to wipe the database and crawl everything from scratch
+INCREMENTAL = True
+
+# Crawl all keywords' pages at once with a worker pool over one pooled client;
+# set to False to scrape keywords one after another
+CONCURRENT = True
+WORKERS = 8  # Listing pages processed in parallel
+PER_HOST = 4  # Requests in flight to mx.computrabajo.com at once
+PAGES_PER_KEYWORD = 25
+
+# Jobs whose card title contains one of these are dropped before their detail page is requested
+TITLE_BLACKLIST = []
 
 
 async def main():
     # Clear existing database to start fresh
-    if os.path.exists("jobs.db"):
+    if not INCREMENTAL and os.path.exists("jobs.db"):
         os.remove("jobs.db")
         print("🗑️ Base de datos anterior eliminada.")
     
@@ -28,13 +58,40 @@ async def main():
     ]
     
     all_jobs = []
+    # Shared across keywords so each job's detail page is fetched once
+    known_links = await load_known_links() if INCREMENTAL else set()
+    if INCREMENTAL:
+        print(f"📂 Modo incremental: {len(known_links)} vacantes ya guardadas serán omitidas")
+    cache = HttpCache(HTTP_CACHE_DIR)
+    # Learns how fast Computrabajo can be crawled; shared so every keyword starts at that pace
+    limiter = HostRateLimiter()
+    retry_queue = RetryQueue(RETRY_QUEUE_FILE)
+    # Location and title are checked on the listing card, the HR check once the description is in
+    filters = build_filters(TITLE_BLACKLIST)
     
-    for keyword in hr_keywords:
-        print(f"\n🔍 Buscando vacantes para: {keyword.replace('-', ' ')}")
-        # Search many more pages to capture more results
-        jobs = await scrape_jobs(keyword, pages=25)  # Increased from 10 to 25 pages
-        all_jobs.extend(jobs)
-        print(f"✅ Encontradas {len(jobs)} vacantes de {keyword}")
+    # Pages are saved in the background while the next ones are scraped
+    async with JobWriter() as writer:
+        if CONCURRENT:
+            print(f"\n🔍 Buscando {len(hr_keywords)} palabras clave en paralelo ({WORKERS} workers)")
+            all_jobs = await scrape_jobs_concurrent(hr_keywords, pages=PAGES_PER_KEYWORD, workers=WORKERS,
+                                                    per_host=PER_HOST, known_links=known_links, cache=cache,
+                                                    writer=writer, limiter=limiter, retry_queue=retry_queue,
+                                                    filters=filters)
+        else:
+            for keyword in hr_keywords:
+                print(f"\n🔍 Buscando vacantes para: {keyword.replace('-', ' ')}")
+                # Search many more pages to capture more results
+                jobs = await scrape_jobs(keyword, pages=PAGES_PER_KEYWORD, known_links=known_links, cache=cache, writer=writer,
+                                         limiter=limiter, retry_queue=retry_queue, filters=filters)
+                all_jobs.extend(jobs)
+                print(f"✅ Encontradas {len(jobs)} vacantes de {keyword}")
+        
+        # Give the pages that failed (in this run or earlier ones) another try
+        async with make_client() as client:
+            handlers = computrabajo_retry_handlers(client, known_links, cache, limiter, writer, retry_queue, filters)
+            retried = await drain_retry_queue(retry_queue, handlers)
+        print(f"🔁 Reintentos: {retried['recovered']} recuperadas, {retried['failed']} fallidas, "
+              f"{retried['skipped']} en espera (circuito abierto)")
     
     # Remove duplicates based on link
     unique_jobs = []
@@ -45,23 +102,42 @@ async def main():
             seen_links.add(job["link"])
     
     print(f"\n📊 Total de vacantes únicas encontradas: {len(unique_jobs)}")
+    cache_stats = cache.stats()
+    print(f"🗄️ Caché de detalles: {cache_stats['hits']} aciertos, {cache_stats['revalidated']} revalidados, {cache_stats['misses']} descargados")
+    for host, rate in limiter.rates().items():
+        print(f"🚦 Ritmo final para {host}: {rate:.2f} peticiones/s ({limiter.throttled} frenadas)")
+    filter_stats = filters.stats()
+    rejected = ", ".join(f"{name}: {count}" for name, count in filter_stats["rejected"].items())
+    print(f"🧹 Filtros: {filter_stats['accepted']} aceptadas de {filter_stats['checked']} ({rejected}); "
+          f"{filter_stats['requests_saved']} peticiones de detalle evitadas")
+    retry_stats = retry_queue.stats()
+    print(f"🔁 Cola de reintentos: {retry_stats['pending']} pendientes, {retry_stats['recovered']} recuperadas, "
+          f"{retry_stats['gave_up']} abandonadas")
+    retry_queue.close()
+    counts = writer.stats()
+    if counts["errors"]:
+        print(f"❌ {counts['lost']} vacantes no se pudieron guardar en la base de datos "
+              f"({counts['errors']} lotes fallidos tras los reintentos)")
     
     if unique_jobs:
-        await save_jobs_to_db(unique_jobs)
-        print("✅ Trabajos guardados en la base de datos.")
+        print(f"✅ Trabajos guardados en la base de datos: {counts['inserted']} nuevos, "
+              f"{counts['skipped']} ya existían ({counts['batches']} transacciones).")
         
         # Show some statistics
         locations = [job["location"] for job in unique_jobs]
-        mexico_city_jobs = [loc for loc in locations if "ciudad de méxico" in loc.lower() or "cdmx" in loc.lower()]
+        mexico_city_jobs = [loc for loc in locations if loc and ("ciudad de méxico" in loc.lower() or "cdmx" in loc.lower())]
         print(f"📍 Vacantes en Ciudad de México: {len(mexico_city_jobs)}")
         
         # Company statistics
-        companies = [job["company"] for job in unique_jobs if job["company"] != "No especificado"]
+        companies = [job["company"] for job in unique_jobs if job["company"]]
         unique_companies = len(set(companies))
         print(f"🏢 Empresas únicas: {unique_companies}")
         
     else:
         print("❌ No se encontraron vacantes que cumplan los criterios.")
+    
+    # Código de salida distinto de cero si se perdieron vacantes al guardar
+    return 1 if counts["errors"] else 0
 
 
-asyncio.run(main())
+sys.exit(asyncio.run(main()))
@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ScraperCommon.job_record import JOB_FIELDS, JobRecord
 
 # Configuración de la base de datos SQLite
 DATABASE_URL = "sqlite+aiosqlite:///jobs.db"
-engine = create_async_engine(DATABASE_URL, echo=False)
+# Espera hasta 30 s por el bloqueo de escritura cuando varios procesos guardan a la vez
+engine = create_async_engine(DATABASE_URL, echo=False, connect_args={"timeout": 30})
 SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -33,22 +37,62 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
 
 
+# Columnas que se escriben desde cada vacante (JobRecord o diccionario)
+JOB_COLUMNS = JOB_FIELDS
+
+# 8 columnas x 100 filas se mantiene bajo el límite de 999 parámetros de SQLite
+DEFAULT_CHUNK_SIZE = 100
+
+
+def _job_row(job):
+    row = JobRecord.from_dict(job).to_row()
+    row["source"] = row["source"] or "Computrabajo"
+    return row
+
+
+async def bulk_upsert_jobs(jobs, on_conflict="nothing", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write jobs with one INSERT ... ON CONFLICT(link) statement per chunk
+
+    on_conflict="nothing" keeps rows already stored, "update" overwrites them
+    with the new values. Returns {"inserted": n, "skipped": m}; in "update"
+    mode "inserted" also counts rows that were updated.
+    """
+    if on_conflict not in ("nothing", "update"):
+        raise ValueError(f"on_conflict must be 'nothing' or 'update', got {on_conflict!r}")
+
+    # Jobs without a link cannot be stored (link is the unique key) and count as skipped
+    all_rows = [_job_row(job) for job in jobs]
+    rows = [row for row in all_rows if row["link"]]
+    linkless = len(all_rows) - len(rows)
+    if not rows:
+        return {"inserted": 0, "skipped": linkless}
+
+    inserted = 0
+    async with engine.begin() as conn:
+        for start in range(0, len(rows), chunk_size):
+            statement = sqlite_insert(JobListingDB.__table__).values(rows[start:start + chunk_size])
+            if on_conflict == "update":
+                statement = statement.on_conflict_do_update(
+                    index_elements=["link"],
+                    set_={column: statement.excluded[column] for column in JOB_COLUMNS if column != "link"},
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=["link"])
+            result = await conn.execute(statement)
+            inserted += result.rowcount
+    return {"inserted": inserted, "skipped": len(rows) - inserted + linkless}
+
+
 async def save_jobs_to_db(jobs):
+    """Insert new jobs, leaving the ones already stored untouched"""
+    return await bulk_upsert_jobs(jobs, on_conflict="nothing")
+
+
+async def load_known_links(source=None):
+    """Return the set of job links already stored, optionally only for one source"""
+    query = select(JobListingDB.link)
+    if source:
+        query = query.where(JobListingDB.source == source)
     async with SessionLocal() as session:
-        for job in jobs:
-            existing_job = await session.execute(
-                JobListingDB.__table__.select().where(JobListingDB.link == job["link"])
-            )
-            if existing_job.scalar_one_or_none() is None:
-                new_job = JobListingDB(
-                    title=job["title"],
-                    company=job["company"],
-                    location=job["location"],
-                    salary=job["salary"],
-                    modality=job["modality"],
-                    link=job["link"],
-                    description=job["description"],
-                    source=job.get("source", "Computrabajo"),
-                )
-                session.add(new_job)
-        await session.commit()
+        result = await session.execute(query)
+        return set(result.scalars().all())
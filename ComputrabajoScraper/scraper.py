@@ -1,190 +1,452 @@
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 import asyncio
-import random
 import time
-from models import save_jobs_to_db
+from urllib.parse import urlparse
+
+from ScraperCommon.job_record import JobRecord, Source
+from ScraperCommon.parsing import make_soup
+from ScraperCommon.rate_limiter import HostRateLimiter
+from ScraperCommon.sources import JobSource
+
+try:
+    from .filters import JobFilters
+    from .models import bulk_upsert_jobs, save_jobs_to_db
+except ImportError:  # Run as a script from inside this folder
+    from filters import JobFilters
+    from models import bulk_upsert_jobs, save_jobs_to_db
 
 BASE_URL = "https://mx.computrabajo.com"
 
+# Description of a job whose detail page raised an error
+DESCRIPTION_ERROR = "Error al obtener descripción"
+
+# Header necesario para simular que la petición la hace un navegador web
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+}
+
+# Only the offer cards are needed from a listing page
+OFFER_STRAINER = SoupStrainer("article", class_="box_offer")
+
+
+def parse_listing_page(html, backend=None):
+    """Return the offer cards of a listing page"""
+    soup = make_soup(html, backend, parse_only=OFFER_STRAINER)
+    return soup.find_all("article", class_="box_offer")
+
+
+def parse_article(article):
+    """Extract the listing fields of an offer card (everything but the description)"""
+    title_tag = article.find("a", class_="js-o-link fc_base")
+    
+    # Improved company extraction with multiple selectors
+    company_tag = None
+    company_selectors = [
+        article.find("a", attrs={"offer-grid-article-company-url": ""}),
+        article.find("a", class_="fc_base"),
+        article.find("span", class_="fs16"),
+        article.find("p", class_="fs16"),
+        article.find("div", class_="fs16")
+    ]
+    
+    for selector in company_selectors:
+        if selector and selector != title_tag:
+            company_tag = selector
+            break
+    
+    location_tag = article.find("p", class_="fs16 fc_base mt5")
+    salary_tag = article.find("span", class_="icon i_salary")
+    modality_tag = article.find("span", class_="icon i_home_office")
+
+    # Obtener la URL real de la oferta
+    job_url = BASE_URL + title_tag["href"] if title_tag else None
+
+    return JobRecord(
+        title=title_tag.text.strip() if title_tag else None,
+        company=company_tag.text.strip() if company_tag else None,
+        location=location_tag.text.strip() if location_tag else None,
+        salary=salary_tag.next_sibling.strip() if salary_tag else None,
+        modality=modality_tag.next_sibling.strip() if modality_tag else None,
+        link=job_url,
+        description=None,
+        source=Source.COMPUTRABAJO,
+    )
+
+
+def detail_url(job):
+    """URL to request for a job's detail page, or None if the card had no link"""
+    if not job["link"]:
+        return None
+    return job["link"].replace("\t", "/t")
+
+
+def parse_description(html, backend=None):
+    """Extract the description text of a job detail page"""
+    desc_soup = make_soup(html, backend)
+    desc_div = desc_soup.find(
+        "p", class_="mbB"
+    )  # Se ajusta de acuerdo al contenedor que tiene la información de la vacante, en este momento es el p con la clase mbB
+    if not desc_div:
+        desc_div = desc_soup.find(
+            "div", {"id": "job-description"}
+        )  # Alternativa
+
+    return desc_div.text.strip() if desc_div else None
+
+
+async def fetch_detail(client, url, headers, cache=None):
+    """GET a job detail page, through the on-disk cache when one is given"""
+    if cache is not None:
+        return await cache.get(client, url, headers=headers, timeout=30.0)
+    return await client.get(url, headers=headers, timeout=30.0)
+
+
+class HostSlots:
+    """Caps how many requests are in flight to each host at once"""
+
+    def __init__(self, per_host=4):
+        self.per_host = per_host
+        self._semaphores = {}
+
+    def slot(self, url):
+        host = urlparse(url).hostname or ""
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return self._semaphores[host]
+
+
+async def _request(limiter, host_slots, url, send):
+    """Await send() paced by limiter and within url's host slot (either may be None)"""
+    if host_slots is None:
+        return await _paced(limiter, url, send)
+    async with host_slots.slot(url):
+        return await _paced(limiter, url, send)
+
+
+async def _paced(limiter, url, send):
+    if limiter is None:
+        return await send()
+    return await limiter.request(url, send)
+
+
+def make_client(http2=True, max_connections=20, max_keepalive_connections=10):
+    """Pooled httpx client for concurrent crawls
+
+    HTTP/2 multiplexes requests over a single connection per host and is used
+    when the optional h2 package is installed; otherwise the client falls back
+    to HTTP/1.1 keep-alive connections.
+    """
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            http2 = False
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=30.0,
+    )
+    return httpx.AsyncClient(http2=http2, limits=limits, headers=HEADERS, timeout=30.0)
+
+
+async def scrape_listing_page(client, keyword, page, known_links=None, cache=None, host_slots=None, limiter=None,
+                              retry_queue=None, filters=None):
+    """Fetch one listing page and the detail pages of its new jobs
+
+    Requests are paced by limiter (a ScraperCommon HostRateLimiter) when given;
+    cached detail pages never wait for it. Pages that fail are added to
+    retry_queue when given. Returns (jobs, new_count, known_count), or None if
+    the listing page could not be fetched. Only jobs passing filters (a
+    JobFilters; by default in Mexico and HR related) are returned, and jobs
+    its listing stage rejects get no detail request.
+    """
+    filters = filters or JobFilters()
+    url = f"{BASE_URL}/trabajo-de-{keyword}?p={page}"
+    try:
+        response = await _request(limiter, host_slots, url, lambda: client.get(url, headers=HEADERS, timeout=30.0))
+        if response.status_code != 200:
+            print(f"Error al obtener la página {page}: Status {response.status_code}")
+            _queue_retry(retry_queue, url, "computrabajo_listing", {"keyword": keyword, "page": page},
+                         f"HTTP {response.status_code}")
+            return None
+    except Exception as e:
+        print(f"Error al obtener la página {page}: {str(e)}")
+        _queue_retry(retry_queue, url, "computrabajo_listing", {"keyword": keyword, "page": page}, e)
+        return None
+
+    articles = parse_listing_page(response.text)
+
+    page_jobs = []
+    new_count = 0
+    known_count = 0
+    for article in articles:
+        job = parse_article(article)
+        if known_links is not None and job["link"]:
+            if job["link"] in known_links:
+                known_count += 1
+                continue
+            known_links.add(job["link"])
+        new_count += 1
+        clean_job_url = detail_url(job)
+        # Card fields are enough to reject most jobs before their detail request
+        if not filters.accept_listing(job, has_detail=clean_job_url is not None):
+            continue
+
+        # Obtener la descripción (segunda petición)
+        if clean_job_url:
+            cached_html = cache.lookup(clean_job_url) if cache is not None else None
+            if cached_html is not None:
+                job["description"] = parse_description(cached_html)
+            else:
+                try:
+                    desc_response = await _request(
+                        limiter, host_slots, clean_job_url, lambda: fetch_detail(client, clean_job_url, HEADERS, cache)
+                    )
+                    if desc_response.status_code == 200:
+                        job["description"] = parse_description(desc_response.text)
+                    else:
+                        _queue_retry(retry_queue, clean_job_url, "computrabajo_detail", job,
+                                     f"HTTP {desc_response.status_code}")
+                except Exception as e:
+                    job["description"] = DESCRIPTION_ERROR
+                    _queue_retry(retry_queue, clean_job_url, "computrabajo_detail", job, e)
+        
+        if filters.accept_detail(job):
+            page_jobs.append(job)
+    return page_jobs, new_count, known_count
+
+
+def _queue_retry(retry_queue, url, kind, context, error):
+    if retry_queue is not None:
+        retry_queue.add(url, kind, dict(context), str(error))
+
+
+async def _save_page(page_jobs, writer=None):
+    """Save a page's jobs, in the background when a JobWriter is given"""
+    if writer is not None:
+        await writer.put(page_jobs)
+    else:
+        await save_jobs_to_db(page_jobs)
+    for job in page_jobs:
+        print(f"{job['title']} | {job['company']} | {job['location']} | {job['salary']}")
+
+
+async def iter_jobs(keyword, pages=60, known_links=None, cache=None, writer=None, limiter=None, retry_queue=None,
+                    filters=None, save=True):
+    """Scrape Computrabajo listings for a keyword, yielding jobs page by page
 
-async def scrape_jobs(keyword, pages=60, location_filter="México"):
+    Each page's jobs are yielded as soon as their detail pages are in, so at
+    most one page of jobs is held at a time and the caller can persist, dedup
+    or stop early; closing the iterator stops the crawl. With save=False
+    pages are not saved and persisting is left to the caller. Other
+    arguments are those of scrape_jobs.
+    """
     print(f"[DEBUG] Starting scrape_jobs for {keyword}, {pages} pages")
-    # Header necesario para simular que la petición la hace un navegador web
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
-    }
-    jobs = []
+    limiter = limiter or HostRateLimiter()
+    filters = filters or JobFilters()
+    found = 0
     start_time = time.time()
 
     async with httpx.AsyncClient() as client:
         for page in range(1, pages + 1):
-            url = f"{BASE_URL}/trabajo-de-{keyword}?p={page}"
-            try:
-                response = await client.get(url, headers=headers, timeout=30.0)
-                if response.status_code != 200:
-                    print(f"Error al obtener la página {page}: Status {response.status_code}")
-                    continue
-            except Exception as e:
-                print(f"Error al obtener la página {page}: {str(e)}")
+            result = await scrape_listing_page(client, keyword, page, known_links, cache, limiter=limiter,
+                                               retry_queue=retry_queue, filters=filters)
+            if result is None:
                 continue
-
-            soup = BeautifulSoup(response.text, "html.parser")
-            articles = soup.find_all("article", class_="box_offer")
-
-            # Throttle between page requests
-            await asyncio.sleep(random.uniform(1, 4))
-
-            page_jobs = []
-            for article in articles:
-                title_tag = article.find("a", class_="js-o-link fc_base")
-                
-                # Improved company extraction with multiple selectors
-                company_tag = None
-                company_selectors = [
-                    article.find("a", attrs={"offer-grid-article-company-url": ""}),
-                    article.find("a", class_="fc_base"),
-                    article.find("span", class_="fs16"),
-                    article.find("p", class_="fs16"),
-                    article.find("div", class_="fs16")
-                ]
-                
-                for selector in company_selectors:
-                    if selector and selector != title_tag:
-                        company_tag = selector
-                        break
-                
-                location_tag = article.find("p", class_="fs16 fc_base mt5")
-                salary_tag = article.find("span", class_="icon i_salary")
-                modality_tag = article.find("span", class_="icon i_home_office")
-
-                # Obtener la URL real de la oferta
-                job_url = BASE_URL + title_tag["href"] if title_tag else None
-                clean_job_url = job_url.replace("\t", "/t") if job_url else None
-
-                # Obtener la descripción (segunda petición)
-                description = "No disponible"
-                if clean_job_url:
-                    try:
-                        desc_response = await client.get(clean_job_url, headers=headers, timeout=30.0)
-                        if desc_response.status_code == 200:
-                            desc_soup = BeautifulSoup(desc_response.text, "html.parser")
-                            desc_div = desc_soup.find(
-                                "p", class_="mbB"
-                            )  # Se ajusta de acuerdo al contenedor que tiene la información de la vacante, en este momento es el p con la clase mbB
-                            if not desc_div:
-                                desc_div = desc_soup.find(
-                                    "div", {"id": "job-description"}
-                                )  # Alternativa
-
-                            description = (
-                                desc_div.text.strip() if desc_div else "No disponible"
-                            )
-                    except Exception as e:
-                        description = "Error al obtener descripción"
-                    # Throttle between job detail requests
-                    await asyncio.sleep(random.uniform(1, 2))
-
-                job = {
-                    "title": title_tag.text.strip() if title_tag else "No especificado",
-                    "company": (
-                        company_tag.text.strip() if company_tag else "No especificado"
-                    ),
-                    "location": (
-                        location_tag.text.strip() if location_tag else "No especificado"
-                    ),
-                    "salary": (
-                        salary_tag.next_sibling.strip()
-                        if salary_tag
-                        else "No especificado"
-                    ),
-                    "modality": (
-                        modality_tag.next_sibling.strip()
-                        if modality_tag
-                        else "No especificado"
-                    ),
-                    "link": job_url if job_url else "No disponible",
-                    "description": description,
-                    "source": "Computrabajo",
-                }
-                
-                # Since we're already searching for HR keywords, we only need to filter by Mexico location
-                # and do a basic HR check to ensure relevance
-                if is_mexico_location(job["location"]) and is_hr_related(job["title"], job["description"]):
-                    page_jobs.append(job)
-            jobs.extend(page_jobs)
+            page_jobs, new_count, known_count = result
+            found += len(page_jobs)
+            if known_links is not None:
+                print(f"[Incremental] Page {page}: {new_count} new, {known_count} already known (detail requests skipped)")
             # Save progress after each page
-            if page_jobs:
-                await save_jobs_to_db(page_jobs)
-                for job in page_jobs:
-                    print(f"{job['title']} | {job['company']} | {job['location']} | {job['salary']}")
+            if page_jobs and save:
+                await _save_page(page_jobs, writer)
             # ETA calculation
             elapsed = time.time() - start_time
             avg_per_page = elapsed / page
             pages_left = pages - page
             eta = int(avg_per_page * pages_left)
             eta_min, eta_sec = divmod(eta, 60)
-            print(f"[Progress] Keyword: {keyword}, Page {page}/{pages}, Jobs so far: {len(jobs)}, ETA: {eta_min:02d}:{eta_sec:02d}")
-
-    return jobs
+            print(f"[Progress] Keyword: {keyword}, Page {page}/{pages}, Jobs so far: {found}, ETA: {eta_min:02d}:{eta_sec:02d}")
+            for job in page_jobs:
+                yield job
 
 
-def is_hr_related(title, description):
-    """Check if the job is related to Human Resources (more flexible)"""
-    hr_keywords = [
-        # Core HR terms
-        "recursos humanos", "rrhh", "hr", "human resources", 
-        "rh", "capital humano", "human capital",
-        
-        # Recruitment and selection
-        "reclutamiento", "selección", "recruitment", "selection",
-        "reclutador", "reclutadora", "seleccionador", "seleccionadora",
-        "talent acquisition", "adquisición de talento",
-        
-        # HR functions
-        "personal", "capacitación", "training", "desarrollo organizacional", 
-        "organizational development", "compensaciones", "compensation", 
-        "beneficios", "benefits", "nómina", "payroll", "relaciones laborales", 
-        "labor relations", "gestión del talento", "talent management",
-        
-        # HR roles
-        "analista", "coordinador", "coordinadora", "gerente", "director", 
-        "directora", "especialista", "consultor", "consultora", "ejecutivo", 
-        "ejecutiva", "auxiliar", "asistente", "generalista",
-        
-        # Specific HR terms
-        "onboarding", "inducción", "clima laboral", "organizational climate",
-        "evaluación de desempeño", "performance evaluation", "desarrollo de personal",
-        "personal development", "administración de personal", "personal administration"
-    ]
-    
-    title_lower = title.lower()
-    description_lower = description.lower()
+async def scrape_jobs(keyword, pages=60, location_filter="México", known_links=None, cache=None, writer=None,
+                      limiter=None, retry_queue=None, filters=None):
+    """Scrape Computrabajo listings for a keyword, fetching each job's detail page
     
-    # Check if any HR keyword is in title or description
-    return any(keyword in title_lower or keyword in description_lower for keyword in hr_keywords)
-
-
-def is_mexico_location(location):
-    """Check if the location is in Mexico"""
-    mexico_keywords = [
-        "méxico", "mexico", "cdmx", "ciudad de méxico", "guadalajara", "monterrey",
-        "puebla", "tijuana", "mérida", "merida", "querétaro", "queretaro", "juárez",
-        "juarez", "leon", "león", "toluca", "chihuahua", "morelia", "hermosillo", 
-        "saltillo", "aguascalientes", "zacatecas", "san luis potosí", "san luis potosi", 
-        "durango", "colima", "manzanillo", "acapulco", "cancún", "cancun", "puerto vallarta", 
-        "oaxaca", "tuxtla gutiérrez", "tuxtla gutierrez", "villahermosa", "campeche", 
-        "chetumal", "cozumel", "playa del carmen", "ensenada", "la paz", "los cabos", 
-        "mazatlán", "mazatlan", "culiacán", "culiacan", "nuevo laredo", "matamoros", 
-        "reynosa", "ciudad victoria", "tampico", "veracruz", "xalapa", "tuxtla", 
-        "chiapas", "tabasco", "yucatán", "yucatan", "quintana roo", "baja california", 
-        "baja california sur", "sonora", "coahuila", "nuevo león", "nuevo leon", 
-        "tamaulipas", "sinaloa", "jalisco", "michoacán", "michoacan", "guerrero", 
-        "morelos", "tlaxcala", "hidalgo", "guanajuato", "palenque", "benito juárez",
-        "miguel hidalgo", "cuauhtémoc", "iztapalapa", "tlalpan", "coyoacán", "coyoacan",
-        "alvaro obregón", "alvaro obregon", "magdalena contreras", "milpa alta", 
-        "tlahuac", "xochimilco", "venustiano carranza", "gustavo a. madero", "azcapotzalco"
+    Jobs whose link is already in known_links are skipped before their detail
+    request; links of processed jobs are added to it, so sharing one set across
+    keywords fetches every unique job only once. Detail pages go through cache
+    (a ScraperCommon HttpCache) when given. With a JobWriter, each page's jobs
+    are queued for a background save instead of being written inline. Pass a
+    shared HostRateLimiter to keep its learned rate across calls, and a
+    ScraperCommon RetryQueue to keep failed pages for a later retry. Pass a
+    shared JobFilters to choose the filters and collect their counts.
+    """
+    return [job async for job in iter_jobs(keyword, pages, known_links, cache, writer, limiter, retry_queue, filters)]
+
+
+async def iter_jobs_concurrent(keywords, pages=25, workers=8, per_host=4, known_links=None, cache=None,
+                               writer=None, http2=True, limiter=None, retry_queue=None, filters=None, save=True):
+    """Scrape the listing pages of several keywords with a bounded worker pool, yielding jobs
+
+    Every (keyword, page) pair is queued up front and `workers` tasks share one
+    pooled, HTTP/2-capable client to work through them, each fetching a listing
+    page and then its jobs' detail pages. At most per_host requests are in
+    flight to any one host, and limiter paces them to the rate the host
+    tolerates. Jobs are yielded in completion order; workers wait while a few
+    pages are waiting to be consumed, and closing the iterator (e.g. leaving
+    an `async with contextlib.aclosing(...)` block) cancels them. With
+    save=False pages are not saved and persisting is left to the caller.
+    """
+    queue = asyncio.Queue()
+    for keyword in keywords:
+        for page in range(1, pages + 1):
+            queue.put_nowait((keyword, page))
+    total = queue.qsize()
+    # Shared across workers so a job listed under two keywords is fetched once
+    known_links = known_links if known_links is not None else set()
+    host_slots = HostSlots(per_host)
+    limiter = limiter or HostRateLimiter()
+    filters = filters or JobFilters()
+    # Pages scraped but not consumed yet; a worker puts None when it is done, or the error that stopped it
+    results = asyncio.Queue(maxsize=workers)
+    found = 0
+    done = 0
+    start_time = time.time()
+
+    async def crawl(client):
+        nonlocal found, done
+        while True:
+            try:
+                keyword, page = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                result = await scrape_listing_page(client, keyword, page, known_links, cache, host_slots, limiter,
+                                                   retry_queue, filters)
+            except Exception as e:
+                print(f"Error en {keyword} página {page}: {str(e)}")
+                result = None
+            done += 1
+            if result is None:
+                continue
+            page_jobs, new_count, known_count = result
+            found += len(page_jobs)
+            if page_jobs and save:
+                await _save_page(page_jobs, writer)
+            elapsed = time.time() - start_time
+            eta = int(elapsed / done * (total - done))
+            eta_min, eta_sec = divmod(eta, 60)
+            print(f"[Progress] {keyword} p{page}: {new_count} new, {known_count} known | "
+                  f"{done}/{total} pages, Jobs so far: {found}, ETA: {eta_min:02d}:{eta_sec:02d}")
+            await results.put(page_jobs)
+
+    async def worker(client):
+        try:
+            await crawl(client)
+        except Exception as e:
+            await results.put(e)
+            return
+        await results.put(None)
+
+    async with make_client(http2=http2) as client:
+        tasks = [asyncio.create_task(worker(client)) for _ in range(workers)]
+        try:
+            running = len(tasks)
+            while running:
+                page_jobs = await results.get()
+                if page_jobs is None:
+                    running -= 1
+                    continue
+                if isinstance(page_jobs, Exception):
+                    raise page_jobs
+                for job in page_jobs:
+                    yield job
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def scrape_jobs_concurrent(keywords, pages=25, workers=8, per_host=4, known_links=None, cache=None,
+                                 writer=None, http2=True, limiter=None, retry_queue=None, filters=None):
+    """Scrape the listing pages of several keywords with a bounded worker pool
+
+    Collects iter_jobs_concurrent() into a list; jobs are returned in
+    completion order.
+    """
+    return [
+        job async for job in iter_jobs_concurrent(keywords, pages, workers, per_host, known_links, cache, writer,
+                                                  http2, limiter, retry_queue, filters)
     ]
-    
-    location_lower = location.lower()
-    return any(keyword in location_lower for keyword in mexico_keywords)
+
+
+class ComputrabajoScraper(JobSource):
+    """Computrabajo as a ScraperCommon JobSource
+
+    Crawls every keyword's listing pages with iter_jobs_concurrent over one
+    pooled client; workers and per_host set its concurrency, limiter its
+    pace. Jobs are not saved here but left to the orchestrator's pipeline.
+    """
+
+    name = "computrabajo"
+
+    def __init__(self, keywords, pages=25, workers=8, per_host=4, cache=None, limiter=None, retry_queue=None,
+                 filters=None, http2=True):
+        self.keywords = keywords
+        self.pages = pages
+        self.workers = workers
+        self.per_host = per_host
+        self.cache = cache
+        self.limiter = limiter or HostRateLimiter()
+        self.retry_queue = retry_queue
+        self.filters = filters or JobFilters()
+        self.http2 = http2
+
+    def iter_jobs(self, known_links=None):
+        return iter_jobs_concurrent(self.keywords, self.pages, self.workers, self.per_host, known_links, self.cache,
+                                    http2=self.http2, limiter=self.limiter, retry_queue=self.retry_queue,
+                                    filters=self.filters, save=False)
+
+    def stats(self):
+        return {"filters": self.filters.stats(), "rates": self.limiter.rates()}
+
+
+def computrabajo_retry_handlers(client, known_links=None, cache=None, limiter=None, writer=None, retry_queue=None,
+                                filters=None):
+    """Handlers for ScraperCommon.retry_queue.drain_retry_queue
+
+    A retried listing page is scraped and saved like any other page; a
+    retried detail page updates the job's row with its description.
+    """
+    filters = filters or JobFilters()
+    async def retry_listing(entry):
+        context = entry["context"]
+        result = await scrape_listing_page(client, context["keyword"], context["page"], known_links, cache,
+                                           limiter=limiter, retry_queue=retry_queue, filters=filters)
+        if result is None:
+            return False
+        page_jobs = result[0]
+        if page_jobs:
+            await _save_page(page_jobs, writer)
+        return True
+
+    async def retry_detail(entry):
+        url = entry["url"]
+        response = await _request(limiter, None, url, lambda: fetch_detail(client, url, HEADERS, cache))
+        if response.status_code != 200:
+            return False
+        job = JobRecord.from_dict(entry["context"])
+        job["description"] = parse_description(response.text)
+        if filters.accept_detail(job):
+            await bulk_upsert_jobs([job], on_conflict="update")
+        return True
+
+    return {"computrabajo_listing": retry_listing, "computrabajo_detail": retry_detail}
+
+
+# Name used by the package API
+scrape_jobs_computrabajo = scrape_jobs
@@ -0,0 +1,128 @@
+"""
+Background database writer for scraped jobs
+
+Scraper tasks hand their jobs to a JobWriter and go straight back to the
+network. A single writer task drains the queue and saves the jobs in large
+batches, so SQLite sees a few big transactions instead of one per page, and
+concurrent scrapers never write to the database at the same time. The queue
+is bounded: when the database falls behind, put() waits until there is room.
+A batch that fails to commit (e.g. "database is locked") is retried, and
+kept for a last try on close(); only then is it counted in errors.
+"""
+
+import asyncio
+
+try:
+    from .models import bulk_upsert_jobs
+except ImportError:  # Run as a script from inside this folder
+    from models import bulk_upsert_jobs
+
+_STOP = object()
+
+
+class JobWriter:
+    def __init__(self, batch_size=500, max_queued=2000, flush_interval=2.0, on_conflict="nothing",
+                 save_attempts=3, retry_delay=1.0):
+        self.batch_size = batch_size
+        # Seconds to wait for more jobs before saving a partial batch
+        self.flush_interval = flush_interval
+        self.on_conflict = on_conflict
+        # Tries per batch, retry_delay seconds apart (doubling) before it is set aside
+        self.save_attempts = save_attempts
+        self.retry_delay = retry_delay
+        self.queue = asyncio.Queue(maxsize=max_queued)
+        self.inserted = 0
+        self.skipped = 0
+        self.batches = 0
+        # Batches, and their jobs, that could not be saved even on close()
+        self.errors = 0
+        self.lost = 0
+        self._failed = []
+        self._task = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, jobs):
+        """Queue jobs for saving, waiting while the queue is full"""
+        if self._task is None:
+            raise RuntimeError("JobWriter.start() must be called before put()")
+        for job in jobs:
+            await self.queue.put(job)
+
+    async def close(self):
+        """Save everything still queued and stop the writer task"""
+        if self._task is None:
+            return
+        await self.queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def _next_batch(self):
+        """Wait for one job, then gather more until the batch is full or the interval passes"""
+        item = await self.queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if batch and not await self._save(batch):
+                # Set aside and keep draining, so scrapers blocked on put() are never stuck
+                self._failed.append(batch)
+        # Last try for the batches that failed during the run
+        failed, self._failed = self._failed, []
+        for batch in failed:
+            if not await self._save(batch):
+                self.errors += 1
+                self.lost += len(batch)
+                print(f"❌ {len(batch)} vacantes no se pudieron guardar")
+
+    async def _save(self, batch):
+        """Save a batch, retrying with backoff; False if every attempt failed"""
+        for attempt in range(1, self.save_attempts + 1):
+            try:
+                counts = await bulk_upsert_jobs(batch, on_conflict=self.on_conflict)
+            except Exception as e:
+                print(f"❌ Error al guardar {len(batch)} vacantes (intento {attempt}/{self.save_attempts}): {e}")
+                if attempt < self.save_attempts:
+                    await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+                continue
+            self.inserted += counts["inserted"]
+            self.skipped += counts["skipped"]
+            self.batches += 1
+            return True
+        return False
+
+    def stats(self):
+        return {
+            "inserted": self.inserted,
+            "skipped": self.skipped,
+            "batches": self.batches,
+            "errors": self.errors,
+            "lost": self.lost,
+        }
@@ -4,8 +4,13 @@ OCC Mexico Job Scraper Package
 This package provides functionality to scrape job listings from OCC.com.mx
 """
 
-from .scraper_occ import scrape_jobs_occ, OCCScraper
+from .scraper_occ import (scrape_jobs_occ, scrape_jobs_occ_two_phase, iter_jobs_occ, iter_jobs_occ_two_phase,
+                          OCCScraper, OCCScraperSession, OCCSource)
+from .resource_policy import ResourcePolicy
+from .scheduler import CrawlScheduler
+from .keyword_planner import KeywordHitLog, plan_keywords
 
 __version__ = "1.0.0"
 __author__ = "Your Name"
-__all__ = ["scrape_jobs_occ", "OCCScraper"] 
\ No newline at end of file
+__all__ = ["scrape_jobs_occ", "scrape_jobs_occ_two_phase", "iter_jobs_occ", "iter_jobs_occ_two_phase", "OCCScraper",
+           "OCCScraperSession", "OCCSource", "ResourcePolicy", "CrawlScheduler", "KeywordHitLog", "plan_keywords"] 
\ No newline at end of file
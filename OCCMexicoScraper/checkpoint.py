@@ -0,0 +1,194 @@
+"""
+Journaled checkpoint for the OCC checkpoint runner
+
+The checkpoint is a JSON snapshot plus an append-only journal next to it.
+Each finished page appends one small JSON line with only what changed
+(its new links and position), so the per-page cost does not grow with the
+crawl. Every compact_every pages the journal is folded into a new snapshot,
+written to a temporary file and renamed over the old one, so a crash never
+leaves a half-written checkpoint behind.
+
+Finished (keyword, page) units are tracked individually, so pages crawled
+out of order by parallel workers resume correctly, together with how many
+cards and new jobs each page yielded.
+"""
+
+import json
+import os
+import time
+from datetime import timedelta
+
+
+class CheckpointManager:
+    def __init__(self, checkpoint_file, target_jobs=3000, total_keywords=20, pages_per_keyword=50,
+                 compact_every=50):
+        self.checkpoint_file = checkpoint_file
+        self.journal_file = os.path.splitext(checkpoint_file)[0] + ".journal"
+        self.target_jobs = target_jobs
+        self.total_keywords = total_keywords
+        self.pages_per_keyword = pages_per_keyword
+        self.compact_every = compact_every
+        self.pages_since_compact = 0
+        self.checkpoint_data = self.load_checkpoint()
+        self.completed = {tuple(unit) for unit in self.checkpoint_data['completed_pages']}
+
+    def load_checkpoint(self):
+        """Load the snapshot and replay the journal on top of it"""
+        data = {
+            'total_jobs': 0,
+            'keywords_completed': 0,
+            'current_keyword': 0,
+            'current_page': 1,
+            'seen_links': [],
+            'start_time': time.time(),
+            'jobs_per_page': [],
+            'last_save_time': time.time(),
+            'journal_seq': 0,
+            'completed_pages': [],
+            # [keyword_idx, page, cards, new_jobs] for every page crawled with yield tracking
+            'page_stats': []
+        }
+
+        if os.path.exists(self.checkpoint_file):
+            try:
+                with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                data.update(snapshot)
+                if 'completed_pages' not in snapshot:
+                    data['completed_pages'] = self._serial_pages_done(data)
+            except Exception as e:
+                print(f"⚠️ Error loading checkpoint: {e}")
+
+        replayed = 0
+        if os.path.exists(self.journal_file):
+            intact = 0
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    # A crash mid-append leaves at most one partial last line
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    intact += len(line)
+                    # Entries already folded into the snapshot are skipped
+                    if entry['seq'] > data['journal_seq']:
+                        self._apply(data, entry)
+                        replayed += 1
+            if intact < os.path.getsize(self.journal_file):
+                # Cut the partial line off, or the next entry would be appended onto it
+                with open(self.journal_file, 'r+b') as f:
+                    f.truncate(intact)
+        self.pages_since_compact = replayed
+
+        if data['total_jobs'] > 0 or replayed:
+            print(f"📂 Loaded checkpoint: {data['total_jobs']} jobs, {data['keywords_completed']} keywords completed")
+        return data
+
+    def _serial_pages_done(self, data):
+        """Units finished by a serial crawl that only saved its position"""
+        return [[keyword_idx, page]
+                for keyword_idx in range(1, data['current_keyword'] + 1)
+                for page in range(1, self.pages_per_keyword + 1)
+                if keyword_idx < data['current_keyword'] or page < data['current_page']]
+
+    @staticmethod
+    def _apply(data, entry):
+        data['current_keyword'] = entry['keyword']
+        data['current_page'] = entry['page']
+        data['keywords_completed'] = entry['keyword'] - 1
+        data['last_save_time'] = entry['time']
+        data['journal_seq'] = entry['seq']
+        if 'links' in entry:
+            data['seen_links'].extend(entry['links'])
+            data['total_jobs'] += len(entry['links'])
+            data['jobs_per_page'].append(len(entry['links']))
+            data['completed_pages'].append([entry['keyword'], entry['page']])
+            if 'cards' in entry:
+                data['page_stats'].append([entry['keyword'], entry['page'], entry['cards'], len(entry['links'])])
+
+    def _append(self, entry):
+        entry['seq'] = self.checkpoint_data['journal_seq'] + 1
+        entry['time'] = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.checkpoint_file), exist_ok=True)
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            print(f"❌ Error saving checkpoint: {e}")
+            return
+        self._apply(self.checkpoint_data, entry)
+        if 'links' in entry:
+            self.completed.add((entry['keyword'], entry['page']))
+
+    def is_page_done(self, keyword_idx, page_num):
+        """True if this (keyword, page) unit was already crawled"""
+        return (keyword_idx, page_num) in self.completed
+
+    def record_page(self, keyword_idx, page_num, new_links, cards=None):
+        """Journal a finished page, the links of its new unique jobs and how many cards it listed"""
+        entry = {'keyword': keyword_idx, 'page': page_num, 'links': list(new_links)}
+        if cards is not None:
+            entry['cards'] = cards
+        self._append(entry)
+        self.pages_since_compact += 1
+        if self.pages_since_compact >= self.compact_every:
+            self.compact()
+
+    def page_history(self):
+        """{keyword_idx: [(page, cards, new_jobs), ...]} for the pages crawled so far"""
+        history = {}
+        for keyword_idx, page_num, cards, new_jobs in self.checkpoint_data['page_stats']:
+            history.setdefault(keyword_idx, []).append((page_num, cards, new_jobs))
+        return history
+
+    def record_position(self, keyword_idx, page_num):
+        """Journal a resume position without any page results"""
+        self._append({'keyword': keyword_idx, 'page': page_num})
+
+    def compact(self):
+        """Fold the journal into a new snapshot, atomically replacing the old one"""
+        try:
+            os.makedirs(os.path.dirname(self.checkpoint_file), exist_ok=True)
+            tmp_file = self.checkpoint_file + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.checkpoint_data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.checkpoint_file)
+            # The snapshot's journal_seq makes replaying a stale journal harmless,
+            # so truncating it afterwards is safe even if we crash in between
+            open(self.journal_file, 'w').close()
+            self.pages_since_compact = 0
+        except Exception as e:
+            print(f"❌ Error compacting checkpoint: {e}")
+
+    def get_progress_stats(self, total_jobs):
+        """Calculate progress statistics from the number of unique jobs collected so far"""
+        elapsed = time.time() - self.checkpoint_data['start_time']
+        progress = total_jobs / self.target_jobs
+
+        # Calculate ETA based on current rate
+        if elapsed > 0 and total_jobs > 0:
+            jobs_per_second = total_jobs / elapsed
+            remaining_jobs = self.target_jobs - total_jobs
+            eta_seconds = remaining_jobs / jobs_per_second if jobs_per_second > 0 else 0
+            eta = timedelta(seconds=int(eta_seconds))
+        else:
+            jobs_per_second = 0
+            eta = timedelta(seconds=0)
+
+        # Calculate completion percentage
+        total_pages = self.total_keywords * self.pages_per_keyword
+        page_progress = len(self.completed) / total_pages
+
+        return {
+            'elapsed': elapsed,
+            'progress': progress,
+            'eta': eta,
+            'page_progress': page_progress,
+            'jobs_per_second': jobs_per_second
+        }
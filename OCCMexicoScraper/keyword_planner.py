@@ -0,0 +1,124 @@
+"""
+Keyword overlap statistics and a reduced keyword plan for OCC crawls
+
+Every crawled listing page logs which keyword surfaced which job links,
+duplicates included, in a small SQLite table that accumulates over runs.
+plan_keywords() then picks keywords greedily by how many not yet covered
+jobs each adds, and drops the ones whose marginal yield is below a share of
+all known jobs, or that are not needed to reach the target coverage.
+"""
+
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+DEFAULT_HITS_FILE = "exports/keyword_hits.db"
+
+
+class KeywordHitLog:
+    """Which keywords surfaced each job link, across runs"""
+
+    def __init__(self, path: str = DEFAULT_HITS_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS keyword_hits ("
+            " link TEXT NOT NULL,"
+            " keyword TEXT NOT NULL,"
+            " first_seen REAL NOT NULL,"
+            " PRIMARY KEY (link, keyword))"
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def record(self, keyword: str, links: Iterable[str]):
+        """Log that keyword's listing showed these links"""
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO keyword_hits (link, keyword, first_seen) VALUES (?, ?, ?)",
+            [(link, keyword, now) for link in links if link],
+        )
+        self._conn.commit()
+
+    def hits_by_keyword(self) -> Dict[str, Set[str]]:
+        hits: Dict[str, Set[str]] = {}
+        for link, keyword in self._conn.execute("SELECT link, keyword FROM keyword_hits"):
+            hits.setdefault(keyword, set()).add(link)
+        return hits
+
+
+class KeywordPlan:
+    """Result of plan_keywords"""
+
+    def __init__(self, selected: List[str], dropped: List[str], marginal: Dict[str, int],
+                 exclusive: Dict[str, int], total_jobs: int, covered_jobs: int):
+        # Kept keywords, most valuable first
+        self.selected = selected
+        self.dropped = dropped
+        # New jobs each keyword added when it was picked (dropped ones: what they would still add)
+        self.marginal = marginal
+        # Jobs that only this keyword ever surfaced
+        self.exclusive = exclusive
+        self.total_jobs = total_jobs
+        self.covered_jobs = covered_jobs
+
+    @property
+    def coverage(self) -> float:
+        return self.covered_jobs / self.total_jobs if self.total_jobs else 1.0
+
+    def report(self) -> str:
+        lines = [f"{'keyword':<40} {'marginal':>9} {'exclusive':>10}  plan"]
+        for keyword in self.selected + self.dropped:
+            status = "keep" if keyword in self.selected else "drop"
+            lines.append(f"{keyword:<40} {self.marginal.get(keyword, 0):>9} {self.exclusive.get(keyword, 0):>10}  {status}")
+        lines.append(f"Coverage with {len(self.selected)} keywords: {self.covered_jobs}/{self.total_jobs} "
+                     f"({self.coverage*100:.1f}%)")
+        return "\n".join(lines)
+
+
+def plan_keywords(hits: Dict[str, Set[str]], keywords: Optional[List[str]] = None, coverage: float = 0.99,
+                  min_marginal_share: float = 0.01, min_jobs: int = 200) -> KeywordPlan:
+    """Greedy set cover over past keyword hits
+
+    Keywords are picked by how many uncovered jobs they add until `coverage`
+    of all known jobs is reached; keywords adding less than
+    min_marginal_share of all jobs are never picked. Keywords without any
+    history are always kept, and with fewer than min_jobs known jobs nothing
+    is dropped at all.
+    """
+    keywords = list(keywords) if keywords is not None else sorted(hits)
+    all_jobs = set().union(*(hits.get(keyword, set()) for keyword in keywords)) if keywords else set()
+    total = len(all_jobs)
+
+    exclusive = {}
+    for keyword in keywords:
+        others = set().union(*(hits.get(other, set()) for other in keywords if other != keyword))
+        exclusive[keyword] = len(hits.get(keyword, set()) - others)
+
+    untested = [keyword for keyword in keywords if not hits.get(keyword)]
+    if total < min_jobs:
+        marginal = {keyword: len(hits.get(keyword, set())) for keyword in keywords}
+        return KeywordPlan(list(keywords), [], marginal, exclusive, total, total)
+
+    covered: Set[str] = set()
+    selected: List[str] = []
+    marginal: Dict[str, int] = {}
+    remaining = [keyword for keyword in keywords if hits.get(keyword)]
+    min_gain = max(1, int(total * min_marginal_share))
+    while remaining and len(covered) < coverage * total:
+        best = max(remaining, key=lambda keyword: len(hits[keyword] - covered))
+        gain = len(hits[best] - covered)
+        if gain < min_gain:
+            break
+        selected.append(best)
+        marginal[best] = gain
+        covered |= hits[best]
+        remaining.remove(best)
+
+    for keyword in remaining:
+        marginal[keyword] = len(hits[keyword] - covered)
+    return KeywordPlan(selected + untested, remaining, marginal, exclusive, total, len(covered))
@@ -0,0 +1,127 @@
+"""
+Request interception policy for OCC browser pages
+
+Blocks resource types and third-party domains that are not needed to read
+job cards or descriptions, and keeps per-run counters of what was blocked.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Resource types never needed to read the DOM
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font", "stylesheet")
+
+# Analytics, ads and tracking hosts seen on OCC pages (subdomains are matched too)
+DEFAULT_BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "facebook.net",
+    "facebook.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "bat.bing.com",
+    "analytics.tiktok.com",
+    "criteo.com",
+    "criteo.net",
+    "adnxs.com",
+    "taboola.com",
+    "outbrain.com",
+    "nr-data.net",
+    "newrelic.com",
+    "segment.io",
+    "optimizely.com",
+    "onesignal.com",
+)
+
+
+def _matches_domain(host: str, domains: Iterable[str]) -> Optional[str]:
+    """Return the domain that host belongs to, if any"""
+    for domain in domains:
+        if host == domain or host.endswith("." + domain):
+            return domain
+    return None
+
+
+class ResourcePolicy:
+    """Playwright routing policy that aborts unneeded requests and counts them"""
+
+    def __init__(
+        self,
+        blocked_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        blocked_domains: Iterable[str] = DEFAULT_BLOCKED_DOMAINS,
+        allowlist: Iterable[str] = (),
+    ):
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.blocked_domains = tuple(blocked_domains)
+        # Domains that are always let through, whatever their resource type
+        self.allowlist = tuple(allowlist)
+        self.reset()
+
+    def reset(self):
+        self.allowed_requests = 0
+        self.blocked_requests = 0
+        self.blocked_by_type: Dict[str, int] = Counter()
+        self.blocked_by_domain: Dict[str, int] = Counter()
+        self.transferred_bytes = 0
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Return why a request should be blocked, or None to let it through"""
+        host = (urlparse(url).hostname or "").lower()
+        if _matches_domain(host, self.allowlist):
+            return None
+        domain = _matches_domain(host, self.blocked_domains)
+        if domain:
+            return f"domain:{domain}"
+        if resource_type in self.blocked_resource_types:
+            return f"type:{resource_type}"
+        return None
+
+    async def attach(self, page):
+        """Install the policy on a page"""
+        await page.route("**/*", self.handle_route)
+        page.on("requestfinished", self.record_finished)
+
+    async def handle_route(self, route):
+        request = route.request
+        reason = self.block_reason(request.url, request.resource_type)
+        if reason is None:
+            self.allowed_requests += 1
+            await route.continue_()
+            return
+
+        self.blocked_requests += 1
+        kind, _, value = reason.partition(":")
+        if kind == "domain":
+            self.blocked_by_domain[value] += 1
+        else:
+            self.blocked_by_type[value] += 1
+        await route.abort()
+
+    async def record_finished(self, request):
+        """Add the size of a completed request to the transferred byte count"""
+        try:
+            sizes = await request.sizes()
+            self.transferred_bytes += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception as e:
+            logger.debug(f"Could not read request sizes for {request.url}: {e}")
+
+    def summary(self) -> Dict:
+        """Counters for this run"""
+        total = self.allowed_requests + self.blocked_requests
+        return {
+            "allowed_requests": self.allowed_requests,
+            "blocked_requests": self.blocked_requests,
+            "blocked_share": self.blocked_requests / total if total else 0.0,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "blocked_by_domain": dict(self.blocked_by_domain),
+            "transferred_bytes": self.transferred_bytes,
+        }
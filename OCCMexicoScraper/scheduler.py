@@ -0,0 +1,152 @@
+"""
+Parallel (keyword, page) work scheduler for long OCC crawls
+
+The crawl is split into one work unit per listing page, consumed by N worker
+tasks, so the crawl scales with the number of workers instead of being one
+long serial chain. Units already finished in an earlier run are skipped, and
+no new units are started once should_stop() says the target has been reached.
+
+Each keyword's page budget follows what its pages yield. A keyword stops as
+soon as a page lists no cards (pagination is exhausted) or its last few pages
+brought almost no new jobs. The pages it did not use go to keywords that are
+still yielding new jobs, up to max_pages_per_keyword each, so the total page
+budget stays pages_per_keyword for every keyword that is not pruned.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# process_unit(keyword_idx, keyword, page) -> (cards, new_jobs), or None if the
+# page failed; keyword_idx is 1-based like the checkpoint
+UnitProcessor = Callable[[int, str, int], Awaitable[Optional[Tuple[int, int]]]]
+
+
+class _KeywordState:
+    def __init__(self, keyword_idx: int, keyword: str):
+        self.keyword_idx = keyword_idx
+        self.keyword = keyword
+        self.next_page = 1
+        # page -> (cards, new_jobs)
+        self.results: Dict[int, Tuple[int, int]] = {}
+        self.stop_reason: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self.stop_reason is None
+
+    def recent_new_jobs(self, window: int) -> int:
+        pages = sorted(self.results)[-window:]
+        return sum(self.results[page][1] for page in pages)
+
+
+class CrawlScheduler:
+    def __init__(self, keywords: List[str], pages_per_keyword: int, workers: int = 4,
+                 is_done: Optional[Callable[[int, int], bool]] = None,
+                 history: Optional[Dict[int, List[Tuple[int, int, int]]]] = None,
+                 novelty_window: int = 3, min_new_jobs: int = 1,
+                 max_pages_per_keyword: Optional[int] = None, pruned_keywords: Iterable[str] = ()):
+        self.keywords = keywords
+        self.pages_per_keyword = pages_per_keyword
+        self.workers = max(1, workers)
+        self.is_done = is_done or (lambda keyword_idx, page: False)
+        # A keyword stops once its last novelty_window pages brought fewer than min_new_jobs new jobs
+        self.novelty_window = novelty_window
+        self.min_new_jobs = min_new_jobs
+        self.max_pages_per_keyword = max_pages_per_keyword or pages_per_keyword * 2
+        self.used = 0
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self._states = [_KeywordState(idx, keyword) for idx, keyword in enumerate(keywords, start=1)]
+        # Pruned keywords keep their index (and checkpoint entries) but get no pages
+        pruned_keywords = set(pruned_keywords)
+        for state in self._states:
+            if state.keyword in pruned_keywords:
+                state.stop_reason = "pruned by the keyword plan"
+        self.total_budget = (len(keywords) - len(pruned_keywords & set(keywords))) * pages_per_keyword
+        # Yields recorded by earlier runs, so resumed keywords keep their cut-off
+        for state in self._states:
+            for page, cards, new_jobs in (history or {}).get(state.keyword_idx, []):
+                self.record(state.keyword_idx, page, cards, new_jobs)
+
+    def record(self, keyword_idx: int, page: int, cards: int, new_jobs: int):
+        """Feed back what a page yielded, cutting the keyword's budget if it ran dry"""
+        state = self._states[keyword_idx - 1]
+        state.results[page] = (cards, new_jobs)
+        if not state.active:
+            return
+        if cards == 0:
+            state.stop_reason = f"no cards on page {page}"
+        elif (len(state.results) >= self.novelty_window
+              and state.recent_new_jobs(self.novelty_window) < self.min_new_jobs):
+            state.stop_reason = f"no new jobs in the last {self.novelty_window} pages"
+        if state.stop_reason:
+            logger.info(f"Stopping keyword '{state.keyword}': {state.stop_reason}")
+
+    def _take(self, state: _KeywordState, limit: int, capped: bool = False) -> Optional[Tuple[int, str, int]]:
+        """Next page of state up to limit that was not crawled before; capped also stops at the total budget"""
+        while state.next_page <= limit and not (capped and self.used >= self.total_budget):
+            page = state.next_page
+            state.next_page += 1
+            self.used += 1
+            if self.is_done(state.keyword_idx, page):
+                self.skipped += 1
+                continue
+            return state.keyword_idx, state.keyword, page
+        return None
+
+    def next_unit(self) -> Optional[Tuple[int, str, int]]:
+        """The next (keyword_idx, keyword, page) to crawl, or None when the budget is spent"""
+        # Base budget first, in keyword order
+        for state in self._states:
+            if state.active:
+                unit = self._take(state, self.pages_per_keyword)
+                if unit:
+                    return unit
+        # Pages left over by keywords that were cut go to the best yielding ones
+        candidates = sorted((state for state in self._states if state.active),
+                            key=lambda state: state.recent_new_jobs(self.novelty_window), reverse=True)
+        for state in candidates:
+            unit = self._take(state, self.max_pages_per_keyword, capped=True)
+            if unit:
+                return unit
+        return None
+
+    async def run(self, process_unit: UnitProcessor, should_stop: Optional[Callable[[], bool]] = None) -> Dict:
+        """Work through the page budget with the configured number of workers"""
+        should_stop = should_stop or (lambda: False)
+        logger.info(f"Scheduling up to {self.total_budget} pages on {self.workers} workers")
+
+        async def worker():
+            while not should_stop():
+                unit = self.next_unit()
+                if unit is None:
+                    return
+                keyword_idx, keyword, page = unit
+                try:
+                    result = await process_unit(keyword_idx, keyword, page)
+                    self.completed += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"Work unit {keyword} page {page} failed: {e}")
+                    continue
+                if result is not None:
+                    self.record(keyword_idx, page, *result)
+
+        await asyncio.gather(*(worker() for _ in range(self.workers)))
+        return self.summary()
+
+    def summary(self) -> Dict:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "pages_used": self.used,
+            "page_budget": self.total_budget,
+            "cut_keywords": {state.keyword: state.stop_reason for state in self._states if not state.active},
+            "extra_pages": {state.keyword: state.next_page - 1 - self.pages_per_keyword
+                            for state in self._states if state.next_page - 1 > self.pages_per_keyword},
+        }
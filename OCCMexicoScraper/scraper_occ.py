@@ -1,152 +1,500 @@
 import asyncio
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+import inspect
+from collections import Counter
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from bs4 import SoupStrainer
+import httpx
 import time
-import random
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 import logging
+import re
+
+from ScraperCommon.http_cache import HttpCache
+from ScraperCommon.job_record import JobRecord, Source
+from ScraperCommon.parsing import make_soup
+from ScraperCommon.rate_limiter import HostRateLimiter
+from ScraperCommon.retry_queue import RetryQueue
+from ScraperCommon.sources import JobSource
+from .resource_policy import ResourcePolicy
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Elements whose presence means a page has rendered what we need
+JOB_CARD_SELECTOR = 'div[id^="jobcard-"]'
+DESCRIPTION_SELECTOR = 'div.break-words.mb-8, div[data-testid="job-description"], div.job-description'
+
+# Lazy-loaded cards count as settled once no request has been in flight for this long
+SETTLE_QUIET_MS = 500
+CARD_COUNT_JS = "selector => document.querySelectorAll(selector).length"
+
+# Only the job cards are needed from a listing page, so skip building the rest of the tree
+JOB_CARD_STRAINER = SoupStrainer('div', id=re.compile(r'^jobcard-'))
+# A server-rendered card element; "jobcard-" alone also shows up in the scripts and CSS of the JS-only shell
+JOB_CARD_HTML = re.compile(r'<div\b[^>]*\bid=["\']jobcard-')
+
+OCC_BASE_URL = "https://www.occ.com.mx"
+
+# Description placeholder for a job whose page could not be fetched
+DESCRIPTION_ERROR = "Error al obtener descripción"
+
+# Where a run saves its jobs, and so where a drain must save the jobs its retries recover:
+# the checkpoint runner's job sink, or jobs.db (run_all_sources)
+SAVE_TARGETS = ("sink", "db")
+
+# Headers for plain HTTP fetches in hybrid mode
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Accept-Language": "es-MX,es;q=0.9",
+}
+
+
+def occ_listing_url(keyword: str, page: int = 1) -> str:
+    """URL of a keyword's listing page, with OCC's pagination structure"""
+    search_url = f"{OCC_BASE_URL}/empleos/de-{keyword}/"
+    if page > 1:
+        search_url += f"?page={page}"
+    return search_url
+
+
+def fetch_hit_rates(stats: Counter) -> Dict:
+    """Summarize HTTP vs browser fetch counts into per-kind hit rates"""
+    report = {}
+    for kind in ("listing", "detail"):
+        cache = stats.get(f"{kind}_cache", 0)
+        http = stats.get(f"{kind}_http", 0)
+        browser = stats.get(f"{kind}_browser", 0)
+        total = http + browser
+        report[kind] = {
+            "cache": cache,
+            "http": http,
+            "browser": browser,
+            "http_hit_rate": http / total if total else 0.0,
+        }
+    return report
+
+class PagePool:
+    """Bounded pool of browser pages shared by concurrent navigations"""
+
+    def __init__(self, new_page, size: int):
+        self._new_page = new_page
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle = asyncio.Queue()
+        self._pages = []
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a page, opening a new one only if no idle page is available"""
+        async with self._semaphore:
+            page = None
+            while not self._idle.empty():
+                candidate = self._idle.get_nowait()
+                if not candidate.is_closed():
+                    page = candidate
+                    break
+            if page is None:
+                page = await self._new_page()
+                self._pages.append(page)
+            try:
+                yield page
+            finally:
+                self._idle.put_nowait(page)
+
+    async def close(self):
+        for page in self._pages:
+            if not page.is_closed():
+                await page.close()
+        self._pages.clear()
+
+
 class OCCScraper:
-    def __init__(self):
-        self.base_url = "https://www.occ.com.mx"
+    def __init__(self, detail_concurrency: int = 1, readiness: str = "event",
+                 resource_policy: Optional[ResourcePolicy] = None, fetch_mode: str = "browser",
+                 cache: Optional[HttpCache] = None, rate_limiter: Optional[HostRateLimiter] = None,
+                 retry_queue: Optional[RetryQueue] = None, listing_concurrency: int = 1,
+                 save_target: str = "sink"):
+        self.base_url = OCC_BASE_URL
         self.playwright = None
         self.browser = None
         self.page = None
+        self.http_client = None
+        # Number of job detail pages fetched in parallel (1 = sequential on self.page,
+        # unless concurrent listing workers share a pool of detail pages)
+        self.detail_concurrency = max(1, detail_concurrency)
+        self.detail_pool = None
+        # Number of listing pages loaded at once by concurrent callers, each on its own browser page
+        self.listing_concurrency = max(1, listing_concurrency)
+        self.listing_pool = None
+        # "event" waits for the content to appear, using the old fixed sleeps only
+        # as an upper bound; "fixed" always sleeps the full time
+        if readiness not in ("event", "fixed"):
+            raise ValueError(f"Unknown readiness mode: {readiness}")
+        self.readiness = readiness
+        # Optional request interception shared by every page this scraper opens
+        self.resource_policy = resource_policy
+        # "browser" renders everything in Chromium; "hybrid" tries plain HTTP first
+        # and only launches the browser when the expected content is missing
+        if fetch_mode not in ("browser", "hybrid"):
+            raise ValueError(f"Unknown fetch mode: {fetch_mode}")
+        self.fetch_mode = fetch_mode
+        # Optional on-disk cache for job detail pages (listings always hit the network)
+        self.cache = cache
+        # Paces every network request (HTTP and browser navigations) per host
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        # Optional persistent queue that failed listing and detail pages are sent to
+        self.retry_queue = retry_queue
+        # Failed pages of a "db" run are queued under their own kinds ("occ_detail_db"),
+        # so only a drain that saves to jobs.db picks them up
+        if save_target not in SAVE_TARGETS:
+            raise ValueError(f"Unknown save target: {save_target}")
+        self.save_target = save_target
+        self.fetch_stats = Counter()
+        self._browser_lock = asyncio.Lock()
     
     async def __aenter__(self):
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=True)
-        self.page = await self.browser.new_page()
+        await self.start()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.page:
-            await self.page.close()
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
-    
-    async def search_jobs(self, keyword: str, page: int = 1) -> List[Dict]:
-        """Search for jobs on OCC with pagination"""
+        await self.close()
+    
+    async def start(self):
+        """Open the HTTP client (hybrid mode) or launch the browser (browser mode)"""
+        if self.fetch_mode == "hybrid":
+            self.http_client = httpx.AsyncClient(
+                headers=HTTP_HEADERS,
+                timeout=30.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.listing_concurrency * (self.detail_concurrency + 1) + 1,
+                                    max_keepalive_connections=self.listing_concurrency * (self.detail_concurrency + 1) + 1),
+            )
+        else:
+            await self.ensure_browser()
+        # Concurrent listing workers fetch details at the same time too, so they
+        # need pooled pages rather than all navigating self.page at once
+        if self.detail_concurrency > 1 or self.listing_concurrency > 1:
+            self.detail_pool = PagePool(self.new_page, max(self.detail_concurrency, self.listing_concurrency))
+        if self.listing_concurrency > 1:
+            self.listing_pool = PagePool(self.new_page, self.listing_concurrency)
+    
+    async def ensure_browser(self):
+        """Launch Playwright, the browser and the main page if not running yet"""
+        if self.page is not None:
+            return
+        async with self._browser_lock:
+            if self.page is not None:
+                return
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=True)
+            self.page = await self._open_page()
+    
+    async def new_page(self):
+        """Open a browser page with the resource policy installed"""
+        await self.ensure_browser()
+        return await self._open_page()
+    
+    async def _open_page(self):
+        page = await self.browser.new_page()
+        if self.resource_policy:
+            await self.resource_policy.attach(page)
+        return page
+    
+    async def close(self):
+        """Close pages, browser and Playwright, tolerating an already crashed browser"""
+        closers = [
+            self.listing_pool.close if self.listing_pool else None,
+            self.detail_pool.close if self.detail_pool else None,
+            self.page.close if self.page else None,
+            self.browser.close if self.browser else None,
+            self.playwright.stop if self.playwright else None,
+            self.http_client.aclose if self.http_client else None,
+        ]
+        for closer in closers:
+            if closer is None:
+                continue
+            try:
+                await closer()
+            except Exception as e:
+                logger.warning(f"Error during scraper shutdown: {e}")
+        self.listing_pool = None
+        self.detail_pool = None
+        self.page = None
+        self.browser = None
+        self.playwright = None
+        self.http_client = None
+    
+    def is_healthy(self) -> bool:
+        """Check that the browser is still connected and the main page is usable"""
+        if self.browser is None:
+            # In hybrid mode the browser is only launched once it is needed
+            return self.fetch_mode == "hybrid" and self.http_client is not None
+        return (
+            self.browser.is_connected()
+            and self.page is not None
+            and not self.page.is_closed()
+        )
+    
+    def fetch_report(self) -> Dict:
+        """How many listings and details were served over plain HTTP vs the browser"""
+        return fetch_hit_rates(self.fetch_stats)
+    
+    async def run(self, method: str, *args, **kwargs):
+        """Call a method by name, so a scraper can stand in for an OCCScraperSession"""
+        return await getattr(self, method)(*args, **kwargs)
+    
+    def queue_retry(self, url: str, kind: str, context: Dict, error) -> None:
+        """Send a failed page to the retry queue, if there is one"""
+        if self.retry_queue is not None:
+            if self.save_target == "db":
+                kind = f"{kind}_db"
+            self.retry_queue.add(url, kind, context, str(error))
+    
+    async def wait_until_ready(self, page, selector: str, max_wait_ms: int):
+        """Wait for selector to attach to the page, for at most max_wait_ms"""
+        if self.readiness == "fixed":
+            await page.wait_for_timeout(max_wait_ms)
+            return
+        try:
+            await page.wait_for_selector(selector, state="attached", timeout=max_wait_ms)
+        except PlaywrightTimeoutError:
+            logger.debug(f"Timed out after {max_wait_ms} ms waiting for {selector}")
+    
+    async def scroll_and_settle(self, page, max_wait_ms: int):
+        """Scroll to the bottom and wait for lazy-loaded job cards, for at most max_wait_ms
+        
+        Done as soon as more cards are attached than before the scroll, or
+        once no request has been in flight for SETTLE_QUIET_MS (the scroll
+        loaded nothing more). Requests are tracked from before the scroll, so
+        a page that was already idle still waits for what the scroll starts.
+        """
+        if self.readiness == "fixed":
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await page.wait_for_timeout(max_wait_ms)
+            return
+        
+        in_flight = set()
+        on_request = in_flight.add
+        on_done = in_flight.discard
+        page.on("request", on_request)
+        page.on("requestfinished", on_done)
+        page.on("requestfailed", on_done)
+        try:
+            cards_before = await page.evaluate(CARD_COUNT_JS, JOB_CARD_SELECTOR)
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + max_wait_ms / 1000
+            quiet_since = loop.time()
+            while loop.time() < deadline:
+                await asyncio.sleep(0.1)
+                if await page.evaluate(CARD_COUNT_JS, JOB_CARD_SELECTOR) > cards_before:
+                    return
+                if in_flight:
+                    quiet_since = loop.time()
+                elif loop.time() - quiet_since >= SETTLE_QUIET_MS / 1000:
+                    return
+            logger.debug(f"Job cards still loading after {max_wait_ms} ms of scrolling")
+        finally:
+            page.remove_listener("request", on_request)
+            page.remove_listener("requestfinished", on_done)
+            page.remove_listener("requestfailed", on_done)
+    
+    async def fetch_html(self, url: str, use_cache: bool = False) -> Optional[str]:
+        """Fetch a page over plain HTTP, returning None on any failure"""
+        try:
+            if use_cache and self.cache:
+                response = await self.rate_limiter.request(url, lambda: self.cache.get(self.http_client, url))
+            else:
+                response = await self.rate_limiter.request(url, lambda: self.http_client.get(url))
+            if response.status_code == 200:
+                return response.text
+            logger.debug(f"HTTP {response.status_code} for {url}")
+        except Exception as e:
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+        return None
+    
+    async def goto(self, page, url: str, timeout: int):
+        """Navigate a browser page to url, paced by the rate limiter"""
+        await self.rate_limiter.acquire(url)
+        try:
+            response = await page.goto(url, timeout=timeout)
+        except Exception:
+            self.rate_limiter.record(url, error=True)
+            raise
+        # Navigation time includes rendering, so only the status is fed back
+        self.rate_limiter.record(url, response.status if response else None)
+        return response
+    
+    async def load_listing_html(self, search_url: str, ready_ms: int, settle_ms: int) -> str:
+        """Get a listing page's HTML, over HTTP when the job cards are server-rendered"""
+        if self.fetch_mode == "hybrid":
+            html = await self.fetch_html(search_url)
+            if html and JOB_CARD_HTML.search(html):
+                self.fetch_stats['listing_http'] += 1
+                return html
+        
+        self.fetch_stats['listing_browser'] += 1
+        await self.ensure_browser()
+        if self.listing_pool is not None:
+            async with self.listing_pool.page() as page:
+                return await self.render_listing_html(page, search_url, ready_ms, settle_ms)
+        return await self.render_listing_html(self.page, search_url, ready_ms, settle_ms)
+    
+    async def render_listing_html(self, page, search_url: str, ready_ms: int, settle_ms: int) -> str:
+        """Load a listing page in the browser and return its HTML"""
+        # Navigate to the page
+        await self.goto(page, search_url, 60000)
+        await self.wait_until_ready(page, JOB_CARD_SELECTOR, ready_ms)
+        
+        # Scroll to load all content
+        await self.scroll_and_settle(page, settle_ms)
+        
+        # Get the HTML content
+        return await page.content()
+    
+    async def search_jobs(self, keyword: str, page: int = 1, with_descriptions: bool = True) -> List[JobRecord]:
+        """Search for jobs on OCC with pagination
+        
+        A page that fails is sent to the retry queue and yields no jobs.
+        """
+        search_url = occ_listing_url(keyword, page)
         try:
-            # Construct search URL with correct pagination structure
-            search_url = f"{self.base_url}/empleos/de-{keyword}/"
-            if page > 1:
-                search_url += f"?page={page}"
-            
             logger.info(f"Searching: {search_url}")
             
-            # Navigate to the page
-            await self.page.goto(search_url, timeout=60000)
-            await self.page.wait_for_timeout(3000)
-            
-            # Scroll to load all content
-            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await self.page.wait_for_timeout(2000)
-            
-            # Get the HTML content
-            html = await self.page.content()
-            return await self.parse_jobs_page(html)
+            html = await self.load_listing_html(search_url, 3000, 2000)
+            return await self.parse_jobs_page(html, with_descriptions)
                 
         except Exception as e:
             logger.error(f"Error searching jobs on page {page}: {e}")
+            self.queue_retry(search_url, "occ_listing", {"keyword": keyword, "page": page}, e)
             return []
     
-    async def search_jobs_single_page(self, keyword: str, page: int = 1) -> List[Dict]:
-        """Search for jobs on a single page (optimized for checkpoint system)"""
+    async def search_jobs_single_page(self, keyword: str, page: int = 1, with_descriptions: bool = True,
+                                      known_links: Optional[set] = None) -> List[JobRecord]:
+        """Search for jobs on a single page (optimized for checkpoint system)
+        
+        Jobs whose link is in known_links are returned without fetching their description.
+        A page that fails is sent to the retry queue and yields no jobs.
+        """
         try:
-            # Construct search URL with correct pagination structure
-            search_url = f"{self.base_url}/empleos/de-{keyword}/"
-            if page > 1:
-                search_url += f"?page={page}"
-            
-            # Navigate to the page
-            await self.page.goto(search_url, timeout=60000)
-            await self.page.wait_for_timeout(2000)  # Reduced wait time
-            
-            # Scroll to load all content
-            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await self.page.wait_for_timeout(1000)  # Reduced wait time
-            
-            # Get the HTML content
-            html = await self.page.content()
-            return await self.parse_jobs_page(html)
-                
+            return await self.load_jobs_page(keyword, page, with_descriptions, known_links)
         except Exception as e:
             logger.error(f"Error searching jobs on page {page}: {e}")
+            self.queue_retry(occ_listing_url(keyword, page), "occ_listing", {"keyword": keyword, "page": page}, e)
             return []
     
-    async def get_job_description(self, job_url: str) -> str:
-        """Get job description by visiting the job page"""
+    async def load_jobs_page(self, keyword: str, page: int = 1, with_descriptions: bool = True,
+                             known_links: Optional[set] = None) -> List[JobRecord]:
+        """Like search_jobs_single_page, but raises instead of swallowing errors"""
+        html = await self.load_listing_html(occ_listing_url(keyword, page), 2000, 1000)  # Reduced wait time
+        return await self.parse_jobs_page(html, with_descriptions, known_links)
+    
+    async def get_job_description(self, job_url: str, page=None) -> str:
+        """Get job description, over HTTP when possible and otherwise by visiting the job page"""
+        if self.cache:
+            cached_html = self.cache.lookup(job_url)
+            if cached_html:
+                description = self.extract_description(make_soup(cached_html), allow_page_text=False)
+                if description:
+                    self.fetch_stats['detail_cache'] += 1
+                    return description
+        
+        if self.fetch_mode == "hybrid":
+            html = await self.fetch_html(job_url, use_cache=True)
+            if html:
+                # Only trust the dedicated description containers on raw HTML,
+                # not the whole-page fallback that would pick up the app shell
+                description = self.extract_description(make_soup(html), allow_page_text=False)
+                if description:
+                    self.fetch_stats['detail_http'] += 1
+                    return description
+        
+        self.fetch_stats['detail_browser'] += 1
+        if page is None and self.detail_pool is not None:
+            async with self.detail_pool.page() as pooled_page:
+                return await self.render_job_description(job_url, pooled_page)
+        return await self.render_job_description(job_url, page)
+    
+    async def render_job_description(self, job_url: str, page=None) -> str:
+        """Get job description by visiting the job page in the browser"""
         try:
+            await self.ensure_browser()
+            page = page or self.page
+            
             # Navigate to the job page
-            await self.page.goto(job_url, timeout=30000)
-            await self.page.wait_for_timeout(2000)
+            await self.goto(page, job_url, 30000)
+            await self.wait_until_ready(page, DESCRIPTION_SELECTOR, 2000)
             
             # Get the HTML content
-            html = await self.page.content()
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Look for description elements - OCC specific selectors based on real HTML
-            description_elem = (
-                soup.find('div', class_='break-words mb-8') or  # Main description container
-                soup.find('div', class_='[&>p]:m-0 [&>p]:p-0 [&>img]:w-[100vh] [&>img]:h-auto overflow-hidden [&>ul]:list-disc [&>ul]:list-inside font-light [&>p]:font-normal [&>ul>li>strong]:font-bold [&>ul]:indent-5') or  # Description content
-                soup.find('div', class_='job-description') or
-                soup.find('div', class_='description') or
-                soup.find('div', class_='job-details') or
-                soup.find('div', class_='content') or
-                soup.find('div', class_='body') or
-                soup.find('p', class_='description') or
-                soup.find('div', {'data-testid': 'job-description'}) or
-                soup.find('div', class_='job-content') or
-                soup.find('div', class_='job-summary') or
-                soup.find('div', class_='job-requirements') or
-                soup.find('div', class_='job-responsibilities') or
-                soup.find('div', class_='job-duties') or
-                soup.find('section', class_='job-description') or
-                soup.find('article', class_='job-description')
-            )
-            
-            if description_elem:
-                # Clean up the text
-                text = description_elem.get_text(strip=True)
-                # Remove extra whitespace and newlines
-                text = ' '.join(text.split())
-                return text
-            else:
-                # Try to find description by looking for "Descripción" text
-                desc_heading = soup.find('p', string=lambda text: text and 'Descripción' in text)
-                if desc_heading:
-                    # Get the next sibling div that contains the description
-                    next_div = desc_heading.find_next_sibling('div')
-                    if next_div:
-                        text = next_div.get_text(strip=True)
-                        text = ' '.join(text.split())
-                        return text
-                
-                # Try to find any text content that might be the description
-                main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='main')
-                if main_content:
-                    text = main_content.get_text(strip=True)
-                    text = ' '.join(text.split())
-                    if len(text) > 100:  # Only return if it's substantial
-                        return text
-                
-                return "Descripción no disponible"
+            html = await page.content()
+            soup = make_soup(html)
+            description = self.extract_description(soup)
+            if description and self.cache:
+                self.cache.store(job_url, html)
+            return description or "Descripción no disponible"
                 
         except Exception as e:
             logger.error(f"Error getting description from {job_url}: {e}")
-            return "Error al obtener descripción"
+            return DESCRIPTION_ERROR
+    
+    def extract_description(self, soup, allow_page_text: bool = True) -> Optional[str]:
+        """Find the job description text in a job page, or None if it is not there"""
+        # Look for description elements - OCC specific selectors based on real HTML
+        description_elem = (
+            soup.find('div', class_='break-words mb-8') or  # Main description container
+            soup.find('div', class_='[&>p]:m-0 [&>p]:p-0 [&>img]:w-[100vh] [&>img]:h-auto overflow-hidden [&>ul]:list-disc [&>ul]:list-inside font-light [&>p]:font-normal [&>ul>li>strong]:font-bold [&>ul]:indent-5') or  # Description content
+            soup.find('div', class_='job-description') or
+            soup.find('div', class_='description') or
+            soup.find('div', class_='job-details') or
+            soup.find('div', class_='content') or
+            soup.find('div', class_='body') or
+            soup.find('p', class_='description') or
+            soup.find('div', {'data-testid': 'job-description'}) or
+            soup.find('div', class_='job-content') or
+            soup.find('div', class_='job-summary') or
+            soup.find('div', class_='job-requirements') or
+            soup.find('div', class_='job-responsibilities') or
+            soup.find('div', class_='job-duties') or
+            soup.find('section', class_='job-description') or
+            soup.find('article', class_='job-description')
+        )
+        
+        if description_elem:
+            # Clean up the text
+            text = description_elem.get_text(strip=True)
+            # Remove extra whitespace and newlines
+            text = ' '.join(text.split())
+            return text
+        
+        # Try to find description by looking for "Descripción" text
+        desc_heading = soup.find('p', string=lambda text: text and 'Descripción' in text)
+        if desc_heading:
+            # Get the next sibling div that contains the description
+            next_div = desc_heading.find_next_sibling('div')
+            if next_div:
+                text = next_div.get_text(strip=True)
+                text = ' '.join(text.split())
+                return text
+        
+        if not allow_page_text:
+            return None
+        
+        # Try to find any text content that might be the description
+        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='main')
+        if main_content:
+            text = main_content.get_text(strip=True)
+            text = ' '.join(text.split())
+            if len(text) > 100:  # Only return if it's substantial
+                return text
+        
+        return None
     
-    async def parse_jobs_page(self, html: str) -> List[Dict]:
-        """Parse job listings from HTML page"""
+    async def parse_jobs_page(self, html: str, with_descriptions: bool = True,
+                              known_links: Optional[set] = None) -> List[JobRecord]:
+        """Parse job listings from HTML page, fetching descriptions for jobs not in known_links"""
         jobs = []
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, parse_only=JOB_CARD_STRAINER)
         
         # Find job cards using OCC's structure (div with id starting with "jobcard-")
         job_cards = soup.select('div[id^="jobcard-"]')
@@ -155,23 +503,69 @@ class OCCScraper:
         
         for card in job_cards:
             try:
-                job = await self.extract_job_data(card)
+                job = await self.extract_job_data(card, fetch_description=False)
                 if job:
                     jobs.append(job)
             except Exception as e:
                 logger.error(f"Error parsing job card: {e}")
                 continue
         
+        if with_descriptions:
+            if known_links:
+                await self.fetch_descriptions([job for job in jobs if job['link'] not in known_links])
+            else:
+                await self.fetch_descriptions(jobs)
         return jobs
     
-    async def extract_job_data(self, card) -> Optional[Dict]:
+    async def fetch_descriptions(self, jobs: List[JobRecord]) -> None:
+        """Fill in job descriptions, at most detail_concurrency at a time
+        
+        Jobs whose description could not be fetched are sent to the retry queue.
+        """
+        async for _ in self.iter_descriptions(jobs):
+            pass
+    
+    async def iter_descriptions(self, jobs: List[JobRecord]) -> AsyncIterator[JobRecord]:
+        """Like fetch_descriptions, but yield each job as soon as its description is in
+        
+        Jobs without a link are yielded first, unchanged. Closing the iterator
+        cancels the fetches still in flight.
+        """
+        semaphore = asyncio.Semaphore(self.detail_concurrency)
+        
+        async def fill(job):
+            async with semaphore:
+                error = "description not found"
+                try:
+                    job['description'] = await self.get_job_description(job['link'])
+                except Exception as e:
+                    logger.error(f"Error getting description for {job['link']}: {e}")
+                    job['description'] = DESCRIPTION_ERROR
+                    error = e
+                if job['description'] == DESCRIPTION_ERROR:
+                    self.queue_retry(job['link'], "occ_detail", dict(job), error)
+            return job
+        
+        for job in jobs:
+            if not job['link']:
+                yield job
+        tasks = [asyncio.ensure_future(fill(job)) for job in jobs if job['link']]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def extract_job_data(self, card, fetch_description: bool = True) -> Optional[JobRecord]:
         """Extract job data from a job card element"""
         try:
             # Extract job ID from the card's id attribute
             job_id = card.get('id', '').replace('jobcard-', '')
             
             # Extract title - try multiple approaches
-            title = "N/A"
+            title = None
             title_elem = (
                 card.find('h2') or 
                 card.find('h3') or 
@@ -184,7 +578,7 @@ class OCCScraper:
                 title = title_elem.get_text(strip=True)
             
             # Extract company - based on the actual HTML structure
-            company = "N/A"
+            company = None
             # Look for the div that contains both company and location
             company_location_div = card.find('div', class_='flex flex-row justify-between items-center')
             if company_location_div:
@@ -210,7 +604,7 @@ class OCCScraper:
                     company = company_elem.get_text(strip=True)
             
             # Extract location - based on the actual HTML structure
-            location = "N/A"
+            location = None
             # Look for the div that contains both company and location
             company_location_div = card.find('div', class_='flex flex-row justify-between items-center')
             if company_location_div:
@@ -236,7 +630,7 @@ class OCCScraper:
                     location = location_elem.get_text(strip=True)
             
             # Extract description/summary - try multiple approaches
-            description = "N/A"
+            description = None
             desc_elem = (
                 card.find('p', class_='description') or 
                 card.find('div', class_='job-summary') or
@@ -250,7 +644,7 @@ class OCCScraper:
                 description = desc_elem.get_text(strip=True)
             
             # Extract salary - based on the actual HTML structure
-            salary = "N/A"
+            salary = None
             # Look for the salary span with specific classes
             salary_elem = card.find('span', class_='mr-2 text-grey-900 font-base font-light mb-4')
             if salary_elem:
@@ -269,7 +663,7 @@ class OCCScraper:
                     salary = salary_elem.get_text(strip=True)
             
             # Extract job URL using the job ID from the card
-            job_url = "N/A"
+            job_url = None
             job_id = card.get('id', '').replace('jobcard-', '')
             if job_id:
                 job_url = f"{self.base_url}/empleos/empleo-{job_id}/"
@@ -277,69 +671,366 @@ class OCCScraper:
 
             
             # Extract description by visiting the job page
-            description = "N/A"
-            if job_url != "N/A":
+            description = None
+            if fetch_description and job_url:
                 try:
                     description = await self.get_job_description(job_url)
                 except Exception as e:
                     logger.error(f"Error getting description for {job_url}: {e}")
-                    description = "Error al obtener descripción"
+                    description = DESCRIPTION_ERROR
             
-            return {
-                'title': title,
-                'company': company,
-                'location': location,
-                'description': description,
-                'salary': salary,
-                'modality': 'N/A',  # OCC doesn't always show modality
-                'link': job_url,
-                'source': 'OCC'
-            }
+            return JobRecord(
+                title=title,
+                company=company,
+                location=location,
+                description=description,
+                salary=salary,
+                modality=None,  # OCC doesn't always show modality
+                link=job_url,
+                source=Source.OCC,
+            )
             
         except Exception as e:
             logger.error(f"Error extracting job data: {e}")
             return None
 
-async def scrape_jobs_occ(keyword: str, pages: int = 5) -> List[Dict]:
+class OCCScraperSession:
+    """Keeps one OCCScraper (browser and warm pages) alive for a whole run, restarting it only on failure"""
+    
+    def __init__(self, max_restarts: int = 10, recycle_after: Optional[int] = None, **scraper_kwargs):
+        # One limiter for the whole session, so restarts keep the learned rate
+        scraper_kwargs.setdefault("rate_limiter", HostRateLimiter())
+        self.scraper_kwargs = scraper_kwargs
+        self.max_restarts = max_restarts
+        # Optionally relaunch the browser every N calls to keep its memory in check
+        self.recycle_after = recycle_after
+        self.scraper = None
+        self.restarts = 0
+        self.calls_since_start = 0
+        # Concurrent callers share the scraper; only one of them may replace it
+        self._restart_lock = asyncio.Lock()
+        # Calls in flight per scraper; a replaced scraper is closed once its last call returns
+        self._calls_in_flight: Dict[OCCScraper, int] = {}
+        self._retiring = set()
+        # Fetch counters of every scraper this session has run
+        self.fetch_stats = Counter()
+    
+    async def __aenter__(self):
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def start(self):
+        self.scraper = OCCScraper(**self.scraper_kwargs)
+        await self.scraper.start()
+        self.calls_since_start = 0
+    
+    async def close(self):
+        for scraper in list(self._retiring):
+            await self._close_scraper(scraper)
+        if self.scraper:
+            await self._close_scraper(self.scraper)
+            self.scraper = None
+    
+    async def _close_scraper(self, scraper):
+        self._retiring.discard(scraper)
+        self.fetch_stats.update(scraper.fetch_stats)
+        await scraper.close()
+    
+    async def _retire(self, scraper):
+        """Close a replaced scraper now, or once the calls still running on it return"""
+        if self._calls_in_flight.get(scraper):
+            self._retiring.add(scraper)
+        else:
+            await self._close_scraper(scraper)
+    
+    async def _release(self, scraper):
+        self._calls_in_flight[scraper] -= 1
+        if self._calls_in_flight[scraper] == 0:
+            del self._calls_in_flight[scraper]
+            if scraper in self._retiring:
+                await self._close_scraper(scraper)
+    
+    def fetch_report(self) -> Dict:
+        """HTTP vs browser hit rates over the whole session"""
+        stats = Counter(self.fetch_stats)
+        for scraper in [self.scraper, *self._retiring]:
+            if scraper:
+                stats.update(scraper.fetch_stats)
+        return fetch_hit_rates(stats)
+    
+    async def restart(self, reason: str = ""):
+        """Tear down the current browser and launch a fresh one"""
+        if self.restarts >= self.max_restarts:
+            raise RuntimeError(f"OCC browser session restarted {self.restarts} times, giving up")
+        self.restarts += 1
+        logger.warning(f"Restarting OCC browser session ({self.restarts}/{self.max_restarts}): {reason}")
+        await self.replace()
+    
+    async def replace(self):
+        """Swap in a fresh scraper; the old one is closed once no call is using it"""
+        old_scraper, self.scraper = self.scraper, None
+        if old_scraper:
+            await self._retire(old_scraper)
+        await self.start()
+    
+    async def restart_if_current(self, scraper, reason: str = ""):
+        """Restart unless another caller already replaced this scraper"""
+        async with self._restart_lock:
+            if self.scraper is scraper:
+                await self.restart(reason)
+    
+    async def run(self, method: str, *args, **kwargs):
+        """Call an OCCScraper method on the live session, retrying it once if it fails
+        
+        The browser is only restarted when it died (not is_healthy()); an
+        ordinary error such as a page timeout is retried on the live browser,
+        which the other tasks keep using. Safe to call from several tasks at
+        once: a dead browser is only restarted if no other task has done so
+        in the meantime, and a replaced browser stays open until the other
+        tasks' calls on it return.
+        """
+        if self.recycle_after and self.calls_since_start >= self.recycle_after:
+            async with self._restart_lock:
+                if self.calls_since_start >= self.recycle_after:
+                    await self.replace()
+        
+        for attempt in range(2):
+            scraper = self.scraper
+            if scraper is None or not scraper.is_healthy():
+                await self.restart_if_current(scraper, "browser not healthy")
+                scraper = self.scraper
+            self.calls_since_start += 1
+            self._calls_in_flight[scraper] = self._calls_in_flight.get(scraper, 0) + 1
+            try:
+                result = await getattr(scraper, method)(*args, **kwargs)
+                # Scraper methods log and swallow navigation errors, so a crash
+                # during the call only shows up as a dead browser afterwards.
+                # Checked before releasing, which may close a replaced scraper
+                healthy = scraper.is_healthy()
+            except Exception as e:
+                if attempt == 1:
+                    raise
+                if scraper.is_healthy():
+                    logger.warning(f"{method} failed on a live browser, retrying: {e}")
+                else:
+                    await self.restart_if_current(scraper, str(e))
+                continue
+            finally:
+                await self._release(scraper)
+            if healthy or attempt == 1:
+                return result
+            await self.restart_if_current(scraper, f"browser died during {method}")
+
+
+def occ_retry_handlers(runner, on_jobs, known_links: Optional[set] = None, save_target: str = "sink") -> Dict:
+    """Handlers for ScraperCommon.retry_queue.drain_retry_queue
+    
+    runner is an OCCScraper or OCCScraperSession, and on_jobs(jobs) (plain
+    or async) saves the jobs a retry recovered: the new jobs of a listing
+    page (links not in known_links), or a job whose description now loaded.
+    save_target picks the entries: those queued by runs that saved to the
+    job sink, or by runs that saved to jobs.db (whose on_jobs should update
+    the stored rows, which hold the description placeholder).
+    """
+    known_links = known_links if known_links is not None else set()
+    
+    async def save(jobs):
+        result = on_jobs(jobs)
+        if inspect.isawaitable(result):
+            await result
+    
+    async def retry_listing(entry) -> bool:
+        context = entry["context"]
+        jobs = await runner.run("load_jobs_page", context["keyword"], context["page"], known_links=known_links)
+        new_jobs = [job for job in jobs if job['link'] and job['link'] not in known_links]
+        known_links.update(job['link'] for job in new_jobs)
+        await save(new_jobs)
+        return True
+    
+    async def retry_detail(entry) -> bool:
+        description = await runner.run("get_job_description", entry["url"])
+        if description == DESCRIPTION_ERROR:
+            return False
+        job = JobRecord.from_dict(entry["context"])
+        job['description'] = description
+        await save([job])
+        return True
+    
+    suffix = "_db" if save_target == "db" else ""
+    return {f"occ_listing{suffix}": retry_listing, f"occ_detail{suffix}": retry_detail}
+
+
+async def iter_keyword_jobs(scraper: OCCScraper, keyword: str, pages: int,
+                            known_links: Optional[set] = None) -> AsyncIterator[JobRecord]:
+    """Yield the jobs of a keyword's first `pages` listing pages on an open scraper"""
+    for page in range(1, pages + 1):
+        logger.info(f"Scraping page {page}/{pages} for keyword: {keyword}")
+        
+        # Requests are paced by the scraper's rate limiter, so no extra sleeps here
+        jobs = await scraper.search_jobs(keyword, page, with_descriptions=False)
+        if known_links is not None:
+            jobs = [job for job in jobs if not job['link'] or job['link'] not in known_links]
+            known_links.update(job['link'] for job in jobs if job['link'])
+        
+        logger.info(f"Found {len(jobs)} jobs on page {page}")
+        
+        async for job in scraper.iter_descriptions(jobs):
+            yield job
+
+async def iter_jobs_occ(keyword: str, pages: int = 5, detail_concurrency: int = 1,
+                        resource_policy: Optional[ResourcePolicy] = None,
+                        fetch_mode: str = "browser", cache: Optional[HttpCache] = None,
+                        rate_limiter: Optional[HostRateLimiter] = None,
+                        known_links: Optional[set] = None) -> AsyncIterator[JobRecord]:
+    """
+    Scrape jobs from OCC, yielding each one as soon as its description is in
+    
+    Only one listing page of jobs is held at a time. Breaking out of the loop
+    or cancelling the consuming task stops the crawl and closes the browser;
+    wrap the iterator in contextlib.aclosing() to close it right away.
+    
+    Args:
+        keyword (str): Search keyword for jobs
+        pages (int): Number of pages to scrape
+        known_links (set): Links to skip, detail request included; yielded
+            links are added to it, so one set dedups across calls
+        Other arguments: as for scrape_jobs_occ
+    
+    Yields:
+        JobRecord: Jobs, in completion order within a page
+    """
+    found = 0
+    
+    async with OCCScraper(detail_concurrency=detail_concurrency, resource_policy=resource_policy,
+                          fetch_mode=fetch_mode, cache=cache, rate_limiter=rate_limiter) as scraper:
+        async for job in iter_keyword_jobs(scraper, keyword, pages, known_links):
+            found += 1
+            yield job
+        
+        logger.info(f"Fetch paths: {scraper.fetch_report()}")
+        logger.info(f"Request rates: {scraper.rate_limiter.rates()}")
+    
+    logger.info(f"Total jobs scraped: {found}")
+
+async def scrape_jobs_occ(keyword: str, pages: int = 5, detail_concurrency: int = 1,
+                          resource_policy: Optional[ResourcePolicy] = None,
+                          fetch_mode: str = "browser", cache: Optional[HttpCache] = None,
+                          rate_limiter: Optional[HostRateLimiter] = None) -> List[JobRecord]:
     """
     Main function to scrape jobs from OCC
     
     Args:
         keyword (str): Search keyword for jobs
         pages (int): Number of pages to scrape
+        detail_concurrency (int): Job detail pages fetched in parallel
+        resource_policy (ResourcePolicy): Optional request blocking policy
+        fetch_mode (str): "browser" or "hybrid" (plain HTTP first, browser fallback)
+        cache (HttpCache): Optional on-disk cache for job detail pages
+        rate_limiter (HostRateLimiter): Optional shared pacing for requests
     
     Returns:
-        List[Dict]: List of job dictionaries
+        List[JobRecord]: List of job records
     """
-    all_jobs = []
+    return [
+        job async for job in iter_jobs_occ(keyword, pages, detail_concurrency, resource_policy, fetch_mode,
+                                           cache, rate_limiter)
+    ]
+
+async def iter_jobs_occ_two_phase(keywords: List[str], pages: int = 5, target: Optional[int] = None,
+                                  **scraper_kwargs) -> AsyncIterator[JobRecord]:
+    """
+    Listing-first crawl that fetches each unique job's details only once
     
-    async with OCCScraper() as scraper:
-        for page in range(1, pages + 1):
-            logger.info(f"Scraping page {page}/{pages} for keyword: {keyword}")
-            
-            jobs = await scraper.search_jobs(keyword, page)
-            
-            # Process each job to get descriptions
-            processed_jobs = []
-            for i, job in enumerate(jobs):
-                logger.info(f"Processing job {i+1}/{len(jobs)} on page {page}")
-                processed_jobs.append(job)
+    Phase one sweeps the listing pages of every keyword and keeps the card
+    fields of each unique job link; phase two fetches the descriptions and
+    yields each job as soon as its description is in.
+    
+    Args:
+        keywords (List[str]): Search keywords, in crawl order
+        pages (int): Listing pages per keyword
+        target (int): Stop the listing sweep once this many unique jobs are found
+        **scraper_kwargs: Passed on to OCCScraper
+    
+    Yields:
+        JobRecord: Unique jobs with descriptions
+    """
+    unique_jobs = {}
+    cards_seen = 0
+    
+    async with OCCScraper(**scraper_kwargs) as scraper:
+        # Phase 1: listing pages only
+        for keyword in keywords:
+            for page in range(1, pages + 1):
+                logger.info(f"[Listing] {keyword} page {page}/{pages}")
+                cards = await scraper.search_jobs_single_page(keyword, page, with_descriptions=False)
+                cards_seen += len(cards)
+                for job in cards:
+                    if job['link'] and job['link'] not in unique_jobs:
+                        unique_jobs[job['link']] = job
                 
-                # Add small delay between job processing
-                if i < len(jobs) - 1:
-                    await asyncio.sleep(random.uniform(0.5, 1))
+                if target and len(unique_jobs) >= target:
+                    break
             
-            all_jobs.extend(processed_jobs)
-            
-            logger.info(f"Found {len(jobs)} jobs on page {page}")
-            
-            # Add delay between pages to be respectful
-            if page < pages:
-                delay = random.uniform(2, 4)
-                await asyncio.sleep(delay)
+            logger.info(f"[Listing] {keyword} done, {len(unique_jobs)} unique jobs so far")
+            if target and len(unique_jobs) >= target:
+                break
+        
+        # Phase 2: one detail fetch per unique job
+        jobs = list(unique_jobs.values())
+        unique_jobs.clear()
+        logger.info(f"[Details] Fetching {len(jobs)} descriptions "
+                    f"({cards_seen - len(jobs)} duplicate detail requests avoided)")
+        async for job in scraper.iter_descriptions(jobs):
+            yield job
+        
+        logger.info(f"Fetch paths: {scraper.fetch_report()}")
+
+async def scrape_jobs_occ_two_phase(keywords: List[str], pages: int = 5, target: Optional[int] = None,
+                                    **scraper_kwargs) -> List[JobRecord]:
+    """
+    Listing-first crawl that fetches each unique job's details only once
+    
+    Collects iter_jobs_occ_two_phase() into a list, in the order the
+    descriptions came in.
+    
+    Returns:
+        List[JobRecord]: Unique job records with descriptions
+    """
+    return [job async for job in iter_jobs_occ_two_phase(keywords, pages, target, **scraper_kwargs)]
+
+class OCCSource(JobSource):
+    """OCC as a ScraperCommon JobSource
+    
+    Crawls every keyword's listing pages on one OCCScraper; its
+    detail_concurrency sets how many descriptions load at once and its
+    rate_limiter the pace. scraper_kwargs are passed on to OCCScraper;
+    save_target defaults to "db", as run_sources() pipelines save to jobs.db.
+    """
+    
+    name = "occ"
+    
+    def __init__(self, keywords: List[str], pages: int = 5, **scraper_kwargs):
+        self.keywords = keywords
+        self.pages = pages
+        scraper_kwargs.setdefault("save_target", "db")
+        self.scraper = OCCScraper(**scraper_kwargs)
+    
+    async def start(self):
+        await self.scraper.start()
+    
+    async def close(self):
+        await self.scraper.close()
+    
+    async def iter_jobs(self, known_links: Optional[set] = None) -> AsyncIterator[JobRecord]:
+        for keyword in self.keywords:
+            async for job in iter_keyword_jobs(self.scraper, keyword, self.pages, known_links):
+                yield job
     
-    logger.info(f"Total jobs scraped: {len(all_jobs)}")
-    return all_jobs
+    def stats(self) -> Dict:
+        return {"fetch": self.scraper.fetch_report(), "rates": self.scraper.rate_limiter.rates()}
 
 # For testing
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+"""
+Shared utilities for the OCC and Computrabajo scrapers
+"""
+
+from .http_cache import HttpCache
+from .job_record import JobRecord, Source
+from .job_sink import JobSink
+from .leases import LeaseTable
+from .matching import TermMatcher, classify_jobs, explain_job, is_hr_related, is_mexico_location
+from .parsing import make_soup, resolve_backend
+from .rate_limiter import HostRateLimiter
+from .retry_queue import CircuitBreaker, RetryQueue, drain_retry_queue
+from .sources import JobPipeline, JobSource, run_sources
+
+__all__ = [
+    "CircuitBreaker",
+    "HttpCache",
+    "HostRateLimiter",
+    "JobPipeline",
+    "JobRecord",
+    "JobSink",
+    "JobSource",
+    "LeaseTable",
+    "RetryQueue",
+    "Source",
+    "TermMatcher",
+    "classify_jobs",
+    "drain_retry_queue",
+    "explain_job",
+    "is_hr_related",
+    "is_mexico_location",
+    "make_soup",
+    "resolve_backend",
+    "run_sources",
+]
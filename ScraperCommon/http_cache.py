@@ -0,0 +1,183 @@
+"""
+On-disk HTTP response cache shared by both scrapers
+
+Entries are keyed by the SHA-256 of the URL and stored as a body file plus a
+small JSON metadata file. Fresh entries (younger than the TTL) are served
+without touching the network; stale ones are revalidated with
+If-None-Match / If-Modified-Since. The cache is kept under max_bytes by
+evicting the least recently used entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "exports/http_cache"
+DEFAULT_TTL = 7 * 24 * 3600  # Job postings rarely change once published
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+
+class CachedResponse:
+    """The parts of an HTTP response the scrapers use"""
+
+    def __init__(self, status_code: int, text: str, from_cache: bool):
+        self.status_code = status_code
+        self.text = text
+        # True when no network request was made at all
+        self.from_cache = from_cache
+
+
+class HttpCache:
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._total_bytes = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        folder = os.path.join(self.directory, key[:2])
+        return os.path.join(folder, f"{key}.html"), os.path.join(folder, f"{key}.json")
+
+    def _read(self, url: str):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "r", encoding="utf-8") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        if meta.get("url") != url:
+            return None, None
+        return meta, body
+
+    def _write_atomic(self, path: str, content: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _touch(self, url: str):
+        body_path, _ = self._paths(url)
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+
+    def _is_fresh(self, meta: Dict) -> bool:
+        return time.time() - meta.get("fetched_at", 0) < self.ttl
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Return the cached body of url if it is still fresh"""
+        meta, body = self._read(url)
+        if meta is None or not self._is_fresh(meta):
+            return None
+        self.hits += 1
+        self._touch(url)
+        return body
+
+    def store(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Save a response body for url"""
+        body_path, meta_path = self._paths(url)
+        try:
+            previous_size = os.path.getsize(body_path) if os.path.exists(body_path) else 0
+            self._write_atomic(body_path, text)
+            self._write_atomic(meta_path, json.dumps({
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": time.time(),
+            }))
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+            return
+        self._add_size(os.path.getsize(body_path) - previous_size)
+
+    async def get(self, client, url: str, headers: Optional[Dict] = None, **kwargs) -> CachedResponse:
+        """GET url through the cache using an httpx.AsyncClient
+
+        Network errors propagate exactly like client.get would raise them.
+        """
+        meta, body = self._read(url)
+        if meta is not None and self._is_fresh(meta):
+            self.hits += 1
+            self._touch(url)
+            return CachedResponse(200, body, from_cache=True)
+
+        request_headers = dict(headers or {})
+        if meta is not None:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = await client.get(url, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and meta is not None:
+            self.revalidated += 1
+            self.store(url, body, meta.get("etag"), meta.get("last_modified"))
+            return CachedResponse(200, body, from_cache=False)
+
+        if response.status_code == 200:
+            self.misses += 1
+            self.store(url, response.text, response.headers.get("etag"), response.headers.get("last-modified"))
+        return CachedResponse(response.status_code, response.text, from_cache=False)
+
+    def _add_size(self, delta: int):
+        if self._total_bytes is None:
+            self._total_bytes = self._scan_size()
+        else:
+            self._total_bytes += delta
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        for folder in os.scandir(self.directory):
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.endswith(".html"):
+                    yield entry
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def evict(self):
+        """Drop least recently used entries until the cache is under 90% of max_bytes"""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        target = self.max_bytes * 0.9
+        removed = 0
+        for entry in entries:
+            if total <= target:
+                break
+            size = entry.stat().st_size
+            for path in (entry.path, entry.path[:-len(".html")] + ".json"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+        self._total_bytes = total
+        logger.info(f"HTTP cache evicted {removed} entries, {total / 1024 / 1024:.1f} MB left")
+
+    def stats(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
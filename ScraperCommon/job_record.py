@@ -0,0 +1,115 @@
+"""
+Compact in-memory representation of a scraped job
+
+A JobRecord holds the eight job fields in __slots__ instead of a per-job
+dict. Missing values are None rather than sentinel strings ("N/A", "No
+especificado", ...), the source is a Source member, and short repeated
+values (company, location, salary, modality) are interned so thousands of
+jobs share one copy of each. Records still support job["link"], job.get()
+and dict(job), so code written against job dicts keeps working, and
+to_row() / to_csv_row() give the DB and CSV forms.
+"""
+
+import sys
+from enum import Enum
+from typing import Dict, Iterator, Mapping, Optional, Union
+
+JOB_FIELDS = ("title", "company", "location", "salary", "modality", "link", "description", "source")
+
+# Set-like view of the field names, as csv.DictWriter expects from keys()
+_FIELD_KEYS = dict.fromkeys(JOB_FIELDS).keys()
+
+# Placeholders the scrapers used to store for missing values
+MISSING_VALUES = frozenset({"", "N/A", "No especificado", "No disponible"})
+
+# Fields with few distinct values, shared between records
+_INTERNED_FIELDS = frozenset({"company", "location", "salary", "modality"})
+
+
+class Source(str, Enum):
+    OCC = "OCC"
+    COMPUTRABAJO = "Computrabajo"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+def _clean(field: str, value) -> Optional[object]:
+    if value is None:
+        return None
+    if field == "source":
+        return Source(value) if value else None
+    if value in MISSING_VALUES:
+        return None
+    if field in _INTERNED_FIELDS and isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class JobRecord:
+    __slots__ = JOB_FIELDS
+
+    def __init__(self, title: Optional[str] = None, company: Optional[str] = None, location: Optional[str] = None,
+                 salary: Optional[str] = None, modality: Optional[str] = None, link: Optional[str] = None,
+                 description: Optional[str] = None, source: Union[Source, str, None] = None):
+        self.title = _clean("title", title)
+        self.company = _clean("company", company)
+        self.location = _clean("location", location)
+        self.salary = _clean("salary", salary)
+        self.modality = _clean("modality", modality)
+        self.link = _clean("link", link)
+        self.description = _clean("description", description)
+        self.source = _clean("source", source)
+
+    @classmethod
+    def from_dict(cls, job: Mapping) -> "JobRecord":
+        """Build a record from a job dict or CSV row, turning placeholders into None"""
+        if isinstance(job, JobRecord):
+            return job
+        return cls(**{field: job.get(field) for field in JOB_FIELDS})
+
+    # Mapping-style access, for code that treats jobs as dicts
+    def __getitem__(self, field: str):
+        if field not in _FIELD_KEYS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field: str, value):
+        if field not in _FIELD_KEYS:
+            raise KeyError(field)
+        setattr(self, field, _clean(field, value))
+
+    def __contains__(self, field) -> bool:
+        return field in _FIELD_KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(JOB_FIELDS)
+
+    def __len__(self) -> int:
+        return len(JOB_FIELDS)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, JobRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in JOB_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"JobRecord(title={self.title!r}, link={self.link!r}, source={self.source!r})"
+
+    def keys(self):
+        return _FIELD_KEYS
+
+    def get(self, field: str, default=None):
+        """Like dict.get, but a missing (None) value also gives default"""
+        value = getattr(self, field, None) if field in _FIELD_KEYS else None
+        return default if value is None else value
+
+    def to_row(self) -> Dict[str, Optional[str]]:
+        """Column values for job_listings; missing values become NULL"""
+        row = {field: getattr(self, field) for field in JOB_FIELDS}
+        row["source"] = self.source.value if self.source else None
+        return row
+
+    def to_csv_row(self) -> Dict[str, str]:
+        """Values for a CSV row; missing values become empty cells"""
+        return {field: "" if getattr(self, field) is None else str(getattr(self, field)) for field in JOB_FIELDS}
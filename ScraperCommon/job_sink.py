@@ -0,0 +1,176 @@
+"""
+Streaming, append-only job store
+
+Jobs are appended once to CSV segment files (segment_00001.csv, ...) in a
+directory. Rows are buffered and written when the buffer reaches flush_rows
+or flush_seconds have passed, and a new segment is started every
+max_rows_per_segment rows. Reading back streams the segments row by row, so
+resuming never needs the whole crawl in memory; only the set of links is
+kept, so count() can report unique jobs when a link is written again. A
+partial last row left by a crash is cut off when the sink is reopened.
+"""
+
+import csv
+import glob
+import os
+import time
+from typing import Iterable, Iterator, List, Mapping
+
+from .job_record import JOB_FIELDS, JobRecord
+
+FIELDNAMES = list(JOB_FIELDS)
+
+
+class JobSink:
+    def __init__(self, directory: str, max_rows_per_segment: int = 1000, flush_rows: int = 50,
+                 flush_seconds: float = 10.0):
+        self.directory = directory
+        self.max_rows_per_segment = max_rows_per_segment
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._buffer: List[JobRecord] = []
+        self._last_flush = time.time()
+        self._file = None
+        self._writer = None
+        os.makedirs(directory, exist_ok=True)
+
+        # Continue the last segment where a previous run left off
+        segments = self.segment_paths()
+        self._links = set()
+        self.total_rows = 0
+        self._segment_rows = 0
+        for path in segments:
+            self._segment_rows = self._read_links(path, self._links)
+            self.total_rows += self._segment_rows
+        self._segment_index = len(segments) or 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def segment_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "segment_*.csv")))
+
+    @staticmethod
+    def _read_links(path: str, links: set) -> int:
+        """Add the links of a segment to links; returns its row count
+
+        A crash mid-write can leave a partial last row. It is cut off, or the
+        next row appended would be merged into it.
+        """
+        consumed = 0
+        line_complete = True
+
+        def lines(f):
+            nonlocal consumed, line_complete
+            for line in f:
+                consumed += len(line)
+                line_complete = line.endswith(b"\n")
+                yield line.decode('utf-8', 'replace')
+
+        header = None
+        rows = 0
+        intact = 0
+        with open(path, 'rb') as f:
+            # strict: a quoted field cut off by the end of the file is an error, not a value
+            reader = csv.reader(lines(f), strict=True)
+            try:
+                for row in reader:
+                    if not line_complete or (header is not None and row and len(row) != len(header)):
+                        break
+                    if header is None:
+                        header = row
+                        link_index = header.index('link')
+                    elif row:
+                        links.add(row[link_index])
+                        rows += 1
+                    intact = consumed
+            except csv.Error:
+                pass
+        if intact < os.path.getsize(path):
+            with open(path, 'r+b') as f:
+                f.truncate(intact)
+        return rows
+
+    def count(self) -> int:
+        """Unique jobs (by link) written so far, including buffered ones; what export() writes"""
+        return len(self._links)
+
+    def write(self, jobs: Iterable[Mapping]):
+        """Queue jobs (JobRecords or job dicts) for appending, flushing once the size or time budget is used up"""
+        for job in jobs:
+            job = JobRecord.from_dict(job)
+            self._buffer.append(job)
+            self._links.add(job.link or "")
+        if len(self._buffer) >= self.flush_rows or time.time() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def _open_segment(self):
+        path = os.path.join(self.directory, f"segment_{self._segment_index:05d}.csv")
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=FIELDNAMES, extrasaction='ignore')
+        if is_new:
+            self._writer.writeheader()
+
+    def flush(self):
+        """Append buffered jobs to disk, rotating segments as they fill up"""
+        for job in self._buffer:
+            if self._segment_rows >= self.max_rows_per_segment:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._segment_index += 1
+                self._segment_rows = 0
+            if self._file is None:
+                self._open_segment()
+            self._writer.writerow(job.to_csv_row())
+            self._segment_rows += 1
+            self.total_rows += 1
+        self._buffer.clear()
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._last_flush = time.time()
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _iter_rows(self) -> Iterator[dict]:
+        self.flush()
+        for path in self.segment_paths():
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                yield from csv.DictReader(f)
+
+    def iter_jobs(self) -> Iterator[JobRecord]:
+        """Stream every stored job, oldest first"""
+        for row in self._iter_rows():
+            yield JobRecord.from_dict(row)
+
+    def iter_links(self) -> Iterator[str]:
+        for row in self._iter_rows():
+            yield row['link']
+
+    def export(self, filename: str) -> int:
+        """Write all stored jobs into a single CSV file, one row per link
+
+        When a link was written more than once (e.g. again after a retry
+        recovered its description), the latest copy wins.
+        """
+        latest = {}
+        for position, link in enumerate(self.iter_links()):
+            latest[link] = position
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES, extrasaction='ignore')
+            writer.writeheader()
+            for position, row in enumerate(self._iter_rows()):
+                if latest[row['link']] == position:
+                    # Rows from older runs may still hold "N/A" placeholders
+                    writer.writerow(JobRecord.from_dict(row).to_csv_row())
+        return len(latest)
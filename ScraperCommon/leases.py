@@ -0,0 +1,163 @@
+"""
+SQLite lease table for crawls split across worker processes
+
+The keyword x page space of a source is seeded as work units in a shared
+SQLite file. Any number of worker processes claim units with a time-limited
+lease, extend it with heartbeats while they work and mark the unit done or
+failed at the end. A unit whose lease expires (its worker crashed or hung)
+is handed to the next worker that asks, so no unit is lost and none is
+worked on by two live workers at once.
+
+Claims take SQLite's write lock (BEGIN IMMEDIATE), so they are atomic across
+processes on one machine. Workers on several machines can share the file
+only over a filesystem with working POSIX locks; WAL mode is not used for
+that reason.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_LEASE_FILE = "exports/work_units.db"
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+def default_owner() -> str:
+    """Worker id that is unique across processes and hosts"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LeaseTable:
+    def __init__(self, path: str = DEFAULT_LEASE_FILE, lease_seconds: float = 300.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Autocommit mode, so claim() can open its own BEGIN IMMEDIATE transaction.
+        # Async callers run the methods in worker threads (asyncio.to_thread), so
+        # the connection may be used from any thread, one call at a time
+        self._conn = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS work_units ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " source TEXT NOT NULL,"
+            " keyword TEXT NOT NULL,"
+            " page INTEGER NOT NULL,"
+            " status TEXT NOT NULL,"
+            " owner TEXT,"
+            " lease_until REAL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " jobs INTEGER,"
+            " last_error TEXT,"
+            " updated REAL NOT NULL,"
+            " UNIQUE (source, keyword, page))"
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def seed(self, source: str, keywords: Iterable[str], pages: int) -> int:
+        """Add a unit for every (keyword, page) not seeded before; returns how many were added"""
+        with self._lock:
+            now = time.time()
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO work_units (source, keyword, page, status, updated) VALUES (?, ?, ?, ?, ?)",
+                [(source, keyword, page, PENDING, now) for keyword in keywords for page in range(1, pages + 1)],
+            )
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def claim(self, owner: str, sources: Optional[List[str]] = None, limit: int = 1) -> List[Dict]:
+        """Lease up to limit pending (or expired) units to owner, lowest pages first"""
+        with self._lock:
+            now = time.time()
+            query = "SELECT * FROM work_units WHERE (status = ? OR (status = ? AND lease_until < ?))"
+            params = [PENDING, LEASED, now]
+            if sources:
+                query += f" AND source IN ({', '.join('?' for _ in sources)})"
+                params.extend(sources)
+            query += " ORDER BY page, id LIMIT ?"
+            params.append(limit)
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                units = [dict(row) for row in self._conn.execute(query, params)]
+                for unit in units:
+                    unit["attempts"] += 1
+                    self._conn.execute(
+                        "UPDATE work_units SET status = ?, owner = ?, lease_until = ?, attempts = ?, updated = ?"
+                        " WHERE id = ?",
+                        (LEASED, owner, now + self.lease_seconds, unit["attempts"], now, unit["id"]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return units
+
+    def heartbeat(self, unit_id: int, owner: str) -> bool:
+        """Extend owner's lease on a unit; False if the lease was lost (expired and reclaimed)"""
+        with self._lock:
+            now = time.time()
+            cursor = self._conn.execute(
+                "UPDATE work_units SET lease_until = ?, updated = ? WHERE id = ? AND owner = ? AND status = ?",
+                (now + self.lease_seconds, now, unit_id, owner, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, unit_id: int, owner: str, jobs: int = 0) -> bool:
+        """Mark owner's unit as done; False if another worker holds it now"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE work_units SET status = ?, jobs = ?, lease_until = NULL, updated = ?"
+                " WHERE id = ? AND owner = ? AND status = ?",
+                (DONE, jobs, time.time(), unit_id, owner, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, unit_id: int, owner: str, error: str = "") -> bool:
+        """Release owner's unit after an error, for another try or for good after max_attempts"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE work_units SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,"
+                " owner = NULL, lease_until = NULL, last_error = ?, updated = ?"
+                " WHERE id = ? AND owner = ? AND status = ?",
+                (self.max_attempts, FAILED, PENDING, str(error)[:500], time.time(), unit_id, owner, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def reclaim_expired(self) -> int:
+        """Return units whose lease ran out to the pending pool; returns how many"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE work_units SET status = ?, owner = NULL, lease_until = NULL, updated = ?"
+                " WHERE status = ? AND lease_until < ?",
+                (PENDING, time.time(), LEASED, time.time()),
+            )
+            return cursor.rowcount
+
+    def stats(self, sources: Optional[List[str]] = None) -> Dict:
+        with self._lock:
+            counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+            query = "SELECT status, COUNT(*), COALESCE(SUM(jobs), 0) FROM work_units"
+            params: List = []
+            if sources:
+                query += f" WHERE source IN ({', '.join('?' for _ in sources)})"
+                params.extend(sources)
+            jobs = 0
+            for status, count, status_jobs in self._conn.execute(query + " GROUP BY status", params):
+                counts[status] = count
+                jobs += status_jobs
+            return {**counts, "jobs": jobs}
@@ -0,0 +1,172 @@
+"""
+Compiled keyword matchers for the HR and Mexico-location filters
+
+Each vocabulary is accent-folded once. Short texts (locations, titles) are
+checked with a single alternation regex; long descriptions with plain
+substring scans over the smallest set of terms that decides a match, since
+Python's re tries every alternative at every position and is slower there.
+Matching stays substring based like the original lists, but "selección"
+and "seleccion" (or "León" and "Leon") now match each other.
+"""
+
+import codecs
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+HR_TERMS = [
+    # Core HR terms
+    "recursos humanos", "rrhh", "hr", "human resources",
+    "rh", "capital humano", "human capital",
+
+    # Recruitment and selection
+    "reclutamiento", "selección", "recruitment", "selection",
+    "reclutador", "reclutadora", "seleccionador", "seleccionadora",
+    "talent acquisition", "adquisición de talento",
+
+    # HR functions
+    "personal", "capacitación", "training", "desarrollo organizacional",
+    "organizational development", "compensaciones", "compensation",
+    "beneficios", "benefits", "nómina", "payroll", "relaciones laborales",
+    "labor relations", "gestión del talento", "talent management",
+
+    # HR roles
+    "analista", "coordinador", "coordinadora", "gerente", "director",
+    "directora", "especialista", "consultor", "consultora", "ejecutivo",
+    "ejecutiva", "auxiliar", "asistente", "generalista",
+
+    # Specific HR terms
+    "onboarding", "inducción", "clima laboral", "organizational climate",
+    "evaluación de desempeño", "performance evaluation", "desarrollo de personal",
+    "personal development", "administración de personal", "personal administration",
+]
+
+MEXICO_TERMS = [
+    "méxico", "cdmx", "ciudad de méxico", "guadalajara", "monterrey",
+    "puebla", "tijuana", "mérida", "querétaro", "juárez", "león", "toluca",
+    "chihuahua", "morelia", "hermosillo", "saltillo", "aguascalientes", "zacatecas",
+    "san luis potosí", "durango", "colima", "manzanillo", "acapulco", "cancún",
+    "puerto vallarta", "oaxaca", "tuxtla gutiérrez", "villahermosa", "campeche",
+    "chetumal", "cozumel", "playa del carmen", "ensenada", "la paz", "los cabos",
+    "mazatlán", "culiacán", "nuevo laredo", "matamoros", "reynosa", "ciudad victoria",
+    "tampico", "veracruz", "xalapa", "tuxtla", "chiapas", "tabasco", "yucatán",
+    "quintana roo", "baja california", "baja california sur", "sonora", "coahuila",
+    "nuevo león", "tamaulipas", "sinaloa", "jalisco", "michoacán", "guerrero",
+    "morelos", "tlaxcala", "hidalgo", "guanajuato", "palenque", "benito juárez",
+    "miguel hidalgo", "cuauhtémoc", "iztapalapa", "tlalpan", "coyoacán",
+    "álvaro obregón", "magdalena contreras", "milpa alta", "tláhuac", "xochimilco",
+    "venustiano carranza", "gustavo a. madero", "azcapotzalco",
+]
+
+
+def _fold_slow(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+# Latin-1 byte -> byte of its unaccented form ("é" -> "e", "ñ" -> "n")
+_LATIN1_FOLD = bytearray(range(256))
+for _byte in range(0xC0, 0x100):
+    _folded = _fold_slow(chr(_byte))
+    if len(_folded) == 1 and ord(_folded) < 256:
+        _LATIN1_FOLD[_byte] = ord(_folded)
+_LATIN1_FOLD = bytes(_LATIN1_FOLD)
+
+
+def _fold_unencodable(error: UnicodeEncodeError):
+    # Characters outside Latin-1 are rare in job posts; fold them one by one
+    folded = _fold_slow(error.object[error.start:error.end])
+    return folded.encode("latin-1", "replace"), error.end
+
+
+codecs.register_error("matching.fold", _fold_unencodable)
+
+
+def fold(text: Optional[str]) -> str:
+    """Lowercase text and strip its accents ("Querétaro" -> "queretaro")
+
+    Characters with no Latin-1 form after folding (dashes, emoji, ...)
+    become "?"; no vocabulary term contains them.
+    """
+    if not text:
+        return ""
+    text = text.lower()
+    if text.isascii():
+        return text
+    return text.encode("latin-1", "matching.fold").translate(_LATIN1_FOLD).decode("latin-1")
+
+
+# Texts up to this length are matched with the regex, longer ones with substring scans
+_REGEX_MAX_LENGTH = 64
+
+
+class TermMatcher:
+    """Substring matcher for a fixed vocabulary, compiled into one regex"""
+
+    def __init__(self, terms: Iterable[str]):
+        # Folded form -> the spelling from the vocabulary, for reporting
+        self.terms: Dict[str, str] = {}
+        for term in terms:
+            self.terms.setdefault(fold(term), term)
+        # Longest first, so a report names "baja california sur" rather than "baja california"
+        alternatives = sorted(self.terms, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(term) for term in alternatives))
+        # A term containing a shorter term ("reclutadora", "reclutador") never decides a match
+        self._needles: List[str] = []
+        for term in sorted(self.terms, key=len):
+            if not any(needle in term for needle in self._needles):
+                self._needles.append(term)
+
+    def search(self, *texts: Optional[str]) -> bool:
+        """True if any term occurs in any of texts"""
+        for text in texts:
+            if not text:
+                continue
+            folded = fold(text)
+            if len(folded) <= _REGEX_MAX_LENGTH:
+                if self.pattern.search(folded):
+                    return True
+            elif any(needle in folded for needle in self._needles):
+                return True
+        return False
+
+    def matches(self, *texts: Optional[str]) -> List[str]:
+        """The terms found in texts, in order of first appearance"""
+        found: Dict[str, None] = {}
+        for text in texts:
+            for match in self.pattern.finditer(fold(text)):
+                found.setdefault(self.terms[match.group()], None)
+        return list(found)
+
+
+HR_MATCHER = TermMatcher(HR_TERMS)
+MEXICO_MATCHER = TermMatcher(MEXICO_TERMS)
+
+
+def is_hr_related(title, description):
+    """Check if the job is related to Human Resources (more flexible)"""
+    return HR_MATCHER.search(title, description)
+
+
+def is_mexico_location(location):
+    """Check if the location is in Mexico"""
+    return MEXICO_MATCHER.search(location)
+
+
+def explain_job(job: Dict) -> Dict:
+    """Which HR and location terms a job matched, and whether it passes both filters"""
+    hr_terms = HR_MATCHER.matches(job.get("title"), job.get("description"))
+    location_terms = MEXICO_MATCHER.matches(job.get("location"))
+    return {
+        "hr_terms": hr_terms,
+        "location_terms": location_terms,
+        "accepted": bool(hr_terms and location_terms),
+    }
+
+
+def classify_jobs(jobs: Iterable[Dict]) -> List[bool]:
+    """is_mexico_location and is_hr_related for a batch of jobs"""
+    return [
+        is_mexico_location(job.get("location")) and is_hr_related(job.get("title"), job.get("description"))
+        for job in jobs
+    ]
@@ -0,0 +1,51 @@
+"""
+HTML parser backend selection shared by both scrapers
+
+All extraction code is written against the BeautifulSoup API, so backends are
+BeautifulSoup tree builders: "lxml" (C parser, several times faster on full
+documents) and "html.parser" (pure Python, always available, the historical
+behavior). The backend is picked with the SCRAPER_HTML_PARSER environment
+variable or per call; "auto" uses the fastest one installed.
+"""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+logger = logging.getLogger(__name__)
+
+HTML_PARSER_ENV = "SCRAPER_HTML_PARSER"
+
+# Fastest first; html.parser ships with Python and is the fallback
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+
+@lru_cache(maxsize=None)
+def is_available(backend: str) -> bool:
+    try:
+        BeautifulSoup("", features=backend)
+        return True
+    except FeatureNotFound:
+        return False
+
+
+@lru_cache(maxsize=None)
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Turn a requested backend (or the environment setting) into an installed one"""
+    requested = backend or os.environ.get(HTML_PARSER_ENV, "auto")
+    if requested == "auto":
+        return next(name for name in PARSER_BACKENDS if is_available(name))
+    if requested not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {requested}")
+    if not is_available(requested):
+        logger.warning(f"HTML parser '{requested}' is not installed, falling back to html.parser")
+        return "html.parser"
+    return requested
+
+
+def make_soup(html: str, backend: Optional[str] = None, parse_only=None) -> BeautifulSoup:
+    """Parse html with the configured backend, optionally keeping only parse_only matches"""
+    return BeautifulSoup(html, resolve_backend(backend), parse_only=parse_only)
@@ -0,0 +1,131 @@
+"""
+Adaptive per-host rate limiter shared by both scrapers
+
+Each host gets a token bucket refilled at its current rate (requests per
+second). The rate follows AIMD: every healthy response adds a small step,
+while a 429/503, a network error or a slow response cuts it by a factor and
+pauses the host for a moment (or for as long as Retry-After asks). Crawls
+therefore run as fast as each site tolerates instead of at a fixed pace.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+
+
+class _HostBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class HostRateLimiter:
+    def __init__(self, initial_rate: float = 1.0, min_rate: float = 0.1, max_rate: float = 8.0,
+                 increase: float = 0.1, decrease: float = 0.5, slow_after: float = 5.0,
+                 burst: float = 1.0, backoff_pause: float = 5.0):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        # Requests per second added after each healthy response
+        self.increase = increase
+        # Factor the rate is multiplied by when the host pushes back
+        self.decrease = decrease
+        # Responses slower than this many seconds count as push-back
+        self.slow_after = slow_after
+        self.burst = burst
+        # Seconds a host is left alone after push-back without Retry-After
+        self.backoff_pause = backoff_pause
+        self._buckets: Dict[str, _HostBucket] = {}
+        self.throttled = 0
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlparse(url).hostname or url).lower()
+
+    def _bucket(self, url: str) -> _HostBucket:
+        host = self.host_of(url)
+        if host not in self._buckets:
+            self._buckets[host] = _HostBucket(self.initial_rate, self.burst)
+        return self._buckets[host]
+
+    async def acquire(self, url: str):
+        """Wait until a request to url's host is allowed"""
+        bucket = self._bucket(url)
+        async with bucket.lock:
+            while True:
+                now = time.monotonic()
+                if now < bucket.paused_until:
+                    await asyncio.sleep(bucket.paused_until - now)
+                    continue
+                bucket.refill(now)
+                if bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return
+                await asyncio.sleep((1 - bucket.tokens) / bucket.rate)
+
+    def record(self, url: str, status: Optional[int] = None, latency: Optional[float] = None,
+               error: bool = False, retry_after: Optional[float] = None):
+        """Feed back the outcome of a request to url so its host's rate can adapt"""
+        bucket = self._bucket(url)
+        slow = latency is not None and latency > self.slow_after
+        if error or slow or status in THROTTLE_STATUSES:
+            now = time.monotonic()
+            # Concurrent requests fail together; count one decrease per pause window
+            if now - bucket.last_decrease >= self.backoff_pause:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                bucket.last_decrease = now
+                self.throttled += 1
+                logger.info(f"Slowing down {self.host_of(url)} to {bucket.rate:.2f} req/s "
+                            f"(status={status}, latency={latency}, error={error})")
+            pause = retry_after if retry_after is not None else self.backoff_pause
+            bucket.paused_until = max(bucket.paused_until, now + pause)
+            bucket.tokens = 0
+        elif status is None or status < 400:
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def record_response(self, url: str, response, latency: Optional[float] = None):
+        """record() for an httpx-style response, honouring Retry-After"""
+        retry_after = None
+        headers = getattr(response, "headers", None) or {}
+        value = headers.get("retry-after")
+        if value:
+            try:
+                retry_after = float(value)
+            except ValueError:
+                retry_after = None
+        self.record(url, response.status_code, latency, retry_after=retry_after)
+
+    async def request(self, url: str, send):
+        """Wait for a slot, await send() and feed its response (or error) back"""
+        await self.acquire(url)
+        started = time.monotonic()
+        try:
+            response = await send()
+        except Exception:
+            self.record(url, latency=time.monotonic() - started, error=True)
+            raise
+        self.record_response(url, response, time.monotonic() - started)
+        return response
+
+    def rate(self, url: str) -> float:
+        """Current requests per second allowed for url's host"""
+        return self._bucket(url).rate
+
+    def rates(self) -> Dict[str, float]:
+        return {host: bucket.rate for host, bucket in self._buckets.items()}
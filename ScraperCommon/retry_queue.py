@@ -0,0 +1,214 @@
+"""
+Persistent retry queue for pages that failed during a crawl
+
+A failed listing or detail page is recorded in a small SQLite table instead
+of being dropped. Each new failure pushes the URL's next attempt further out
+with exponential backoff, up to max_attempts, after which it is marked as
+given up. drain_retry_queue() refetches the entries that are due through
+per-kind handlers, at the end of a run or from scripts/drain_retry_queue.py,
+and a per-host circuit breaker stops it from hammering a host that is down.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_FILE = "exports/retry_queue.db"
+
+PENDING = "pending"
+DONE = "done"
+GAVE_UP = "gave_up"
+
+
+class RetryQueue:
+    def __init__(self, path: str = DEFAULT_QUEUE_FILE, base_delay: float = 60.0, max_delay: float = 3600.0,
+                 max_attempts: int = 5):
+        self.path = path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        # URLs currently being retried by drain_retry_queue, which records their outcome itself
+        self._draining = set()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS retries ("
+            " url TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " context TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt REAL NOT NULL,"
+            " last_error TEXT,"
+            " status TEXT NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds to wait before the next try after `attempts` failures"""
+        return min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+
+    def add(self, url: str, kind: str, context: Optional[Dict] = None, error: str = ""):
+        """Record a failed fetch of url, scheduling its next attempt"""
+        if url in self._draining:
+            return
+        row = self._conn.execute("SELECT attempts, status FROM retries WHERE url = ?", (url,)).fetchone()
+        # A page that failed again after being recovered starts a fresh series
+        attempts = 1 if row is None or row["status"] == DONE else row["attempts"] + 1
+        self._write(url, kind, context, attempts, error)
+
+    def _write(self, url: str, kind: str, context: Optional[Dict], attempts: int, error: str):
+        now = time.time()
+        status = GAVE_UP if attempts >= self.max_attempts else PENDING
+        self._conn.execute(
+            "INSERT INTO retries (url, kind, context, attempts, next_attempt, last_error, status, updated)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(url) DO UPDATE SET kind = excluded.kind,"
+            " context = COALESCE(excluded.context, retries.context), attempts = excluded.attempts,"
+            " next_attempt = excluded.next_attempt, last_error = excluded.last_error,"
+            " status = excluded.status, updated = excluded.updated",
+            (url, kind, json.dumps(context, ensure_ascii=False) if context is not None else None,
+             attempts, now + self.backoff(attempts), str(error)[:500], status, now),
+        )
+        self._conn.commit()
+
+    def _entries(self, query: str, params=()) -> List[Dict]:
+        entries = []
+        for row in self._conn.execute(query, params):
+            entry = dict(row)
+            entry["context"] = json.loads(entry["context"]) if entry["context"] else {}
+            entries.append(entry)
+        return entries
+
+    def due(self, kinds: Optional[List[str]] = None, include_waiting: bool = False) -> List[Dict]:
+        """Pending entries whose backoff has elapsed (or all pending ones), oldest first"""
+        query = "SELECT * FROM retries WHERE status = ?"
+        params = [PENDING]
+        if not include_waiting:
+            query += " AND next_attempt <= ?"
+            params.append(time.time())
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        return self._entries(query + " ORDER BY next_attempt", params)
+
+    def next_due_in(self, kinds: Optional[List[str]] = None) -> Optional[float]:
+        """Seconds until the next pending entry is due, or None if nothing is pending"""
+        query = "SELECT MIN(next_attempt) FROM retries WHERE status = ?"
+        params = [PENDING]
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        row = self._conn.execute(query, params).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def succeed(self, url: str):
+        self._conn.execute("UPDATE retries SET status = ?, updated = ? WHERE url = ?", (DONE, time.time(), url))
+        self._conn.commit()
+
+    def fail(self, url: str, error: str = ""):
+        row = self._conn.execute("SELECT kind, attempts FROM retries WHERE url = ?", (url,)).fetchone()
+        if row is not None:
+            self._write(url, row["kind"], None, row["attempts"] + 1, error)
+
+    def stats(self) -> Dict:
+        counts = {PENDING: 0, DONE: 0, GAVE_UP: 0}
+        for status, count in self._conn.execute("SELECT status, COUNT(*) FROM retries GROUP BY status"):
+            counts[status] = count
+        attempts = self._conn.execute("SELECT COALESCE(SUM(attempts), 0) FROM retries").fetchone()[0]
+        return {
+            "pending": counts[PENDING],
+            "recovered": counts[DONE],
+            "gave_up": counts[GAVE_UP],
+            "failures": attempts,
+        }
+
+
+class CircuitBreaker:
+    """Stops requests to a host after repeated failures, trying again after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_after: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlparse(url).hostname or url).lower()
+
+    def allow(self, url: str) -> bool:
+        """False while the host's circuit is open; one probe is let through after reset_after"""
+        host = self.host_of(url)
+        opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return True
+        if time.time() - opened_at >= self.reset_after:
+            # Half-open: allow a probe, and re-open straight away if it fails
+            del self._opened_at[host]
+            self._failures[host] = self.failure_threshold - 1
+            return True
+        return False
+
+    def record(self, url: str, ok: bool):
+        host = self.host_of(url)
+        if ok:
+            self._failures.pop(host, None)
+            return
+        self._failures[host] = self._failures.get(host, 0) + 1
+        if self._failures[host] >= self.failure_threshold and host not in self._opened_at:
+            self._opened_at[host] = time.time()
+            logger.warning(f"Circuit open for {host} after {self._failures[host]} failures")
+
+    def open_hosts(self) -> List[str]:
+        return list(self._opened_at)
+
+
+RetryHandler = Callable[[Dict], Awaitable[bool]]
+
+
+async def drain_retry_queue(queue: RetryQueue, handlers: Dict[str, RetryHandler],
+                            breaker: Optional[CircuitBreaker] = None, include_waiting: bool = False) -> Dict:
+    """Retry the due entries whose kind has a handler
+
+    A handler gets the entry (url, kind, context, attempts, ...) and returns
+    True once the page was fetched and its jobs saved. Entries for hosts with
+    an open circuit are left for a later drain.
+    """
+    breaker = breaker or CircuitBreaker()
+    summary = {"retried": 0, "recovered": 0, "failed": 0, "skipped": 0}
+    for entry in queue.due(list(handlers), include_waiting):
+        url = entry["url"]
+        if not breaker.allow(url):
+            summary["skipped"] += 1
+            continue
+        summary["retried"] += 1
+        queue._draining.add(url)
+        error = ""
+        try:
+            ok = await handlers[entry["kind"]](entry)
+        except Exception as e:
+            ok = False
+            error = str(e)
+        finally:
+            queue._draining.discard(url)
+        breaker.record(url, ok)
+        if ok:
+            queue.succeed(url)
+            summary["recovered"] += 1
+        else:
+            queue.fail(url, error or "retry failed")
+            summary["failed"] += 1
+    return summary
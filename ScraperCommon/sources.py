@@ -0,0 +1,130 @@
+"""
+Common source interface and a multi-source orchestrator
+
+Each job board is wrapped in a JobSource: an async context manager whose
+iter_jobs() yields JobRecords and that owns its own concurrency and rate
+settings. run_sources() runs every source at the same time (they crawl
+independent hosts, so a full refresh takes as long as the slowest source
+rather than the sum of all) and feeds their jobs into one JobPipeline that
+drops duplicates and hands new jobs to a single persistence callback.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .job_record import JobRecord
+
+logger = logging.getLogger(__name__)
+
+
+class JobSource(ABC):
+    """A job board that run_sources() can crawl alongside the others"""
+
+    # Key of this source in run_sources() results
+    name = "source"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    def iter_jobs(self, known_links: Optional[set] = None) -> AsyncIterator[JobRecord]:
+        """Yield jobs as they are scraped, skipping (and adding to) known_links"""
+
+    def stats(self) -> Dict:
+        """Source-specific counters for the run summary"""
+        return {}
+
+
+class JobPipeline:
+    """One dedup and persistence path for the jobs of every source
+
+    known_links is shared with the sources so they can skip jobs already
+    stored before fetching their details; the pipeline itself drops links it
+    has already accepted in this run. save(jobs) persists a batch, e.g.
+    JobWriter.put.
+    """
+
+    def __init__(self, save: Callable[[List[JobRecord]], Awaitable], known_links: Optional[set] = None,
+                 batch_size: int = 50):
+        self.save = save
+        self.known_links = known_links if known_links is not None else set()
+        self.batch_size = batch_size
+        self._accepted = set()
+        self._batch: List[JobRecord] = []
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def _source_counts(self, source: str) -> Dict[str, int]:
+        return self._counts.setdefault(source, {"received": 0, "duplicates": 0, "accepted": 0})
+
+    async def add(self, source: str, job: JobRecord) -> bool:
+        """Queue job for saving unless it has no link or was already accepted"""
+        counts = self._source_counts(source)
+        counts["received"] += 1
+        link = job["link"]
+        if not link or link in self._accepted:
+            counts["duplicates"] += 1
+            return False
+        self._accepted.add(link)
+        counts["accepted"] += 1
+        self._batch.append(job)
+        if len(self._batch) >= self.batch_size:
+            await self.flush()
+        return True
+
+    async def flush(self):
+        if self._batch:
+            batch, self._batch = self._batch, []
+            await self.save(batch)
+
+    def counts(self, source: str) -> Dict[str, int]:
+        return dict(self._source_counts(source))
+
+    @property
+    def accepted(self) -> int:
+        return len(self._accepted)
+
+
+async def run_sources(sources: Iterable[JobSource], pipeline: JobPipeline) -> Dict[str, Dict]:
+    """Crawl every source concurrently into pipeline
+
+    A source that fails is logged and reported with its error; the others
+    keep running. Returns each source's pipeline counts, its stats(), its
+    run time in seconds and its error (or None), keyed by source name.
+    """
+    sources = list(sources)
+
+    async def run(source: JobSource) -> Dict:
+        started = time.monotonic()
+        error = None
+        try:
+            async with source:
+                async for job in source.iter_jobs(pipeline.known_links):
+                    await pipeline.add(source.name, job)
+        except Exception as e:
+            logger.error(f"Source {source.name} failed: {e}")
+            error = str(e)
+        return {
+            **pipeline.counts(source.name),
+            **source.stats(),
+            "seconds": time.monotonic() - started,
+            "error": error,
+        }
+
+    try:
+        results = await asyncio.gather(*(run(source) for source in sources))
+    finally:
+        await pipeline.flush()
+    return {source.name: result for source, result in zip(sources, results)}
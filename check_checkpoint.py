@@ -3,31 +3,35 @@
 Check checkpoint status and progress
 """
 
-import json
 import os
-import csv
 from datetime import datetime
 
+from OCCMexicoScraper.checkpoint import CheckpointManager
+from ScraperCommon.job_sink import JobSink
+
 CHECKPOINT_FILE = "exports/checkpoint.json"
+JOB_SINK_DIR = "exports/occ_jobs"
 
 def check_checkpoint():
     """Check the current checkpoint status"""
     print("📊 CHECKPOINT STATUS")
     print("=" * 50)
     
-    if not os.path.exists(CHECKPOINT_FILE):
+    checkpoint_manager = CheckpointManager(CHECKPOINT_FILE)
+    if not os.path.exists(CHECKPOINT_FILE) and not os.path.exists(checkpoint_manager.journal_file):
         print("❌ No checkpoint file found")
         print("   Run: python get_3000_occ_jobs_checkpoint.py")
         return
     
     try:
-        with open(CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Snapshot plus any journaled pages not compacted yet
+        data = checkpoint_manager.checkpoint_data
         
         print(f"📂 Checkpoint loaded: {data['total_jobs']} jobs")
         print(f"🔍 Keywords completed: {data['keywords_completed']}")
         print(f"📍 Current keyword: {data['current_keyword']}")
         print(f"📄 Current page: {data['current_page']}")
+        print(f"✅ Pages crawled: {len(checkpoint_manager.completed)}")
         
         # Calculate progress
         target_jobs = 3000
@@ -48,26 +52,14 @@ def check_checkpoint():
             avg_jobs = sum(data['jobs_per_page']) / len(data['jobs_per_page'])
             print(f"📊 Average jobs per page: {avg_jobs:.1f}")
         
-        # Check for CSV files
-        csv_files = []
-        if os.path.exists("exports"):
-            for file in os.listdir("exports"):
-                if file.startswith("occ_progress_") and file.endswith(".csv"):
-                    csv_files.append(file)
-        
-        if csv_files:
-            csv_files.sort()
-            latest_csv = csv_files[-1]
-            print(f"💾 Latest CSV: {latest_csv}")
-            
-            # Count jobs in latest CSV
+        # Jobs collected so far live in the append-only sink segments
+        if os.path.isdir(JOB_SINK_DIR):
             try:
-                with open(f"exports/{latest_csv}", 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    job_count = sum(1 for row in reader)
-                    print(f"📋 Jobs in latest CSV: {job_count}")
+                job_sink = JobSink(JOB_SINK_DIR)
+                print(f"💾 Job sink: {len(job_sink.segment_paths())} segments in {JOB_SINK_DIR}")
+                print(f"📋 Jobs in sink: {job_sink.count()}")
             except Exception as e:
-                print(f"⚠️ Error reading CSV: {e}")
+                print(f"⚠️ Error reading job sink: {e}")
         
         print("\n🚀 To resume scraping:")
         print("   python get_3000_occ_jobs_checkpoint.py")
@@ -0,0 +1,184 @@
+"""
+Sharded crawl over leased keyword x page work units
+
+Usage:
+    python crawl_worker.py seed [occ|computrabajo|all]
+    python crawl_worker.py work [occ|computrabajo|all]
+    python crawl_worker.py status
+
+seed adds one work unit per keyword and page (from run_all_sources.py's
+settings) to the lease table. work claims units one at a time, keeps the
+lease alive while the unit's pages are scraped and saves the jobs to
+job_listings before marking the unit done. Start as many workers as you
+like, in several terminals or on several machines sharing the lease file and
+jobs.db; a worker that dies leaves its unit to be picked up again once the
+lease expires. Jobs are keyed by their link, so a unit scraped twice never
+stores a job twice. Detail pages that fail are queued in run_all_sources.py's
+retry queue and filled in later by scripts/drain_retry_queue.py.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from ComputrabajoScraper.models import bulk_upsert_jobs, init_db, load_known_links
+from ComputrabajoScraper.scraper import make_client, scrape_listing_page
+from OCCMexicoScraper.scraper_occ import OCCScraper
+from ScraperCommon.http_cache import HttpCache
+from ScraperCommon.leases import DEFAULT_LEASE_FILE, LeaseTable, default_owner
+from ScraperCommon.rate_limiter import HostRateLimiter
+from ScraperCommon.retry_queue import RetryQueue
+from run_all_sources import COMPUTRABAJO, HTTP_CACHE_DIR, OCC, RETRY_QUEUE_FILE
+
+# Configuration
+LEASE_FILE = DEFAULT_LEASE_FILE  # Shared by every worker
+LEASE_SECONDS = 300  # A unit is handed to another worker this long after its last heartbeat
+HEARTBEAT_SECONDS = 60
+MAX_ATTEMPTS = 3  # Failed units are retried by any worker up to this many times
+IDLE_POLL_SECONDS = 30  # Wait for other workers' leases while none is free
+
+SOURCES = {"occ": OCC, "computrabajo": COMPUTRABAJO}
+
+
+async def heartbeat(leases, unit, owner):
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        if not await asyncio.to_thread(leases.heartbeat, unit["id"], owner):
+            print(f"⚠️ Lost the lease on {unit['source']} {unit['keyword']} p{unit['page']}; "
+                  f"another worker may redo it")
+            return
+
+
+# Both scrape functions add the unit's links to unit_links, a copy of the worker's
+# known links; they join the worker's set only once the unit's jobs are saved, so a
+# unit that fails and is retried by the same worker does not skip its own jobs
+async def scrape_occ_unit(scraper, unit, unit_links):
+    # load_jobs_page raises on a failed page, so the unit is released for a retry
+    jobs = await scraper.load_jobs_page(unit["keyword"], unit["page"], with_descriptions=False)
+    jobs = [job for job in jobs if job["link"] and job["link"] not in unit_links]
+    unit_links.update(job["link"] for job in jobs)
+    return [job async for job in scraper.iter_descriptions(jobs)]
+
+
+async def scrape_computrabajo_unit(client, unit, unit_links, cache, limiter, retry_queue):
+    # Only failed details are queued; a failed listing page fails the unit, which the lease table retries
+    result = await scrape_listing_page(client, unit["keyword"], unit["page"], unit_links, cache, limiter=limiter,
+                                       retry_queue=retry_queue)
+    if result is None:
+        raise RuntimeError("listing page could not be fetched")
+    return result[0]
+
+
+async def work(sources):
+    await init_db()
+    owner = default_owner()
+    leases = LeaseTable(LEASE_FILE, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS)
+    cache = HttpCache(HTTP_CACHE_DIR)
+    # Jobs are saved with their description placeholder, so their links count as known;
+    # the queued detail pages are drained into jobs.db, updating those rows
+    retry_queue = RetryQueue(RETRY_QUEUE_FILE)
+    # Jobs stored by earlier runs (or other workers, as of startup) get no detail request
+    known_links = await load_known_links()
+    print(f"👷 Worker {owner} on {', '.join(sources)}, {len(known_links)} jobs already stored")
+
+    occ = None
+    if "occ" in sources:
+        occ = OCCScraper(detail_concurrency=OCC["detail_concurrency"], fetch_mode=OCC["fetch_mode"], cache=cache,
+                         rate_limiter=HostRateLimiter(max_rate=OCC["max_rate"]), retry_queue=retry_queue,
+                         save_target="db")
+        await occ.start()
+    client = make_client()
+    limiter = HostRateLimiter(max_rate=COMPUTRABAJO["max_rate"])
+    totals = {"units": 0, "failed": 0, "lost": 0, "inserted": 0, "skipped": 0}
+    start_time = time.time()
+
+    try:
+        while True:
+            claimed = await asyncio.to_thread(leases.claim, owner, sources)
+            if not claimed:
+                stats = await asyncio.to_thread(leases.stats, sources)
+                if not stats["leased"]:
+                    break
+                # Other workers hold the remaining units; theirs may still expire
+                print(f"⏳ {stats['leased']} units leased by other workers, waiting")
+                await asyncio.sleep(IDLE_POLL_SECONDS)
+                continue
+
+            unit = claimed[0]
+            label = f"{unit['source']} {unit['keyword']} p{unit['page']}"
+            beat = asyncio.create_task(heartbeat(leases, unit, owner))
+            unit_links = set(known_links)
+            try:
+                if unit["source"] == "occ":
+                    jobs = await scrape_occ_unit(occ, unit, unit_links)
+                else:
+                    jobs = await scrape_computrabajo_unit(client, unit, unit_links, cache, limiter, retry_queue)
+                # Saved before the unit is marked done, so a crash here only means the unit is redone
+                counts = await bulk_upsert_jobs(jobs)
+            except Exception as e:
+                await asyncio.to_thread(leases.fail, unit["id"], owner, str(e))
+                totals["failed"] += 1
+                print(f"❌ {label} (attempt {unit['attempts']}): {e}")
+                continue
+            finally:
+                beat.cancel()
+
+            known_links.update(unit_links)
+            totals["inserted"] += counts["inserted"]
+            totals["skipped"] += counts["skipped"]
+            if not await asyncio.to_thread(leases.complete, unit["id"], owner, counts["inserted"]):
+                # The lease expired and another worker took the unit; the jobs are saved
+                # all the same, and the unit is done once that worker finishes it
+                totals["lost"] += 1
+                print(f"⚠️ {label}: lease lost before completion, {counts['inserted']} new jobs saved anyway")
+                continue
+            totals["units"] += 1
+            print(f"✅ {label}: {counts['inserted']} new, {counts['skipped']} already stored")
+    finally:
+        if occ is not None:
+            await occ.close()
+        await client.aclose()
+
+    total_time = time.time() - start_time
+    print(f"\n📊 Worker done in {total_time / 60:.1f} min: {totals['units']} units, {totals['failed']} failed "
+          f"attempts, {totals['lost']} lost leases, {totals['inserted']} new jobs, {totals['skipped']} already stored")
+    await asyncio.to_thread(print_status, leases, sources)
+    leases.close()
+    retry_stats = retry_queue.stats()
+    if retry_stats["pending"]:
+        print(f"🔁 {retry_stats['pending']} failed pages queued; run scripts/drain_retry_queue.py all")
+    retry_queue.close()
+
+
+def seed(sources):
+    leases = LeaseTable(LEASE_FILE)
+    for name in sources:
+        added = leases.seed(name, SOURCES[name]["keywords"], SOURCES[name]["pages"])
+        print(f"🌱 {name}: {added} new work units")
+    print_status(leases, sources)
+    leases.close()
+
+
+def print_status(leases, sources=None):
+    stats = leases.stats(sources)
+    print(f"📋 Units: {stats['pending']} pending, {stats['leased']} leased, {stats['done']} done, "
+          f"{stats['failed']} failed; {stats['jobs']} jobs saved")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    source = sys.argv[2] if len(sys.argv) > 2 else "all"
+    if command not in ("seed", "work", "status") or source not in ("occ", "computrabajo", "all"):
+        print("Usage: python crawl_worker.py [seed|work|status] [occ|computrabajo|all]")
+        sys.exit(1)
+    os.makedirs("exports", exist_ok=True)
+    sources = list(SOURCES) if source == "all" else [source]
+    if command == "seed":
+        seed(sources)
+    elif command == "work":
+        asyncio.run(work(sources))
+    else:
+        leases = LeaseTable(LEASE_FILE)
+        print_status(leases, sources)
+        leases.close()
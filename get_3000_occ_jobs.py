@@ -1,12 +1,19 @@
 import asyncio
 import csv
 import time
-from OCCMexicoScraper.scraper_occ import scrape_jobs_occ
+from OCCMexicoScraper.scraper_occ import iter_jobs_occ_two_phase
+from OCCMexicoScraper.resource_policy import ResourcePolicy
+from ScraperCommon.http_cache import HttpCache
+from ScraperCommon.job_record import JOB_FIELDS
 
 # Configuration
 TARGET_JOBS = 3000
 PAGES_PER_KEYWORD = 50  # Increased to get more jobs per keyword
-SAVE_INTERVAL = 500  # Save progress every 500 jobs
+DETAIL_CONCURRENCY = 4  # Job detail pages fetched in parallel
+BLOCK_RESOURCES = True  # Skip images, fonts, CSS and trackers
+FETCH_MODE = "hybrid"  # Plain HTTP first, browser only when the content is missing
+HTTP_CACHE_DIR = "exports/http_cache"  # Detail page cache shared with Computrabajo
+OUTPUT_FILE = "exports/occ_3000_jobs.csv"
 
 hr_keywords = [
     "recursos-humanos",
@@ -32,7 +39,7 @@ hr_keywords = [
 ]
 
 async def get_3000_occ_jobs():
-    print("🎯 GETTING 3000+ OCC JOBS WITH URL PAGINATION")
+    print("🎯 GETTING 3000+ OCC JOBS WITH A LISTING-FIRST CRAWL")
     print("=" * 60)
     print(f"Target: {TARGET_JOBS} unique jobs")
     print(f"Pages per keyword: {PAGES_PER_KEYWORD}")
@@ -40,57 +47,38 @@ async def get_3000_occ_jobs():
     print(f"Estimated total pages: {len(hr_keywords) * PAGES_PER_KEYWORD}")
     print("=" * 60)
     
-    all_jobs = []
-    seen_links = set()  # For in-memory deduplication
+    resource_policy = ResourcePolicy() if BLOCK_RESOURCES else None
+    cache = HttpCache(HTTP_CACHE_DIR)
     start_time = time.time()
     
-    for keyword_idx, keyword in enumerate(hr_keywords, 1):
-        print(f"\n🔍 [{keyword_idx}/{len(hr_keywords)}] Scraping keyword: '{keyword}'")
-        
-        try:
-            # Scrape jobs for this keyword
-            jobs = await scrape_jobs_occ(keyword, pages=PAGES_PER_KEYWORD)
-            
-            # Filter out duplicates in memory
-            new_jobs = []
-            for job in jobs:
-                if job["link"] not in seen_links and job["link"] != "No disponible":
-                    seen_links.add(job["link"])
-                    new_jobs.append(job)
-            
-            all_jobs.extend(new_jobs)
-            
-            print(f"✅ Found {len(jobs)} jobs, {len(new_jobs)} new unique jobs")
-            print(f"📊 Total unique jobs so far: {len(all_jobs)}")
-            
-            # Calculate progress and ETA
-            elapsed = time.time() - start_time
-            progress = len(all_jobs) / TARGET_JOBS
-            if progress > 0:
-                eta_total = elapsed / progress
-                eta_remaining = eta_total - elapsed
-                eta_min, eta_sec = divmod(int(eta_remaining), 60)
-                eta_hour, eta_min = divmod(eta_min, 60)
-                print(f"⏱️ Progress: {progress*100:.1f}% | ETA: {eta_hour:02d}:{eta_min:02d}:{eta_sec:02d}")
-            
-            # Save progress periodically
-            if len(all_jobs) % SAVE_INTERVAL == 0 and len(all_jobs) > 0:
-                await save_to_csv(all_jobs, f"exports/occ_progress_{len(all_jobs)}.csv")
-                print(f"💾 Progress saved: {len(all_jobs)} jobs")
-            
-            # Check if we've reached the target
-            if len(all_jobs) >= TARGET_JOBS:
-                print(f"\n🎉 TARGET REACHED! Found {len(all_jobs)} unique jobs")
-                break
-                
-        except Exception as e:
-            print(f"❌ Error with keyword '{keyword}': {str(e)}")
-            continue
+    # Phase 1 sweeps the listing pages of every keyword, phase 2 fetches
+    # the details of each unique job once; each job is written as soon as
+    # its description is in
+    print("\n🔍 Sweeping listing pages, then fetching details of unique jobs...")
+    total_jobs = 0
+    with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=JOB_FIELDS)
+        writer.writeheader()
+        async for job in iter_jobs_occ_two_phase(
+            hr_keywords,
+            pages=PAGES_PER_KEYWORD,
+            target=TARGET_JOBS,
+            detail_concurrency=DETAIL_CONCURRENCY,
+            resource_policy=resource_policy,
+            fetch_mode=FETCH_MODE,
+            cache=cache,
+        ):
+            writer.writerow(job.to_csv_row())
+            total_jobs += 1
+            if total_jobs % 100 == 0:
+                csvfile.flush()
+                print(f"📈 {total_jobs} jobs with descriptions written")
     
-    # Final save
-    if all_jobs:
-        await save_to_csv(all_jobs, "exports/occ_3000_jobs.csv")
-        print(f"\n💾 Final results saved to: exports/occ_3000_jobs.csv")
+    if total_jobs >= TARGET_JOBS:
+        print(f"\n🎉 TARGET REACHED! Found {total_jobs} unique jobs")
+    
+    if total_jobs:
+        print(f"\n💾 Final results saved to: {OUTPUT_FILE}")
     
     # Final statistics
     total_time = time.time() - start_time
@@ -98,28 +86,22 @@ async def get_3000_occ_jobs():
     minutes, seconds = divmod(remainder, 60)
     
     print(f"\n📊 FINAL RESULTS:")
-    print(f"Total unique jobs: {len(all_jobs)}")
+    print(f"Total unique jobs: {total_jobs}")
     print(f"Total time: {int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}")
-    print(f"Jobs per hour: {len(all_jobs) / (total_time / 3600):.1f}")
+    print(f"Jobs per hour: {total_jobs / (total_time / 3600):.1f}")
+    cache_stats = cache.stats()
+    print(f"Detail cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, {cache_stats['misses']} downloaded")
+    if resource_policy:
+        blocked = resource_policy.summary()
+        print(f"Blocked requests: {blocked['blocked_requests']} ({blocked['blocked_share']*100:.1f}%)")
+        print(f"Transferred: {blocked['transferred_bytes'] / 1024 / 1024:.1f} MB")
     
-    if len(all_jobs) >= TARGET_JOBS:
+    if total_jobs >= TARGET_JOBS:
         print("🎯 SUCCESS: Reached target of 3000+ jobs!")
     else:
-        print(f"⚠️ WARNING: Only got {len(all_jobs)} jobs, target was {TARGET_JOBS}")
+        print(f"⚠️ WARNING: Only got {total_jobs} jobs, target was {TARGET_JOBS}")
     
-    return all_jobs
-
-async def save_to_csv(jobs, filename):
-    """Save jobs to CSV file"""
-    try:
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['title', 'company', 'location', 'salary', 'modality', 'link', 'description', 'source']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for job in jobs:
-                writer.writerow(job)
-    except Exception as e:
-        print(f"❌ Error saving to CSV: {str(e)}")
+    return total_jobs
 
 if __name__ == "__main__":
     # Create exports directory if it doesn't exist
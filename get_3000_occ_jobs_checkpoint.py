@@ -1,16 +1,33 @@
 import asyncio
-import csv
 import time
-import json
 import os
 from datetime import datetime, timedelta
-from OCCMexicoScraper.scraper_occ import scrape_jobs_occ, OCCScraper
+from OCCMexicoScraper.scraper_occ import scrape_jobs_occ, OCCScraperSession, occ_listing_url, occ_retry_handlers
+from OCCMexicoScraper.checkpoint import CheckpointManager
+from OCCMexicoScraper.keyword_planner import KeywordHitLog, plan_keywords
+from OCCMexicoScraper.scheduler import CrawlScheduler
+from OCCMexicoScraper.resource_policy import ResourcePolicy
+from ScraperCommon.http_cache import HttpCache
+from ScraperCommon.job_sink import JobSink
+from ScraperCommon.rate_limiter import HostRateLimiter
+from ScraperCommon.retry_queue import RetryQueue, drain_retry_queue
 
 # Configuration
 TARGET_JOBS = 3000
-PAGES_PER_KEYWORD = 50
+PAGES_PER_KEYWORD = 50  # Base page budget per keyword; unused pages move to keywords still yielding
+MAX_PAGES_PER_KEYWORD = 100  # Upper bound for a keyword that keeps finding new jobs
+CRAWL_WORKERS = 4  # Listing pages crawled in parallel, each worker on its own browser page
+DETAIL_CONCURRENCY = 4  # Job detail pages fetched in parallel per listing page
+BLOCK_RESOURCES = True  # Skip images, fonts, CSS and trackers
+FETCH_MODE = "hybrid"  # Plain HTTP first, browser only when the content is missing
+HTTP_CACHE_DIR = "exports/http_cache"  # Detail page cache shared with Computrabajo
 CHECKPOINT_FILE = "exports/checkpoint.json"
+CHECKPOINT_COMPACT_EVERY = 50  # Fold the per-page journal into checkpoint.json every N pages
 PROGRESS_FILE = "exports/progress.csv"
+JOB_SINK_DIR = "exports/occ_jobs"  # Append-only CSV segments; delete to start a crawl from scratch
+RETRY_QUEUE_FILE = "exports/retry_queue.db"  # Failed pages, retried with backoff at the end of the run
+KEYWORD_HITS_FILE = "exports/keyword_hits.db"  # Which keywords surfaced each job, over all runs
+KEYWORD_PLAN = "suggest"  # "apply" skips keywords that add under 1% new jobs, "suggest" only prints the plan, "off"
 
 hr_keywords = [
     "recursos-humanos",
@@ -35,98 +52,6 @@ hr_keywords = [
     "gerente-de-recursos-humanos"
 ]
 
-class CheckpointManager:
-    def __init__(self, checkpoint_file):
-        self.checkpoint_file = checkpoint_file
-        self.checkpoint_data = self.load_checkpoint()
-    
-    def load_checkpoint(self):
-        """Load checkpoint data if it exists"""
-        if os.path.exists(self.checkpoint_file):
-            try:
-                with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    print(f"📂 Loaded checkpoint: {data['total_jobs']} jobs, {data['keywords_completed']} keywords completed")
-                    return data
-            except Exception as e:
-                print(f"⚠️ Error loading checkpoint: {e}")
-        
-        return {
-            'total_jobs': 0,
-            'keywords_completed': 0,
-            'current_keyword': 0,
-            'current_page': 1,
-            'seen_links': [],
-            'start_time': time.time(),
-            'jobs_per_page': [],
-            'last_save_time': time.time()
-        }
-    
-    def save_checkpoint(self, all_jobs, keyword_idx, page_num, seen_links, jobs_per_page):
-        """Save checkpoint after each page"""
-        try:
-            checkpoint_data = {
-                'total_jobs': len(all_jobs),
-                'keywords_completed': keyword_idx - 1,
-                'current_keyword': keyword_idx,
-                'current_page': page_num,
-                'seen_links': list(seen_links),
-                'start_time': self.checkpoint_data['start_time'],
-                'jobs_per_page': jobs_per_page,
-                'last_save_time': time.time()
-            }
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.checkpoint_file), exist_ok=True)
-            
-            with open(self.checkpoint_file, 'w', encoding='utf-8') as f:
-                json.dump(checkpoint_data, f, indent=2)
-                
-        except Exception as e:
-            print(f"❌ Error saving checkpoint: {e}")
-    
-    def get_progress_stats(self, all_jobs, keyword_idx, page_num):
-        """Calculate progress statistics"""
-        elapsed = time.time() - self.checkpoint_data['start_time']
-        progress = len(all_jobs) / TARGET_JOBS
-        
-        # Calculate ETA based on current rate
-        if elapsed > 0 and len(all_jobs) > 0:
-            jobs_per_second = len(all_jobs) / elapsed
-            remaining_jobs = TARGET_JOBS - len(all_jobs)
-            eta_seconds = remaining_jobs / jobs_per_second if jobs_per_second > 0 else 0
-            eta = timedelta(seconds=int(eta_seconds))
-        else:
-            eta = timedelta(seconds=0)
-        
-        # Calculate completion percentage
-        total_pages = len(hr_keywords) * PAGES_PER_KEYWORD
-        completed_pages = (keyword_idx - 1) * PAGES_PER_KEYWORD + page_num
-        page_progress = completed_pages / total_pages
-        
-        return {
-            'elapsed': elapsed,
-            'progress': progress,
-            'eta': eta,
-            'page_progress': page_progress,
-            'jobs_per_second': jobs_per_second if elapsed > 0 else 0
-        }
-
-async def save_to_csv(jobs, filename):
-    """Save jobs to CSV file"""
-    try:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['title', 'company', 'location', 'salary', 'modality', 'link', 'description', 'source']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for job in jobs:
-                writer.writerow(job)
-        return True
-    except Exception as e:
-        print(f"❌ Error saving to CSV: {str(e)}")
-        return False
-
 def format_time(seconds):
     """Format time in HH:MM:SS"""
     return str(timedelta(seconds=int(seconds)))
@@ -141,115 +66,165 @@ async def get_3000_occ_jobs_with_checkpoint():
     print("=" * 70)
     
     # Initialize checkpoint manager
-    checkpoint_manager = CheckpointManager(CHECKPOINT_FILE)
+    checkpoint_manager = CheckpointManager(
+        CHECKPOINT_FILE,
+        target_jobs=TARGET_JOBS,
+        total_keywords=len(hr_keywords),
+        pages_per_keyword=PAGES_PER_KEYWORD,
+        compact_every=CHECKPOINT_COMPACT_EVERY,
+    )
     
-    # Load existing data
-    all_jobs = []
-    seen_links = set(checkpoint_manager.checkpoint_data['seen_links'])
+    # Jobs are streamed to disk once each; on resume the sink is the source of
+    # truth for which jobs we already hold, without loading them into memory
+    job_sink = JobSink(JOB_SINK_DIR)
+    if job_sink.count() > 0:
+        seen_links = set(job_sink.iter_links())
+        print(f"📂 Resuming with {job_sink.count()} jobs from {JOB_SINK_DIR}")
+    else:
+        seen_links = set(checkpoint_manager.checkpoint_data['seen_links'])
     jobs_per_page = checkpoint_manager.checkpoint_data['jobs_per_page']
     
-    # Load existing jobs if checkpoint exists
-    if checkpoint_manager.checkpoint_data['total_jobs'] > 0:
-        print(f"📂 Resuming from checkpoint: {checkpoint_manager.checkpoint_data['total_jobs']} jobs")
-        # Load the latest CSV file
-        latest_csv = f"exports/occ_progress_{checkpoint_manager.checkpoint_data['total_jobs']}.csv"
-        if os.path.exists(latest_csv):
-            try:
-                with open(latest_csv, 'r', encoding='utf-8') as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    all_jobs = list(reader)
-                    print(f"📂 Loaded {len(all_jobs)} jobs from {latest_csv}")
-            except Exception as e:
-                print(f"⚠️ Error loading CSV: {e}")
+    # Past runs tell which keywords only surface jobs that other keywords find too
+    hit_log = KeywordHitLog(KEYWORD_HITS_FILE)
+    pruned_keywords = set()
+    if KEYWORD_PLAN != "off":
+        plan = plan_keywords(hit_log.hits_by_keyword(), hr_keywords)
+        if plan.dropped:
+            print(f"🧭 Keyword plan ({KEYWORD_PLAN}):")
+            print(plan.report())
+            if KEYWORD_PLAN == "apply":
+                pruned_keywords = set(plan.dropped)
     
-    start_keyword = checkpoint_manager.checkpoint_data['current_keyword']
-    if start_keyword == 0:
-        start_keyword = 1
+    pages_done = len(checkpoint_manager.completed)
+    print(f"🚀 {pages_done} pages already crawled, {CRAWL_WORKERS} workers")
     
-    print(f"🚀 Starting from keyword {start_keyword}/{len(hr_keywords)}")
+    resource_policy = ResourcePolicy() if BLOCK_RESOURCES else None
+    cache = HttpCache(HTTP_CACHE_DIR)
+    # Paces requests to what OCC tolerates instead of sleeping a fixed time per page
+    rate_limiter = HostRateLimiter()
+    retry_queue = RetryQueue(RETRY_QUEUE_FILE)
     
-    for keyword_idx in range(start_keyword, len(hr_keywords) + 1):
-        keyword = hr_keywords[keyword_idx - 1]
-        print(f"\n🔍 [{keyword_idx}/{len(hr_keywords)}] Scraping keyword: '{keyword}'")
-        
-        start_page = 1
-        if keyword_idx == start_keyword:
-            start_page = checkpoint_manager.checkpoint_data['current_page']
-        
-        for page in range(start_page, PAGES_PER_KEYWORD + 1):
-            try:
-                print(f"  📄 Page {page}/{PAGES_PER_KEYWORD}...")
+    try:
+        # One browser for the whole run, relaunched only when it fails
+        async with OCCScraperSession(detail_concurrency=DETAIL_CONCURRENCY, listing_concurrency=CRAWL_WORKERS,
+                                     resource_policy=resource_policy,
+                                     fetch_mode=FETCH_MODE, cache=cache, rate_limiter=rate_limiter,
+                                     retry_queue=retry_queue) as session:
+            async def crawl_page(keyword_idx, keyword, page):
+                try:
+                    # Scrape single page on the long-lived browser session, skipping detail
+                    # fetches for jobs we already have; failures raise so they are never
+                    # mistaken for an empty page that ends the keyword
+                    jobs = await session.run("load_jobs_page", keyword, page, known_links=seen_links)
+                except Exception as e:
+                    print(f"    ❌ Error on '{keyword}' page {page}: {str(e)}")
+                    retry_queue.add(occ_listing_url(keyword, page), "occ_listing",
+                                    {"keyword": keyword, "page": page}, str(e))
+                    return None
                 
-                # Scrape single page (optimized)
-                async with OCCScraper() as scraper:
-                    jobs = await scraper.search_jobs_single_page(keyword, page)
+                hit_log.record(keyword, [job["link"] for job in jobs])
                 
                 # Filter out duplicates
                 new_jobs = []
                 for job in jobs:
-                    if job["link"] not in seen_links and job["link"] != "N/A":
+                    if job["link"] and job["link"] not in seen_links:
                         seen_links.add(job["link"])
                         new_jobs.append(job)
                 
-                all_jobs.extend(new_jobs)
-                jobs_per_page.append(len(new_jobs))
+                job_sink.write(new_jobs)
+                if new_jobs:
+                    # The page's rows must be on disk before the journal marks it done,
+                    # or a crash in between would skip the page on resume and lose its jobs
+                    job_sink.flush()
+                total_jobs = job_sink.count()
+                
+                # Journal this page's delta in the checkpoint
+                checkpoint_manager.record_page(keyword_idx, page, [job["link"] for job in new_jobs], cards=len(jobs))
                 
                 # Calculate and display progress
-                stats = checkpoint_manager.get_progress_stats(all_jobs, keyword_idx, page)
+                stats = checkpoint_manager.get_progress_stats(total_jobs)
                 
-                print(f"    ✅ Found {len(jobs)} jobs, {len(new_jobs)} new unique jobs")
-                print(f"    📊 Total: {len(all_jobs)}/{TARGET_JOBS} ({stats['progress']*100:.1f}%)")
+                print(f"  📄 [{keyword_idx}/{len(hr_keywords)}] '{keyword}' page {page}/{PAGES_PER_KEYWORD}: "
+                      f"{len(jobs)} jobs, {len(new_jobs)} new unique jobs")
+                print(f"    📊 Total: {total_jobs}/{TARGET_JOBS} ({stats['progress']*100:.1f}%) | "
+                      f"Pages: {stats['page_progress']*100:.1f}%")
                 print(f"    ⏱️ Elapsed: {format_time(stats['elapsed'])} | ETA: {stats['eta']}")
                 print(f"    📈 Rate: {stats['jobs_per_second']:.2f} jobs/sec")
                 
-                # Save checkpoint after each page
-                checkpoint_manager.save_checkpoint(all_jobs, keyword_idx, page, seen_links, jobs_per_page)
-                
-                # Save to CSV every 100 jobs
-                if len(all_jobs) % 100 == 0 and len(all_jobs) > 0:
-                    csv_filename = f"exports/occ_progress_{len(all_jobs)}.csv"
-                    if await save_to_csv(all_jobs, csv_filename):
-                        print(f"    💾 Saved to: {csv_filename}")
-                
-                # Check if we've reached the target
-                if len(all_jobs) >= TARGET_JOBS:
-                    print(f"\n🎉 TARGET REACHED! Found {len(all_jobs)} unique jobs")
-                    break
-                
-                # Small delay between pages
-                await asyncio.sleep(2)
-                
-            except Exception as e:
-                print(f"    ❌ Error on page {page}: {str(e)}")
-                continue
-        
-        if len(all_jobs) >= TARGET_JOBS:
-            break
+                # Feeds the scheduler's per-keyword page budget
+                return len(jobs), len(new_jobs)
+            
+            # (keyword, page) units go to CRAWL_WORKERS workers; finished ones are skipped on resume.
+            # Keywords that stop yielding new jobs hand their remaining pages to the ones that do
+            scheduler = CrawlScheduler(hr_keywords, PAGES_PER_KEYWORD, workers=CRAWL_WORKERS,
+                                       is_done=checkpoint_manager.is_page_done,
+                                       history=checkpoint_manager.page_history(),
+                                       max_pages_per_keyword=MAX_PAGES_PER_KEYWORD,
+                                       pruned_keywords=pruned_keywords)
+            crawl_summary = await scheduler.run(crawl_page, should_stop=lambda: job_sink.count() >= TARGET_JOBS)
+            if job_sink.count() >= TARGET_JOBS:
+                print(f"\n🎉 TARGET REACHED! Found {job_sink.count()} unique jobs")
+            print(f"🧮 Pages crawled: {crawl_summary['completed']}, skipped (done before): {crawl_summary['skipped']}, "
+                  f"budget used: {crawl_summary['pages_used']}/{crawl_summary['page_budget']}")
+            for keyword, reason in crawl_summary['cut_keywords'].items():
+                print(f"   ✂️ '{keyword}' stopped early: {reason}")
+            for keyword, extra in crawl_summary['extra_pages'].items():
+                print(f"   ➕ '{keyword}' got {extra} extra pages")
+            
+            # Refetch the pages and descriptions that failed instead of dropping them
+            retried = await drain_retry_queue(retry_queue, occ_retry_handlers(session, job_sink.write, seen_links))
+            print(f"\n🔁 Retries: {retried['recovered']} recovered, {retried['failed']} failed again, "
+                  f"{retried['skipped']} waiting on an open circuit")
+    finally:
+        # Write out whatever is still buffered, even on errors or Ctrl+C
+        job_sink.close()
+    
+    total_jobs = job_sink.count()
     
     # Final save
-    if all_jobs:
+    if total_jobs:
         final_csv = "exports/occ_3000_jobs_final.csv"
-        if await save_to_csv(all_jobs, final_csv):
-            print(f"\n💾 Final results saved to: {final_csv}")
+        exported = job_sink.export(final_csv)
+        print(f"\n💾 Final results saved to: {final_csv} ({exported} jobs)")
         
         # Save checkpoint
-        checkpoint_manager.save_checkpoint(all_jobs, len(hr_keywords) + 1, 1, seen_links, jobs_per_page)
+        checkpoint_manager.record_position(len(hr_keywords) + 1, 1)
+        checkpoint_manager.compact()
     
     # Final statistics
     total_time = time.time() - checkpoint_manager.checkpoint_data['start_time']
     
     print(f"\n📊 FINAL RESULTS:")
-    print(f"Total unique jobs: {len(all_jobs)}")
+    print(f"Total unique jobs: {total_jobs}")
     print(f"Total time: {format_time(total_time)}")
-    print(f"Jobs per hour: {len(all_jobs) / (total_time / 3600):.1f}")
+    print(f"Jobs per hour: {total_jobs / (total_time / 3600):.1f}")
     print(f"Average jobs per page: {sum(jobs_per_page) / len(jobs_per_page):.1f}")
+    print(f"Browser restarts: {session.restarts}")
+    fetch_report = session.fetch_report()
+    for kind in ("listing", "detail"):
+        print(f"{kind.capitalize()} pages over HTTP: {fetch_report[kind]['http']} "
+              f"({fetch_report[kind]['http_hit_rate']*100:.1f}%), browser: {fetch_report[kind]['browser']}, "
+              f"cache: {fetch_report[kind]['cache']}")
+    cache_stats = cache.stats()
+    print(f"Detail cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, {cache_stats['misses']} downloaded")
+    for host, rate in rate_limiter.rates().items():
+        print(f"Request rate for {host}: {rate:.2f} req/s ({rate_limiter.throttled} slowdowns)")
+    retry_stats = retry_queue.stats()
+    print(f"Retry queue: {retry_stats['pending']} pending, {retry_stats['recovered']} recovered, "
+          f"{retry_stats['gave_up']} given up")
+    retry_queue.close()
+    hit_log.close()
+    if resource_policy:
+        blocked = resource_policy.summary()
+        print(f"Blocked requests: {blocked['blocked_requests']} ({blocked['blocked_share']*100:.1f}%)")
+        print(f"Transferred: {blocked['transferred_bytes'] / 1024 / 1024:.1f} MB")
     
-    if len(all_jobs) >= TARGET_JOBS:
+    if total_jobs >= TARGET_JOBS:
         print("🎯 SUCCESS: Reached target of 3000+ jobs!")
     else:
-        print(f"⚠️ WARNING: Only got {len(all_jobs)} jobs, target was {TARGET_JOBS}")
+        print(f"⚠️ WARNING: Only got {total_jobs} jobs, target was {TARGET_JOBS}")
     
-    return all_jobs
+    return total_jobs
 
 if __name__ == "__main__":
     # Create exports directory if it doesn't exist
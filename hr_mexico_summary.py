@@ -27,7 +27,8 @@ def hr_mexico_summary():
     
     # Salary analysis
     print(f"\n💰 Análisis de Salarios:")
-    salary_df = df[df['salary'] != 'No especificado']
+    # Missing salaries are NULL (older rows hold 'No especificado')
+    salary_df = df[df['salary'].notna() & (df['salary'] != 'No especificado')]
     if len(salary_df) > 0:
         print(f"Vacantes con salario especificado: {len(salary_df)}")
         
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import sys
+import time
+
+from ComputrabajoScraper.models import init_db, load_known_links
+from ComputrabajoScraper.scraper import ComputrabajoScraper
+from ComputrabajoScraper.writer import JobWriter
+from OCCMexicoScraper.resource_policy import ResourcePolicy
+from OCCMexicoScraper.scraper_occ import OCCSource
+from ScraperCommon.http_cache import HttpCache
+from ScraperCommon.rate_limiter import HostRateLimiter
+from ScraperCommon.retry_queue import RetryQueue
+from ScraperCommon.sources import JobPipeline, run_sources
+
+# Configuration
+HTTP_CACHE_DIR = "exports/http_cache"  # Detail page cache shared by both sources
+RETRY_QUEUE_FILE = "exports/retry_queue.db"  # Failed pages; drain with scripts/drain_retry_queue.py
+
+# Per-source settings; each source crawls its own host at its own pace
+OCC = {
+    "enabled": True,
+    "keywords": ["recursos-humanos", "rrhh", "reclutamiento", "seleccion", "talent-acquisition"],
+    "pages": 10,
+    "detail_concurrency": 4,  # Job descriptions loaded at once
+    "fetch_mode": "hybrid",  # Plain HTTP first, browser only when the content is missing
+    "max_rate": 4.0,  # Requests per second the limiter may reach
+}
+COMPUTRABAJO = {
+    "enabled": True,
+    "keywords": ["recursos-humanos", "rrhh", "rh", "reclutamiento", "seleccion", "personal"],
+    "pages": 25,
+    "workers": 8,  # Listing pages processed in parallel
+    "per_host": 4,  # Requests in flight at once
+    "max_rate": 8.0,
+}
+
+
+def build_sources(cache, retry_queue):
+    sources = []
+    if OCC["enabled"]:
+        sources.append(OCCSource(OCC["keywords"], pages=OCC["pages"],
+                                 detail_concurrency=OCC["detail_concurrency"], fetch_mode=OCC["fetch_mode"],
+                                 resource_policy=ResourcePolicy(), cache=cache,
+                                 rate_limiter=HostRateLimiter(max_rate=OCC["max_rate"]), retry_queue=retry_queue))
+    if COMPUTRABAJO["enabled"]:
+        sources.append(ComputrabajoScraper(COMPUTRABAJO["keywords"], pages=COMPUTRABAJO["pages"],
+                                           workers=COMPUTRABAJO["workers"], per_host=COMPUTRABAJO["per_host"],
+                                           cache=cache, limiter=HostRateLimiter(max_rate=COMPUTRABAJO["max_rate"]),
+                                           retry_queue=retry_queue))
+    return sources
+
+
+async def run_all_sources():
+    print("🌐 REFRESHING ALL JOB SOURCES CONCURRENTLY")
+    print("=" * 60)
+
+    await init_db()
+    # Jobs already in jobs.db are skipped by every source before their detail request
+    known_links = await load_known_links()
+    print(f"📂 {len(known_links)} jobs already stored")
+
+    cache = HttpCache(HTTP_CACHE_DIR)
+    retry_queue = RetryQueue(RETRY_QUEUE_FILE)
+    sources = build_sources(cache, retry_queue)
+    print(f"🔍 Sources: {', '.join(source.name for source in sources)}")
+    start_time = time.time()
+
+    # Every source feeds one dedup step and one background database writer
+    async with JobWriter() as writer:
+        pipeline = JobPipeline(writer.put, known_links)
+        results = await run_sources(sources, pipeline)
+
+    total_time = time.time() - start_time
+    print(f"\n📊 RESULTS ({total_time / 60:.1f} min, slowest source "
+          f"{max((r['seconds'] for r in results.values()), default=0) / 60:.1f} min)")
+    for name, result in results.items():
+        status = f"❌ {result['error']}" if result["error"] else "✅"
+        print(f"{status} {name}: {result['accepted']} new jobs, {result['duplicates']} duplicates "
+              f"in {result['seconds'] / 60:.1f} min")
+        for host, rate in result.get("rates", {}).items():
+            print(f"    🚦 {host}: {rate:.2f} req/s")
+    counts = writer.stats()
+    print(f"💾 Saved to jobs.db: {counts['inserted']} new, {counts['skipped']} already stored")
+    if counts["errors"]:
+        print(f"❌ {counts['lost']} jobs could not be saved ({counts['errors']} batches failed after retries)")
+    cache_stats = cache.stats()
+    print(f"🗄️ Detail cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, "
+          f"{cache_stats['misses']} downloaded")
+    retry_stats = retry_queue.stats()
+    if retry_stats["pending"]:
+        print(f"🔁 {retry_stats['pending']} failed pages queued; run scripts/drain_retry_queue.py all")
+    retry_queue.close()
+
+    return results, counts
+
+
+def main():
+    os.makedirs("exports", exist_ok=True)
+    results, counts = asyncio.run(run_all_sources())
+    # Non-zero exit when jobs were lost on the way to jobs.db
+    return 1 if counts["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Check that every HTML parser backend extracts the same job fields
+
+Usage: python scripts/check_parser_parity.py [fixtures_dir]
+
+fixtures_dir defaults to the corpus committed in tests/fixtures/html, which
+the test suite checks too. A corpus is a folder of saved pages named by kind:
+occ_listing_*.html, occ_detail_*.html, computrabajo_listing_*.html and
+computrabajo_detail_*.html. Every page is extracted with the historical
+setup (html.parser on the full document) and compared with each installed
+backend, with and without the listing strainers the scrapers use.
+"""
+
+import asyncio
+import glob
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+from ScraperCommon.parsing import PARSER_BACKENDS, is_available, make_soup
+from OCCMexicoScraper.scraper_occ import OCCScraper, JOB_CARD_STRAINER, JOB_CARD_SELECTOR
+from ComputrabajoScraper.scraper import OFFER_STRAINER, parse_article, parse_description
+
+REFERENCE = ("html.parser", None)
+FIXTURES_DIR = os.path.join(PROJECT_ROOT, "tests", "fixtures", "html")
+
+
+async def extract_occ_listing(scraper, html, backend, strainer):
+    soup = make_soup(html, backend, parse_only=strainer)
+    return [await scraper.extract_job_data(card, fetch_description=False) for card in soup.select(JOB_CARD_SELECTOR)]
+
+
+async def extract_occ_detail(scraper, html, backend, strainer):
+    return scraper.extract_description(make_soup(html, backend))
+
+
+async def extract_computrabajo_listing(scraper, html, backend, strainer):
+    soup = make_soup(html, backend, parse_only=strainer)
+    return [parse_article(article) for article in soup.find_all("article", class_="box_offer")]
+
+
+async def extract_computrabajo_detail(scraper, html, backend, strainer):
+    return parse_description(html, backend)
+
+
+EXTRACTORS = {
+    "occ_listing": (extract_occ_listing, JOB_CARD_STRAINER),
+    "occ_detail": (extract_occ_detail, None),
+    "computrabajo_listing": (extract_computrabajo_listing, OFFER_STRAINER),
+    "computrabajo_detail": (extract_computrabajo_detail, None),
+}
+
+
+async def check_parser_parity(fixtures_dir):
+    print("🔬 HTML PARSER PARITY CHECK")
+    print("=" * 50)
+    
+    backends = [name for name in PARSER_BACKENDS if is_available(name)]
+    print(f"Installed backends: {', '.join(backends)}")
+    
+    scraper = OCCScraper()
+    checked = 0
+    mismatches = 0
+    
+    for kind, (extract, strainer) in EXTRACTORS.items():
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, f"{kind}_*.html"))):
+            with open(path, 'r', encoding='utf-8') as f:
+                html = f.read()
+            
+            expected = await extract(scraper, html, *REFERENCE)
+            variants = [(backend, None) for backend in backends]
+            if strainer is not None:
+                variants += [(backend, strainer) for backend in backends]
+            
+            for backend, variant_strainer in variants:
+                if (backend, variant_strainer) == REFERENCE:
+                    continue
+                checked += 1
+                actual = await extract(scraper, html, backend, variant_strainer)
+                if actual != expected:
+                    mismatches += 1
+                    label = f"{backend}{' + strainer' if variant_strainer is not None else ''}"
+                    print(f"❌ {os.path.basename(path)}: {label} differs from html.parser")
+    
+    if checked == 0:
+        print(f"⚠️ No fixtures found in {fixtures_dir}")
+        return False
+    
+    print(f"\n📊 Comparisons: {checked}, mismatches: {mismatches}")
+    if mismatches == 0:
+        print("✅ All backends produce identical fields")
+    return mismatches == 0
+
+
+if __name__ == "__main__":
+    fixtures_dir = sys.argv[1] if len(sys.argv) > 1 else FIXTURES_DIR
+    ok = asyncio.run(check_parser_parity(fixtures_dir))
+    sys.exit(0 if ok else 1)
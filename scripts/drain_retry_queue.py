@@ -0,0 +1,112 @@
+"""
+Retry the pages that failed during earlier crawls
+
+Usage: python scripts/drain_retry_queue.py [occ|computrabajo|all] [--wait]
+
+Entries whose backoff has elapsed are refetched. Recovered OCC jobs go
+where the run that queued them saved its jobs: the checkpoint runner's job
+sink (exports/occ_jobs), or jobs.db for run_all_sources.py, whose rows are
+updated in place. Recovered Computrabajo jobs are saved to jobs.db. With --wait the script
+keeps going, sleeping until the next entry is due, until nothing is pending.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ScraperCommon.http_cache import HttpCache
+from ScraperCommon.job_sink import JobSink
+from ScraperCommon.rate_limiter import HostRateLimiter
+from ScraperCommon.retry_queue import CircuitBreaker, RetryQueue, drain_retry_queue
+from OCCMexicoScraper.scraper_occ import OCCScraper, occ_retry_handlers
+from ComputrabajoScraper.models import bulk_upsert_jobs, init_db, load_known_links
+from ComputrabajoScraper.scraper import computrabajo_retry_handlers, make_client
+from ComputrabajoScraper.writer import JobWriter
+
+RETRY_QUEUE_FILE = "exports/retry_queue.db"
+HTTP_CACHE_DIR = "exports/http_cache"
+JOB_SINK_DIR = "exports/occ_jobs"
+
+SOURCE_KINDS = {
+    "occ": ["occ_listing", "occ_detail", "occ_listing_db", "occ_detail_db"],
+    "computrabajo": ["computrabajo_listing", "computrabajo_detail"],
+}
+SOURCE_KINDS["all"] = SOURCE_KINDS["occ"] + SOURCE_KINDS["computrabajo"]
+
+
+async def drain_once(retry_queue, source, limiter, breaker):
+    cache = HttpCache(HTTP_CACHE_DIR)
+    summary = {"retried": 0, "recovered": 0, "failed": 0, "skipped": 0}
+
+    if source in ("occ", "all"):
+        with JobSink(JOB_SINK_DIR) as job_sink:
+            known_links = set(job_sink.iter_links())
+            async with OCCScraper(fetch_mode="hybrid", cache=cache, rate_limiter=limiter,
+                                  retry_queue=retry_queue) as scraper:
+                handlers = occ_retry_handlers(scraper, job_sink.write, known_links)
+                result = await drain_retry_queue(retry_queue, handlers, breaker)
+        for key in summary:
+            summary[key] += result[key]
+
+        # Jobs of run_all_sources.py runs: their rows in jobs.db hold the description placeholder
+        await init_db()
+        known_links = await load_known_links()
+        async with OCCScraper(fetch_mode="hybrid", cache=cache, rate_limiter=limiter,
+                              retry_queue=retry_queue, save_target="db") as scraper:
+            handlers = occ_retry_handlers(scraper, lambda jobs: bulk_upsert_jobs(jobs, on_conflict="update"),
+                                          known_links, save_target="db")
+            result = await drain_retry_queue(retry_queue, handlers, breaker)
+        for key in summary:
+            summary[key] += result[key]
+
+    if source in ("computrabajo", "all"):
+        await init_db()
+        async with JobWriter() as writer, make_client() as client:
+            handlers = computrabajo_retry_handlers(client, cache=cache, limiter=limiter, writer=writer,
+                                                   retry_queue=retry_queue)
+            result = await drain_retry_queue(retry_queue, handlers, breaker)
+        for key in summary:
+            summary[key] += result[key]
+        if writer.lost:
+            print(f"❌ {writer.lost} recovered jobs could not be saved to jobs.db")
+
+    return summary
+
+
+async def main(source="all", wait=False):
+    print("🔁 DRAINING RETRY QUEUE")
+    print("=" * 40)
+
+    retry_queue = RetryQueue(RETRY_QUEUE_FILE)
+    # Shared across passes so hosts keep their learned rate and open circuits
+    limiter = HostRateLimiter()
+    breaker = CircuitBreaker()
+
+    while True:
+        summary = await drain_once(retry_queue, source, limiter, breaker)
+        print(f"Retried: {summary['retried']}, recovered: {summary['recovered']}, "
+              f"failed again: {summary['failed']}, skipped (circuit open): {summary['skipped']}")
+        next_due = retry_queue.next_due_in(SOURCE_KINDS[source])
+        if not wait or next_due is None:
+            break
+        if summary["retried"] == 0 and summary["skipped"]:
+            # Everything due is behind an open circuit; wait for it to half-open
+            next_due = max(next_due, breaker.reset_after)
+        print(f"⏳ Next retry due in {next_due:.0f}s")
+        await asyncio.sleep(max(next_due, 1))
+
+    stats = retry_queue.stats()
+    print(f"\n📊 Pending: {stats['pending']}, recovered: {stats['recovered']}, "
+          f"given up: {stats['gave_up']}, failures recorded: {stats['failures']}")
+    retry_queue.close()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    source = args[0] if args else "all"
+    if source not in ("occ", "computrabajo", "all"):
+        print("Usage: python scripts/drain_retry_queue.py [occ|computrabajo|all] [--wait]")
+        sys.exit(1)
+    asyncio.run(main(source, wait="--wait" in sys.argv))
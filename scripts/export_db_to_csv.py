@@ -1,7 +1,13 @@
 import sqlite3
 import csv
+import os
+import sys
 import time
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ScraperCommon.job_record import JOB_FIELDS, JobRecord, Source
+
 def export_db_to_csv():
     print("📊 EXPORTING DATABASE JOBS TO CSV")
     print("=" * 40)
@@ -10,8 +16,8 @@ def export_db_to_csv():
     cursor = conn.cursor()
     
     # Get all jobs
-    cursor.execute('SELECT title, company, location, salary, modality, link, description, source FROM job_listings')
-    all_jobs = cursor.fetchall()
+    cursor.execute(f"SELECT {', '.join(JOB_FIELDS)} FROM job_listings")
+    all_jobs = [JobRecord.from_dict(dict(zip(JOB_FIELDS, row))) for row in cursor.fetchall()]
     
     print(f"Total jobs in database: {len(all_jobs)}")
     
@@ -20,22 +26,10 @@ def export_db_to_csv():
     computrabajo_jobs = []
     
     for job in all_jobs:
-        title, company, location, salary, modality, link, description, source = job
-        job_dict = {
-            'title': title,
-            'company': company,
-            'location': location,
-            'salary': salary,
-            'modality': modality,
-            'link': link,
-            'description': description,
-            'source': source
-        }
-        
-        if source == 'OCC':
-            occ_jobs.append(job_dict)
-        elif source == 'Computrabajo':
-            computrabajo_jobs.append(job_dict)
+        if job.source == Source.OCC:
+            occ_jobs.append(job)
+        elif job.source == Source.COMPUTRABAJO:
+            computrabajo_jobs.append(job)
     
     print(f"OCC jobs: {len(occ_jobs)}")
     print(f"Computrabajo jobs: {len(computrabajo_jobs)}")
@@ -44,41 +38,29 @@ def export_db_to_csv():
     if occ_jobs:
         occ_filename = f"db_occ_jobs_{int(time.time())}.csv"
         with open(occ_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['title', 'company', 'location', 'salary', 'modality', 'link', 'description', 'source']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=JOB_FIELDS)
             writer.writeheader()
             for job in occ_jobs:
-                writer.writerow(job)
+                writer.writerow(job.to_csv_row())
         print(f"✅ Exported {len(occ_jobs)} OCC jobs to {occ_filename}")
     
     # Export Computrabajo jobs
     if computrabajo_jobs:
         comp_filename = f"db_computrabajo_jobs_{int(time.time())}.csv"
         with open(comp_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['title', 'company', 'location', 'salary', 'modality', 'link', 'description', 'source']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=JOB_FIELDS)
             writer.writeheader()
             for job in computrabajo_jobs:
-                writer.writerow(job)
+                writer.writerow(job.to_csv_row())
         print(f"✅ Exported {len(computrabajo_jobs)} Computrabajo jobs to {comp_filename}")
     
     # Export all jobs
     all_filename = f"db_all_jobs_{int(time.time())}.csv"
     with open(all_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'company', 'location', 'salary', 'modality', 'link', 'description', 'source']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=JOB_FIELDS)
         writer.writeheader()
         for job in all_jobs:
-            writer.writerow({
-                'title': job[0],
-                'company': job[1],
-                'location': job[2],
-                'salary': job[3],
-                'modality': job[4],
-                'link': job[5],
-                'description': job[6],
-                'source': job[7]
-            })
+            writer.writerow(job.to_csv_row())
     print(f"✅ Exported all {len(all_jobs)} jobs to {all_filename}")
     
     conn.close()
@@ -1,7 +1,8 @@
 import asyncio
 import csv
 import time
-from OCCMexicoScraper.scraper_occ import scrape_jobs_occ
+from OCCMexicoScraper.scraper_occ import iter_jobs_occ
+from ScraperCommon.job_record import JOB_FIELDS
 
 async def export_occ_no_duplicates():
     print("🇲🇽 EXPORTING OCC JOBS TO CSV (NO DUPLICATES)")
@@ -17,46 +18,39 @@ async def export_occ_no_duplicates():
         "personal",
     ]
     
-    all_jobs = []
-    seen_links = set()  # To track duplicates
+    total_jobs = 0
+    sample_jobs = []
+    seen_links = set()  # To track duplicates; jobs already seen are skipped before their detail request
     
-    for keyword in hr_keywords:
-        print(f"\n🔍 Scraping keyword: {keyword}")
-        jobs = await scrape_jobs_occ(keyword, pages=10)  # 10 pages per keyword
-        
-        # Remove duplicates
-        unique_jobs = []
-        for job in jobs:
-            if job['link'] not in seen_links:
-                seen_links.add(job['link'])
-                unique_jobs.append(job)
-        
-        all_jobs.extend(unique_jobs)
-        print(f"✅ Found {len(jobs)} jobs, {len(unique_jobs)} unique for keyword '{keyword}'")
-    
-    print(f"\n📊 Total unique jobs found: {len(all_jobs)}")
-    
-    # Export to CSV
+    # Jobs are written as they are scraped, so memory does not grow with the crawl
     csv_filename = f"occ_jobs_unique_{int(time.time())}.csv"
     
     with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'company', 'location', 'salary', 'modality', 'link', 'description', 'source']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=JOB_FIELDS)
         
         writer.writeheader()
-        for job in all_jobs:
-            writer.writerow(job)
-    
-    print(f"✅ Exported {len(all_jobs)} unique jobs to {csv_filename}")
+        for keyword in hr_keywords:
+            print(f"\n🔍 Scraping keyword: {keyword}")
+            unique_jobs = 0
+            async for job in iter_jobs_occ(keyword, pages=10, known_links=seen_links):  # 10 pages per keyword
+                writer.writerow(job.to_csv_row())
+                unique_jobs += 1
+                if len(sample_jobs) < 3:
+                    sample_jobs.append(job)
+            total_jobs += unique_jobs
+            print(f"✅ Found {unique_jobs} unique jobs for keyword '{keyword}'")
+    
+    print(f"\n📊 Total unique jobs found: {total_jobs}")
+    print(f"✅ Exported {total_jobs} unique jobs to {csv_filename}")
     
     # Show summary
     print(f"\n📋 Summary:")
-    print(f"Total unique jobs: {len(all_jobs)}")
+    print(f"Total unique jobs: {total_jobs}")
     print(f"CSV file: {csv_filename}")
     
     # Show first 3 jobs as sample
     print(f"\n📋 Sample jobs:")
-    for i, job in enumerate(all_jobs[:3], 1):
+    for i, job in enumerate(sample_jobs, 1):
         print(f"\n--- Job {i} ---")
         print(f"Title: {job['title']}")
         print(f"Company: {job['company']}")
@@ -1,7 +1,8 @@
 import asyncio
 import csv
 import time
-from OCCMexicoScraper.scraper_occ import scrape_jobs_occ
+from OCCMexicoScraper.scraper_occ import iter_jobs_occ
+from ScraperCommon.job_record import JOB_FIELDS
 
 async def export_occ_to_csv():
     print("🇲🇽 EXPORTING OCC JOBS TO CSV")
@@ -17,32 +18,33 @@ async def export_occ_to_csv():
         # "personal",
     ]
     
-    all_jobs = []
+    total_jobs = 0
+    first_jobs = []
     
-    for keyword in hr_keywords:
-        print(f"\n🔍 Scraping keyword: {keyword}")
-        jobs = await scrape_jobs_occ(keyword, pages=5)  # Just 5 pages for testing
-        all_jobs.extend(jobs)
-        print(f"✅ Found {len(jobs)} jobs for keyword '{keyword}'")
-    
-    print(f"\n📊 Total jobs found: {len(all_jobs)}")
-    
-    # Export to CSV
+    # Jobs are written as they are scraped, so memory does not grow with the crawl
     csv_filename = f"occ_jobs_{int(time.time())}.csv"
     
     with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'company', 'location', 'salary', 'modality', 'link', 'description', 'source']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=JOB_FIELDS)
         
         writer.writeheader()
-        for job in all_jobs:
-            writer.writerow(job)
-    
-    print(f"✅ Exported {len(all_jobs)} jobs to {csv_filename}")
+        for keyword in hr_keywords:
+            print(f"\n🔍 Scraping keyword: {keyword}")
+            keyword_jobs = 0
+            async for job in iter_jobs_occ(keyword, pages=5):  # Just 5 pages for testing
+                writer.writerow(job.to_csv_row())
+                keyword_jobs += 1
+                if len(first_jobs) < 5:
+                    first_jobs.append(job)
+            total_jobs += keyword_jobs
+            print(f"✅ Found {keyword_jobs} jobs for keyword '{keyword}'")
+    
+    print(f"\n📊 Total jobs found: {total_jobs}")
+    print(f"✅ Exported {total_jobs} jobs to {csv_filename}")
     
     # Show first 5 jobs
     print(f"\n📋 First 5 jobs:")
-    for i, job in enumerate(all_jobs[:5], 1):
+    for i, job in enumerate(first_jobs, 1):
         print(f"\n--- Job {i} ---")
         print(f"Title: {job['title']}")
         print(f"Company: {job['company']}")
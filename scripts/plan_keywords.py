@@ -0,0 +1,36 @@
+"""
+Show which OCC keywords still pay for their pages
+
+Usage: python scripts/plan_keywords.py
+
+Reads the keyword hits logged by get_3000_occ_jobs_checkpoint.py and prints,
+for each keyword, how many new jobs it adds on top of the better keywords
+and how many jobs only it ever found, plus the reduced keyword plan.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from OCCMexicoScraper.keyword_planner import KeywordHitLog, plan_keywords
+
+KEYWORD_HITS_FILE = "exports/keyword_hits.db"
+
+
+def main():
+    if not os.path.exists(KEYWORD_HITS_FILE):
+        print(f"❌ No keyword hits yet ({KEYWORD_HITS_FILE}); run get_3000_occ_jobs_checkpoint.py first")
+        return
+    hit_log = KeywordHitLog(KEYWORD_HITS_FILE)
+    plan = plan_keywords(hit_log.hits_by_keyword())
+    hit_log.close()
+    print("🧭 KEYWORD PLAN")
+    print("=" * 40)
+    print(plan.report())
+    if plan.dropped:
+        print(f"\nSet KEYWORD_PLAN = \"apply\" to skip: {', '.join(plan.dropped)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import json
+
+from OCCMexicoScraper.checkpoint import CheckpointManager
+
+
+def make_manager(tmp_path, **kwargs):
+    kwargs.setdefault("pages_per_keyword", 5)
+    return CheckpointManager(str(tmp_path / "checkpoint.json"), **kwargs)
+
+
+def test_pages_are_journaled_and_replayed(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.record_page(1, 1, ["a", "b"], cards=20)
+    manager.record_page(1, 2, ["c"], cards=18)
+    manager.record_page(2, 1, [], cards=0)
+
+    resumed = make_manager(tmp_path)
+    assert resumed.checkpoint_data['seen_links'] == ["a", "b", "c"]
+    assert resumed.checkpoint_data['total_jobs'] == 3
+    assert resumed.is_page_done(1, 2) and resumed.is_page_done(2, 1)
+    assert not resumed.is_page_done(2, 2)
+    assert resumed.page_history() == {1: [(1, 20, 2), (2, 18, 1)], 2: [(1, 0, 0)]}
+    assert resumed.pages_since_compact == 3
+
+
+def test_torn_last_line_is_dropped_and_later_pages_survive(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.record_page(1, 1, ["a"], cards=20)
+    manager.record_page(1, 2, ["b"], cards=20)
+    # Crash halfway through appending page 3
+    with open(manager.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"keyword":1,"page":3,"links":["c"')
+
+    resumed = make_manager(tmp_path)
+    assert resumed.checkpoint_data['seen_links'] == ["a", "b"]
+    assert not resumed.is_page_done(1, 3)
+
+    # The page is crawled again and must not be lost on the next resume
+    resumed.record_page(1, 3, ["c"], cards=20)
+    again = make_manager(tmp_path)
+    assert again.checkpoint_data['seen_links'] == ["a", "b", "c"]
+    assert again.is_page_done(1, 3)
+
+
+def test_complete_but_unterminated_last_line_is_not_replayed(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.record_page(1, 1, ["a"], cards=20)
+    # The newline is written with the entry, so an entry without it was never acknowledged
+    entry = {'keyword': 1, 'page': 2, 'links': ["b"], 'seq': 2, 'time': 0}
+    with open(manager.journal_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry))
+
+    resumed = make_manager(tmp_path)
+    assert resumed.checkpoint_data['seen_links'] == ["a"]
+    resumed.record_page(1, 2, ["b"], cards=20)
+    assert make_manager(tmp_path).checkpoint_data['seen_links'] == ["a", "b"]
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    manager = make_manager(tmp_path, compact_every=2)
+    manager.record_page(1, 1, ["a"], cards=20)
+    manager.record_page(1, 2, ["b"], cards=20)
+
+    with open(manager.checkpoint_file, 'r', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    assert snapshot['seen_links'] == ["a", "b"]
+    assert snapshot['journal_seq'] == 2
+    with open(manager.journal_file, 'r', encoding='utf-8') as f:
+        assert f.read() == ""
+
+    manager.record_page(1, 3, ["c"], cards=20)
+    resumed = make_manager(tmp_path, compact_every=2)
+    assert resumed.checkpoint_data['seen_links'] == ["a", "b", "c"]
+    assert resumed.pages_since_compact == 1
+
+
+def test_stale_journal_after_a_crash_during_compaction_is_skipped(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.record_page(1, 1, ["a"], cards=20)
+    manager.record_page(1, 2, ["b"], cards=20)
+    with open(manager.journal_file, 'r', encoding='utf-8') as f:
+        journal = f.read()
+    manager.compact()
+    # Crash after the snapshot was renamed but before the journal was truncated
+    with open(manager.journal_file, 'w', encoding='utf-8') as f:
+        f.write(journal)
+
+    resumed = make_manager(tmp_path)
+    assert resumed.checkpoint_data['seen_links'] == ["a", "b"]
+    assert resumed.checkpoint_data['total_jobs'] == 2
+
+
+def test_position_entries_do_not_mark_pages_done(tmp_path):
+    manager = make_manager(tmp_path)
+    manager.record_position(3, 4)
+
+    resumed = make_manager(tmp_path)
+    assert resumed.checkpoint_data['current_keyword'] == 3
+    assert resumed.checkpoint_data['current_page'] == 4
+    assert not resumed.is_page_done(3, 4)
+
+
+def test_serial_snapshot_without_completed_pages(tmp_path):
+    # Snapshots written by the serial crawler only stored its position
+    with open(tmp_path / "checkpoint.json", 'w', encoding='utf-8') as f:
+        json.dump({'total_jobs': 4, 'current_keyword': 2, 'current_page': 3, 'seen_links': ["a"]}, f)
+
+    manager = make_manager(tmp_path, pages_per_keyword=5)
+    assert all(manager.is_page_done(1, page) for page in range(1, 6))
+    assert manager.is_page_done(2, 2)
+    assert not manager.is_page_done(2, 3)
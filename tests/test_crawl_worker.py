@@ -0,0 +1,35 @@
+import asyncio
+import os
+
+import crawl_worker
+from OCCMexicoScraper.scraper_occ import DESCRIPTION_ERROR, OCCScraper
+from ScraperCommon.retry_queue import RetryQueue
+
+
+def test_failed_occ_details_of_a_unit_are_queued_for_the_db_drain(tmp_path, monkeypatch):
+    retry_queue = RetryQueue(str(tmp_path / "retry_queue.db"))
+    scraper = OCCScraper(retry_queue=retry_queue, save_target="db")
+    with open(os.path.join(os.path.dirname(__file__), "fixtures", "html", "occ_listing_1.html"), encoding="utf-8") as f:
+        listing_html = f.read()
+
+    async def load_listing_html(search_url, ready_ms, settle_ms):
+        return listing_html
+
+    async def get_job_description(job_url, page=None):
+        if job_url.endswith("empleo-20388102/"):
+            raise TimeoutError("detail timed out")
+        return "Descripción"
+
+    monkeypatch.setattr(scraper, "load_listing_html", load_listing_html)
+    monkeypatch.setattr(scraper, "get_job_description", get_job_description)
+
+    unit_links = set()
+    unit = {"keyword": "recursos humanos", "page": 1}
+    jobs = asyncio.run(crawl_worker.scrape_occ_unit(scraper, unit, unit_links))
+
+    failed = [job["link"] for job in jobs if job["description"] == DESCRIPTION_ERROR]
+    assert failed == ["https://www.occ.com.mx/empleos/empleo-20388102/"]
+    entries = retry_queue.due(include_waiting=True)
+    assert [(entry["url"], entry["kind"]) for entry in entries] == [(failed[0], "occ_detail_db")]
+    assert len(unit_links) == len(jobs) == 4
+    retry_queue.close()
@@ -0,0 +1,163 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from ScraperCommon import http_cache as http_cache_module
+from ScraperCommon.http_cache import HttpCache
+
+URL = "https://mx.computrabajo.com/ofertas-de-trabajo/oferta-1"
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 14 Oct 2026 10:00:00 GMT"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(http_cache_module.time, "time", clock)
+    return clock
+
+
+class Server:
+    """MockTransport handler serving one page with validators, recording the requests"""
+
+    def __init__(self, body="<p>Analista de RH</p>", etag=ETAG, last_modified=LAST_MODIFIED):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.status = 200
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if self.status != 200:
+            return httpx.Response(self.status, text="error")
+        headers = {}
+        if self.etag:
+            headers["ETag"] = self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        not_modified = (self.etag and request.headers.get("If-None-Match") == self.etag) or (
+            not self.etag and self.last_modified and request.headers.get("If-Modified-Since") == self.last_modified)
+        if not_modified:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, text=self.body, headers=headers)
+
+
+def fetch(cache, server, url=URL):
+    async def get():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            return await cache.get(client, url, headers={"User-Agent": "test"})
+    return asyncio.run(get())
+
+
+def test_fresh_entry_is_served_without_a_request(tmp_path, clock):
+    cache = HttpCache(str(tmp_path), ttl=3600)
+    server = Server()
+
+    first = fetch(cache, server)
+    assert (first.status_code, first.text, first.from_cache) == (200, server.body, False)
+    clock.now += 3599
+    second = fetch(cache, server)
+    assert (second.status_code, second.text, second.from_cache) == (200, server.body, True)
+    assert len(server.requests) == 1
+    assert cache.lookup(URL) == server.body
+    assert cache.stats() == {"hits": 2, "revalidated": 0, "misses": 1}
+
+
+def test_stale_entry_is_revalidated_and_served_on_304(tmp_path, clock):
+    cache = HttpCache(str(tmp_path), ttl=3600)
+    server = Server()
+    fetch(cache, server)
+
+    clock.now += 3600
+    assert cache.lookup(URL) is None
+    response = fetch(cache, server)
+    request = server.requests[-1]
+    assert request.headers["If-None-Match"] == ETAG
+    assert request.headers["If-Modified-Since"] == LAST_MODIFIED
+    assert request.headers["User-Agent"] == "test"
+    assert (response.status_code, response.text, response.from_cache) == (200, "<p>Analista de RH</p>", False)
+    assert cache.stats() == {"hits": 0, "revalidated": 1, "misses": 1}
+
+    # The 304 renewed the entry's freshness
+    clock.now += 3599
+    assert fetch(cache, server).from_cache
+    assert len(server.requests) == 2
+
+
+def test_last_modified_alone_is_enough_to_revalidate(tmp_path, clock):
+    cache = HttpCache(str(tmp_path), ttl=60)
+    server = Server(etag=None)
+    fetch(cache, server)
+
+    clock.now += 60
+    response = fetch(cache, server)
+    assert "If-None-Match" not in server.requests[-1].headers
+    assert server.requests[-1].headers["If-Modified-Since"] == LAST_MODIFIED
+    assert response.text == server.body
+    assert cache.revalidated == 1
+
+
+def test_changed_page_replaces_the_cached_body(tmp_path, clock):
+    cache = HttpCache(str(tmp_path), ttl=60)
+    server = Server()
+    fetch(cache, server)
+
+    clock.now += 60
+    server.body, server.etag = "<p>Vacante actualizada</p>", '"v2"'
+    response = fetch(cache, server)
+    assert response.text == "<p>Vacante actualizada</p>"
+    assert cache.misses == 2
+
+    clock.now += 30
+    assert cache.lookup(URL) == "<p>Vacante actualizada</p>"
+
+
+def test_entry_without_validators_is_fetched_unconditionally(tmp_path, clock):
+    cache = HttpCache(str(tmp_path), ttl=60)
+    server = Server(etag=None, last_modified=None)
+    fetch(cache, server)
+
+    clock.now += 60
+    fetch(cache, server)
+    assert "If-None-Match" not in server.requests[-1].headers
+    assert "If-Modified-Since" not in server.requests[-1].headers
+    assert cache.misses == 2
+
+
+def test_error_responses_are_not_cached(tmp_path, clock):
+    cache = HttpCache(str(tmp_path), ttl=3600)
+    server = Server()
+    server.status = 503
+
+    response = fetch(cache, server)
+    assert response.status_code == 503
+    assert cache.lookup(URL) is None
+
+    server.status = 200
+    assert fetch(cache, server).text == server.body
+    assert len(server.requests) == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = HttpCache(str(tmp_path), ttl=3600, max_bytes=3500)
+    urls = [f"{URL}-{n}" for n in range(3)]
+    for n, url in enumerate(urls):
+        cache.store(url, "x" * 1000)
+        os.utime(cache._paths(url)[0], (n, n))
+    # Reading the oldest entry makes it the most recently used
+    assert cache.lookup(urls[0])
+
+    cache.store(f"{URL}-3", "x" * 1000)
+    assert cache.lookup(urls[1]) is None
+    assert all(cache.lookup(url) for url in [urls[0], urls[2], f"{URL}-3"])
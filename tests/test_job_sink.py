@@ -0,0 +1,74 @@
+import csv
+
+from ScraperCommon.job_record import JobRecord, Source
+from ScraperCommon.job_sink import JobSink
+
+
+def make_job(n, description="Descripción"):
+    return JobRecord(title=f"Puesto {n}", company="Empresa", location="Ciudad de México",
+                     description=description, link=f"https://www.occ.com.mx/empleos/empleo-{n}/", source=Source.OCC)
+
+
+def read_rows(path):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f, strict=True))
+
+
+def test_jobs_are_appended_across_reopens_and_counted_once(tmp_path):
+    with JobSink(str(tmp_path), max_rows_per_segment=2, flush_rows=1) as sink:
+        sink.write([make_job(1), make_job(2), make_job(3)])
+    with JobSink(str(tmp_path), max_rows_per_segment=2, flush_rows=1) as sink:
+        assert sink.count() == 3
+        sink.write([make_job(3, "Descripción recuperada"), make_job(4)])
+        assert sink.count() == 4
+        assert len(sink.segment_paths()) == 3
+
+        count = sink.export(str(tmp_path / "export.csv"))
+    rows = read_rows(tmp_path / "export.csv")
+    assert count == len(rows) == 4
+    assert [row["description"] for row in rows if row["link"].endswith("empleo-3/")] == ["Descripción recuperada"]
+
+
+def torn_sink(tmp_path, tail):
+    with JobSink(str(tmp_path), flush_rows=1) as sink:
+        sink.write([make_job(1), make_job(2, "Primera línea\nsegunda línea")])
+    path = sink.segment_paths()[-1]
+    with open(path, 'ab') as f:
+        f.write(tail)
+    return path
+
+
+def test_partial_last_row_is_cut_off_on_reopen(tmp_path):
+    path = torn_sink(tmp_path, "Puesto 3,Empresa,Ciudad de México,,,https://www.occ.com.mx/empl".encode('utf-8'))
+
+    with JobSink(str(tmp_path), flush_rows=1) as sink:
+        assert sink.count() == 2
+        sink.write([make_job(3)])
+
+    rows = read_rows(path)
+    assert [row["title"] for row in rows] == ["Puesto 1", "Puesto 2", "Puesto 3"]
+    assert rows[1]["description"] == "Primera línea\nsegunda línea"
+    assert rows[2]["link"] == "https://www.occ.com.mx/empleos/empleo-3/"
+
+
+def test_row_cut_inside_a_multiline_quoted_field_is_cut_off(tmp_path):
+    # Ends on a line break, but inside the quoted description
+    tail = 'Puesto 3,Empresa,Ciudad de México,,,https://www.occ.com.mx/empleos/empleo-3/,"Primera\n'
+    path = torn_sink(tmp_path, tail.encode('utf-8'))
+
+    with JobSink(str(tmp_path), flush_rows=1) as sink:
+        assert sink.count() == 2
+        sink.write([make_job(4)])
+
+    assert [row["title"] for row in read_rows(path)] == ["Puesto 1", "Puesto 2", "Puesto 4"]
+
+
+def test_torn_header_of_a_new_segment_is_rewritten(tmp_path):
+    with open(tmp_path / "segment_00001.csv", 'w', encoding='utf-8') as f:
+        f.write("title,company,loc")
+
+    with JobSink(str(tmp_path), flush_rows=1) as sink:
+        assert sink.count() == 0
+        sink.write([make_job(1)])
+
+    assert [row["title"] for row in read_rows(tmp_path / "segment_00001.csv")] == ["Puesto 1"]
@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+from ScraperCommon import leases as leases_module
+from ScraperCommon.leases import LeaseTable
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(leases_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def table(tmp_path, clock):
+    table = LeaseTable(str(tmp_path / "work_units.db"), lease_seconds=60, max_attempts=2)
+    yield table
+    table.close()
+
+
+def test_seed_is_idempotent(table):
+    assert table.seed("occ", ["hr", "rh"], 3) == 6
+    assert table.seed("occ", ["hr", "nomina"], 3) == 3
+    assert table.stats() == {"pending": 9, "leased": 0, "done": 0, "failed": 0, "jobs": 0}
+
+
+def test_claims_are_exclusive_and_lowest_pages_first(table):
+    table.seed("occ", ["hr", "rh"], 2)
+    table.seed("computrabajo", ["hr"], 1)
+
+    first = table.claim("worker-a", ["occ"], limit=2)
+    second = table.claim("worker-b", ["occ"], limit=5)
+    assert [(unit["keyword"], unit["page"]) for unit in first] == [("hr", 1), ("rh", 1)]
+    assert [(unit["keyword"], unit["page"]) for unit in second] == [("hr", 2), ("rh", 2)]
+    assert table.claim("worker-c", ["occ"]) == []
+    assert table.stats(["computrabajo"])["pending"] == 1
+
+
+def test_expired_lease_is_reclaimed_and_the_old_owner_rejected(table, clock):
+    table.seed("occ", ["hr"], 1)
+    unit = table.claim("crashed")[0]
+
+    clock.now += 30
+    assert table.claim("other") == []
+    assert table.heartbeat(unit["id"], "crashed")
+
+    # The heartbeat pushed the lease to 30 + 60 seconds
+    clock.now += 61
+    retaken = table.claim("other")
+    assert [row["id"] for row in retaken] == [unit["id"]]
+    assert retaken[0]["attempts"] == 2
+
+    assert not table.heartbeat(unit["id"], "crashed")
+    assert not table.complete(unit["id"], "crashed", jobs=5)
+    assert not table.fail(unit["id"], "crashed", "late error")
+    assert table.complete(unit["id"], "other", jobs=7)
+    assert table.stats() == {"pending": 0, "leased": 0, "done": 1, "failed": 0, "jobs": 7}
+
+
+def test_reclaim_expired_returns_units_to_pending(table, clock):
+    table.seed("occ", ["hr", "rh"], 1)
+    table.claim("crashed", limit=2)
+    clock.now += 30
+    assert table.reclaim_expired() == 0
+
+    clock.now += 31
+    assert table.reclaim_expired() == 2
+    assert table.stats()["pending"] == 2
+
+
+def test_failed_units_are_retried_until_max_attempts(table):
+    table.seed("occ", ["hr"], 1)
+    unit = table.claim("worker-a")[0]
+    assert table.fail(unit["id"], "worker-a", "timeout")
+    assert table.stats()["pending"] == 1
+
+    unit = table.claim("worker-b")[0]
+    assert unit["attempts"] == 2
+    assert table.fail(unit["id"], "worker-b", "timeout again")
+    assert table.stats()["failed"] == 1
+    assert table.claim("worker-c") == []
+
+
+def test_concurrent_claims_from_threads_never_share_a_unit(table):
+    table.seed("occ", [f"keyword {n}" for n in range(10)], 5)
+    claimed = []
+
+    def worker(owner):
+        while True:
+            units = table.claim(owner)
+            if not units:
+                return
+            claimed.append(units[0]["id"])
+
+    threads = [threading.Thread(target=worker, args=(f"worker-{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == sorted(set(claimed))
+    assert len(claimed) == 50
+
+
+def test_two_connections_share_the_file(tmp_path, clock):
+    path = str(tmp_path / "work_units.db")
+    first = LeaseTable(path, lease_seconds=60)
+    second = LeaseTable(path, lease_seconds=60)
+    first.seed("occ", ["hr"], 2)
+
+    assert len(first.claim("worker-a")) == 1
+    assert len(second.claim("worker-b")) == 1
+    assert second.claim("worker-b") == []
+    first.close()
+    second.close()
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from ScraperCommon import matching
+from ScraperCommon.matching import (HR_MATCHER, HR_TERMS, MEXICO_MATCHER, MEXICO_TERMS, TermMatcher, explain_job,
+                                    fold, is_hr_related, is_mexico_location)
+
+THRESHOLD = matching._REGEX_MAX_LENGTH
+
+
+def pad(text, length):
+    """text padded with neutral words to exactly length characters"""
+    return (text + " " + "zzz " * length)[:length]
+
+
+def reference_fold(text):
+    return matching._fold_slow(text.lower()) if text else ""
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Análisis", "analisis"),
+    ("QUERÉTARO", "queretaro"),
+    ("Nómina y Compensación", "nomina y compensacion"),
+    ("Niño Ñandú", "nino nandu"),
+    ("plain ascii", "plain ascii"),
+    ("", ""),
+    (None, ""),
+])
+def test_fold_strips_accents_and_case(text, expected):
+    assert fold(text) == expected
+
+
+def test_fold_matches_unicode_decomposition_outside_latin1():
+    # Latin Extended letters fold like NFKD; characters with no Latin-1 form become "?"
+    assert fold("Şirket Łódź") == "sirket ?odz"
+    assert fold("RRHH — 🚀") == "rrhh ? ?"
+    for text in ["Gestión del Talento", "Ciudad de México", "São Paulo", "Zürich"]:
+        assert fold(text) == reference_fold(text)
+
+
+def test_accents_match_both_ways():
+    assert is_hr_related("Análisis de Nómina", None)
+    assert is_hr_related("Analisis de nomina", None)
+    assert is_mexico_location("Querétaro, Qro.")
+    assert is_mexico_location("QUERETARO")
+    assert is_mexico_location("San Luis Potosi")
+    assert not is_mexico_location("Bogotá, Colombia")
+
+
+@pytest.mark.parametrize("length", [THRESHOLD - 1, THRESHOLD, THRESHOLD + 1, THRESHOLD * 10])
+def test_matching_is_substring_based_on_both_paths(length):
+    # The vocabularies never needed word boundaries: "personal" also matches inside "personalizado"
+    assert len(pad("Atención personalizada", length)) == length
+    assert HR_MATCHER.search(pad("Atención personalizada", length))
+    assert HR_MATCHER.search(pad("xxgerentexx", length))
+    assert MEXICO_MATCHER.search(pad("Monterrey, N.L.", length))
+    assert not HR_MATCHER.search(pad("Chofer de reparto", length))
+    # A term cut off by the end of the text is not matched
+    assert not HR_MATCHER.search(pad("zz", length - 4) + "nomi")
+
+
+def test_long_text_path_agrees_with_the_regex():
+    rng = random.Random(20)
+    words = ["de", "la", "empresa", "ventas", "chofer", "almacén", "turno", "zona", "sueldo", "bodega",
+             "Sr.", "—", "🚀", "Łódź", "ÁREA", "\n"]
+    vocabulary = HR_TERMS + MEXICO_TERMS
+    for _ in range(500):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 120)))
+        if rng.random() < 0.4:
+            position = rng.randint(0, len(text))
+            term = rng.choice(vocabulary)
+            term = term.upper() if rng.random() < 0.5 else term
+            text = text[:position] + term + text[position:]
+        for matcher in (HR_MATCHER, MEXICO_MATCHER):
+            folded = fold(text)
+            expected = bool(matcher.pattern.search(folded))
+            assert any(needle in folded for needle in matcher._needles) == expected, text
+            assert matcher.search(text) == expected, text
+
+
+def test_needles_are_the_terms_that_decide_a_match():
+    matcher = TermMatcher(["reclutador", "reclutadora", "baja california", "baja california sur", "rh"])
+    assert sorted(matcher._needles) == ["baja california", "reclutador", "rh"]
+    assert matcher.search("x" * THRESHOLD + " Reclutadora Sr.")
+
+
+def test_matches_report_vocabulary_spellings_longest_first():
+    assert MEXICO_MATCHER.matches("La Paz, Baja California Sur") == ["la paz", "baja california sur"]
+    assert MEXICO_MATCHER.matches("Leon, Guanajuato") == ["león", "guanajuato"]
+    assert HR_MATCHER.matches(None, "") == []
+
+
+def test_explain_job():
+    job = {"title": "Coordinadora de Reclutamiento", "description": None, "location": "Mérida, Yucatán"}
+    explained = explain_job(job)
+    assert explained["hr_terms"] == ["coordinadora", "reclutamiento"]
+    assert explained["location_terms"] == ["mérida", "yucatán"]
+    assert explained["accepted"]
+    assert not explain_job({**job, "location": "Remoto"})["accepted"]
@@ -0,0 +1,53 @@
+import asyncio
+
+from OCCMexicoScraper.scraper_occ import OCCSource, occ_listing_url, occ_retry_handlers
+from ScraperCommon.job_record import JobRecord, Source
+from ScraperCommon.retry_queue import RetryQueue, drain_retry_queue
+
+
+def test_failed_listing_page_of_a_source_is_queued_for_the_db_drain(tmp_path, monkeypatch):
+    retry_queue = RetryQueue(str(tmp_path / "retry_queue.db"))
+    source = OCCSource(["recursos humanos"], pages=2, retry_queue=retry_queue)
+
+    async def load_listing_html(search_url, ready_ms, settle_ms):
+        raise TimeoutError("listing timed out")
+
+    monkeypatch.setattr(source.scraper, "load_listing_html", load_listing_html)
+
+    async def collect():
+        return [job async for job in source.iter_jobs(set())]
+
+    assert asyncio.run(collect()) == []
+    entries = retry_queue.due(include_waiting=True)
+    assert [(entry["url"], entry["kind"]) for entry in entries] == [
+        (occ_listing_url("recursos humanos", 1), "occ_listing_db"),
+        (occ_listing_url("recursos humanos", 2), "occ_listing_db"),
+    ]
+    assert entries[0]["context"] == {"keyword": "recursos humanos", "page": 1}
+    retry_queue.close()
+
+
+def test_db_drain_recovers_queued_listing_pages(tmp_path):
+    retry_queue = RetryQueue(str(tmp_path / "retry_queue.db"), base_delay=0)
+    url = occ_listing_url("nomina", 3)
+    retry_queue.add(url, "occ_listing_db", {"keyword": "nomina", "page": 3}, "timeout")
+    jobs = [JobRecord(title="Analista de nómina", link="https://www.occ.com.mx/empleos/empleo-1/", source=Source.OCC),
+            JobRecord(title="Auxiliar de RH", link="https://www.occ.com.mx/empleos/empleo-2/", source=Source.OCC)]
+    saved = []
+
+    class Runner:
+        async def run(self, method, keyword, page, known_links=None):
+            assert (method, keyword, page) == ("load_jobs_page", "nomina", 3)
+            return jobs
+
+    async def upsert(new_jobs):
+        saved.extend(new_jobs)
+
+    known_links = {jobs[0]["link"]}
+    handlers = occ_retry_handlers(Runner(), upsert, known_links, save_target="db")
+    summary = asyncio.run(drain_retry_queue(retry_queue, handlers))
+
+    assert summary["recovered"] == 1
+    assert [job["link"] for job in saved] == [jobs[1]["link"]]
+    assert retry_queue.stats()["pending"] == 0
+    retry_queue.close()
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from OCCMexicoScraper import scraper_occ
+from OCCMexicoScraper.scraper_occ import OCCScraperSession
+
+
+class FakeScraper:
+    """Stands in for OCCScraper: no browser, calls wait on the test's events"""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.fetch_stats = scraper_occ.Counter()
+        self.closed = False
+        self.healthy = True
+        self.calls = []
+        FakeScraper.instances.append(self)
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    def is_healthy(self):
+        return self.healthy and not self.closed
+
+    async def load(self, release=None, error=None):
+        assert not self.closed, "call on a closed scraper"
+        self.calls.append(error)
+        if release is not None:
+            await release.wait()
+        assert not self.closed, "scraper closed during the call"
+        if error is not None:
+            raise error
+        return self
+
+
+@pytest.fixture(autouse=True)
+def fake_scraper(monkeypatch):
+    FakeScraper.instances = []
+    monkeypatch.setattr(scraper_occ, "OCCScraper", FakeScraper)
+
+
+def test_recycle_waits_for_calls_still_running_on_the_old_browser():
+    async def scenario():
+        async with OCCScraperSession(recycle_after=1) as session:
+            release = asyncio.Event()
+            slow = asyncio.create_task(session.run("load", release))
+            await asyncio.sleep(0)
+            first = FakeScraper.instances[0]
+
+            # The second call recycles the browser while the first is still loading
+            second = await session.run("load")
+            assert second is not first
+            assert not first.closed
+
+            release.set()
+            assert await slow is first
+            assert first.closed
+            assert not second.closed
+        assert second.closed
+
+    asyncio.run(scenario())
+
+
+def test_recycle_closes_an_idle_browser_right_away():
+    async def scenario():
+        async with OCCScraperSession(recycle_after=2) as session:
+            for _ in range(5):
+                await session.run("load")
+            assert [scraper.closed for scraper in FakeScraper.instances] == [True, True, False]
+            assert session.restarts == 0
+
+    asyncio.run(scenario())
+
+
+def test_page_error_on_a_live_browser_is_retried_without_a_restart():
+    async def scenario():
+        async with OCCScraperSession() as session:
+            scraper = session.scraper
+            errors = [TimeoutError("page timed out")]
+
+            async def flaky_load():
+                if errors:
+                    raise errors.pop()
+                return scraper
+
+            scraper.flaky_load = flaky_load
+            assert await session.run("flaky_load") is scraper
+            with pytest.raises(TimeoutError):
+                await session.run("load", error=TimeoutError("page timed out"))
+            assert len(scraper.calls) == 2
+            assert session.restarts == 0
+            assert session.scraper is scraper and not scraper.closed
+
+    asyncio.run(scenario())
+
+
+def test_error_from_a_dead_browser_restarts_it_once_for_all_tasks():
+    async def scenario():
+        async with OCCScraperSession() as session:
+            first = session.scraper
+            release = asyncio.Event()
+
+            async def crash():
+                await release.wait()
+                first.healthy = False
+                raise RuntimeError("Target closed")
+
+            first.load = crash
+            tasks = [asyncio.create_task(session.run("load")) for _ in range(3)]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*tasks)
+
+            second = session.scraper
+            assert results == [second] * 3
+            assert session.restarts == 1
+            assert first.closed
+            assert len(FakeScraper.instances) == 2
+
+    asyncio.run(scenario())
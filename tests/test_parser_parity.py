@@ -0,0 +1,34 @@
+import asyncio
+
+from check_parser_parity import EXTRACTORS, FIXTURES_DIR, REFERENCE, check_parser_parity
+from OCCMexicoScraper.scraper_occ import OCCScraper
+
+
+def read_fixture(name):
+    with open(f"{FIXTURES_DIR}/{name}", 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def extract(kind, name):
+    extractor, _ = EXTRACTORS[kind]
+    return asyncio.run(extractor(OCCScraper(), read_fixture(name), *REFERENCE))
+
+
+def test_backends_agree_on_fixtures():
+    assert asyncio.run(check_parser_parity(FIXTURES_DIR))
+
+
+def test_fixtures_yield_jobs():
+    # Parity over empty extractions would prove nothing
+    occ_jobs = extract("occ_listing", "occ_listing_1.html")
+    assert len(occ_jobs) == 4
+    assert all(job["title"] and job["link"] for job in occ_jobs)
+
+    computrabajo_jobs = extract("computrabajo_listing", "computrabajo_listing_1.html")
+    assert len(computrabajo_jobs) == 3
+    assert all(job["title"] and job["link"] for job in computrabajo_jobs)
+
+    for kind, name in [("occ_detail", "occ_detail_1.html"), ("occ_detail", "occ_detail_2.html"),
+                       ("computrabajo_detail", "computrabajo_detail_1.html"),
+                       ("computrabajo_detail", "computrabajo_detail_2.html")]:
+        assert extract(kind, name), name
@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+
+import drain_retry_queue as drain_script
+from ScraperCommon import retry_queue as retry_queue_module
+from ScraperCommon.retry_queue import CircuitBreaker, RetryQueue, drain_retry_queue
+
+LISTING = "https://www.occ.com.mx/empleos/de-rh/?page=2"
+DETAIL = "https://www.computrabajo.com.mx/ofertas-de-trabajo/oferta-1"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(retry_queue_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = RetryQueue(str(tmp_path / "retry_queue.db"), base_delay=60, max_delay=600, max_attempts=3)
+    yield queue
+    queue.close()
+
+
+def test_entry_is_due_after_its_backoff_and_done_once_recovered(queue, clock):
+    queue.add(LISTING, "occ_listing", {"keyword": "rh", "page": 2}, "timeout")
+    assert queue.due() == []
+    assert queue.next_due_in() == 60
+
+    clock.now += 60
+    [entry] = queue.due()
+    assert (entry["url"], entry["kind"], entry["attempts"]) == (LISTING, "occ_listing", 1)
+    assert entry["context"] == {"keyword": "rh", "page": 2}
+    assert queue.due(["computrabajo_detail"]) == []
+
+    queue.succeed(LISTING)
+    assert queue.due(include_waiting=True) == []
+    assert queue.next_due_in() is None
+    assert queue.stats() == {"pending": 0, "recovered": 1, "gave_up": 0, "failures": 1}
+
+
+def test_backoff_doubles_up_to_max_delay(queue):
+    assert [queue.backoff(attempts) for attempts in range(1, 7)] == [60, 120, 240, 480, 600, 600]
+
+
+def test_repeated_failures_back_off_and_give_up(queue, clock):
+    queue.add(DETAIL, "computrabajo_detail", {"title": "Analista"}, "HTTP 503")
+    clock.now += 60
+    queue.fail(DETAIL, "HTTP 503")
+    [entry] = queue.due(include_waiting=True)
+    assert entry["attempts"] == 2
+    assert entry["next_attempt"] == clock.now + 120
+    # fail() keeps the context recorded by the first failure
+    assert entry["context"] == {"title": "Analista"}
+
+    clock.now += 120
+    queue.fail(DETAIL, "HTTP 503")
+    assert queue.due(include_waiting=True) == []
+    assert queue.stats() == {"pending": 0, "recovered": 0, "gave_up": 1, "failures": 3}
+
+
+def test_page_failing_again_after_recovery_starts_a_new_series(queue, clock):
+    queue.add(LISTING, "occ_listing", error="timeout")
+    queue.add(LISTING, "occ_listing", error="timeout")
+    queue.succeed(LISTING)
+    queue.add(LISTING, "occ_listing", error="timeout")
+    [entry] = queue.due(include_waiting=True)
+    assert entry["attempts"] == 1
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_reset(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_after=300)
+    breaker.record(LISTING, ok=False)
+    assert breaker.allow(LISTING)
+    breaker.record(LISTING, ok=False)
+    assert not breaker.allow(LISTING)
+    assert breaker.open_hosts() == ["www.occ.com.mx"]
+    # Other hosts are not affected
+    assert breaker.allow(DETAIL)
+
+    clock.now += 300
+    assert breaker.allow(LISTING)  # the half-open probe
+    breaker.record(LISTING, ok=False)
+    assert not breaker.allow(LISTING)
+
+    clock.now += 300
+    assert breaker.allow(LISTING)
+    breaker.record(LISTING, ok=True)
+    breaker.record(LISTING, ok=False)
+    assert breaker.allow(LISTING)
+    assert breaker.open_hosts() == []
+
+
+def test_drain_recovers_fails_and_skips_open_circuits(queue, clock):
+    queue.add(LISTING, "occ_listing", {"keyword": "rh", "page": 2}, "timeout")
+    queue.add(DETAIL, "computrabajo_detail", {}, "HTTP 503")
+    queue.add("https://www.occ.com.mx/empleos/empleo-9/", "occ_detail", {}, "timeout")
+    clock.now += 60
+    retried = []
+
+    async def listing(entry):
+        retried.append(entry["url"])
+        # Failures recorded while the handler runs are left to the drain
+        queue.add(entry["url"], entry["kind"], entry["context"], "nested failure")
+        return True
+
+    async def detail(entry):
+        retried.append(entry["url"])
+        raise RuntimeError("HTTP 503 again")
+
+    breaker = CircuitBreaker()
+    for _ in range(breaker.failure_threshold):
+        breaker.record(DETAIL, ok=False)
+    handlers = {"occ_listing": listing, "computrabajo_detail": detail}
+    summary = asyncio.run(drain_retry_queue(queue, handlers, breaker))
+
+    # occ_detail has no handler; the Computrabajo host's circuit is open
+    assert retried == [LISTING]
+    assert summary == {"retried": 1, "recovered": 1, "failed": 0, "skipped": 1}
+
+    clock.now += breaker.reset_after
+    summary = asyncio.run(drain_retry_queue(queue, handlers, breaker))
+    assert summary == {"retried": 1, "recovered": 0, "failed": 1, "skipped": 0}
+    [entry] = queue.due(["computrabajo_detail"], include_waiting=True)
+    assert entry["attempts"] == 2
+    assert entry["last_error"] == "HTTP 503 again"
+    assert not breaker.allow(DETAIL)
+    assert queue.stats()["recovered"] == 1
+
+
+def test_drain_script_waits_for_entries_until_nothing_is_pending(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(drain_script, "RETRY_QUEUE_FILE", str(tmp_path / "retry_queue.db"))
+    queue = RetryQueue(drain_script.RETRY_QUEUE_FILE)
+    queue.add(DETAIL, "computrabajo_detail", {}, "HTTP 503")
+    queue.close()
+    outcomes = [False, True]
+    sleeps = []
+
+    async def drain_once(retry_queue, source, limiter, breaker):
+        async def detail(entry):
+            return outcomes.pop(0)
+        return await drain_retry_queue(retry_queue, {"computrabajo_detail": detail}, breaker)
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(drain_script, "drain_once", drain_once)
+    monkeypatch.setattr(drain_script.asyncio, "sleep", sleep)
+    asyncio.run(drain_script.main("computrabajo", wait=True))
+
+    # Nothing due at first, then one failed retry and one that recovered the page
+    assert sleeps == [60, 120]
+    assert outcomes == []
+    queue = RetryQueue(drain_script.RETRY_QUEUE_FILE)
+    assert queue.stats() == {"pending": 0, "recovered": 1, "gave_up": 0, "failures": 2}
+    queue.close()
@@ -0,0 +1,112 @@
+import asyncio
+
+from OCCMexicoScraper.scheduler import CrawlScheduler
+
+
+def run(scheduler, yields, should_stop=None):
+    """Run scheduler on one worker; yields maps keyword -> page -> (cards, new_jobs)"""
+    crawled = []
+
+    async def process_unit(keyword_idx, keyword, page):
+        crawled.append((keyword, page))
+        result = yields[keyword](page)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    summary = asyncio.run(scheduler.run(process_unit, should_stop))
+    return crawled, summary
+
+
+def test_low_yield_keyword_is_cut_and_its_pages_redistributed():
+    scheduler = CrawlScheduler(["dry", "rich"], pages_per_keyword=5, workers=1)
+    crawled, summary = run(scheduler, {"dry": lambda page: (20, 0), "rich": lambda page: (20, 5)})
+
+    assert crawled == [("dry", 1), ("dry", 2), ("dry", 3)] + [("rich", page) for page in range(1, 8)]
+    assert summary["cut_keywords"] == {"dry": "no new jobs in the last 3 pages"}
+    assert summary["extra_pages"] == {"rich": 2}
+    assert summary["pages_used"] == summary["page_budget"] == 10
+
+
+def test_empty_page_stops_keyword_and_extra_pages_are_capped():
+    scheduler = CrawlScheduler(["gone", "rich"], pages_per_keyword=3, workers=1, max_pages_per_keyword=4)
+    crawled, summary = run(scheduler, {"gone": lambda page: (0, 0), "rich": lambda page: (20, 5)})
+
+    assert crawled == [("gone", 1), ("rich", 1), ("rich", 2), ("rich", 3), ("rich", 4)]
+    assert summary["cut_keywords"] == {"gone": "no cards on page 1"}
+    assert summary["extra_pages"] == {"rich": 1}
+    assert summary["pages_used"] == 5
+
+
+def test_extra_pages_go_to_the_best_yielding_keyword_first():
+    scheduler = CrawlScheduler(["gone", "some", "most"], pages_per_keyword=2, workers=1)
+    crawled, summary = run(scheduler, {
+        "gone": lambda page: (0, 0),
+        "some": lambda page: (20, 1),
+        "most": lambda page: (20, 8),
+    })
+
+    assert crawled[-1] == ("most", 3)
+    assert summary["extra_pages"] == {"most": 1}
+
+
+def test_pruned_keywords_get_no_pages_or_budget():
+    scheduler = CrawlScheduler(["kept", "pruned"], pages_per_keyword=3, workers=1,
+                               pruned_keywords=["pruned", "not a keyword"])
+    crawled, summary = run(scheduler, {"kept": lambda page: (20, 5), "pruned": lambda page: (20, 5)})
+
+    assert crawled == [("kept", 1), ("kept", 2), ("kept", 3)]
+    assert summary["page_budget"] == 3
+    assert summary["cut_keywords"] == {"pruned": "pruned by the keyword plan"}
+    assert summary["extra_pages"] == {}
+
+
+def test_done_pages_are_skipped_but_use_budget():
+    done = {(1, 1), (1, 2)}
+    scheduler = CrawlScheduler(["resumed"], pages_per_keyword=4, workers=1,
+                               is_done=lambda keyword_idx, page: (keyword_idx, page) in done)
+    crawled, summary = run(scheduler, {"resumed": lambda page: (20, 5)})
+
+    assert crawled == [("resumed", 3), ("resumed", 4)]
+    assert summary["skipped"] == 2
+    assert summary["completed"] == 2
+    assert summary["pages_used"] == 4
+
+
+def test_history_keeps_a_resumed_keyword_cut():
+    history = {1: [(1, 20, 0), (2, 20, 0), (3, 20, 0)]}
+    scheduler = CrawlScheduler(["dry", "rich"], pages_per_keyword=3, workers=1, history=history,
+                               is_done=lambda keyword_idx, page: keyword_idx == 1 and page <= 3)
+    crawled, summary = run(scheduler, {"dry": lambda page: (20, 5), "rich": lambda page: (20, 5)})
+
+    assert ("dry", 4) not in crawled
+    assert summary["cut_keywords"] == {"dry": "no new jobs in the last 3 pages"}
+    assert crawled == [("rich", page) for page in range(1, 7)]
+
+
+def test_failed_units_are_counted_and_not_recorded():
+    scheduler = CrawlScheduler(["flaky"], pages_per_keyword=3, workers=1)
+    crawled, summary = run(scheduler, {"flaky": lambda page: RuntimeError("timeout") if page == 2 else (20, 5)})
+
+    assert crawled == [("flaky", 1), ("flaky", 2), ("flaky", 3)]
+    assert summary["failed"] == 1
+    assert summary["completed"] == 2
+    assert summary["cut_keywords"] == {}
+
+
+def test_should_stop_ends_the_run():
+    scheduler = CrawlScheduler(["many"], pages_per_keyword=10, workers=2)
+    crawled = []
+    crawled_now, summary = run(scheduler, {"many": lambda page: crawled.append(page) or (20, 5)},
+                               should_stop=lambda: len(crawled) >= 3)
+
+    assert len(crawled_now) < 10
+    assert summary["completed"] == len(crawled_now)
+
+
+def test_workers_never_crawl_a_page_twice():
+    scheduler = CrawlScheduler(["a", "b", "c"], pages_per_keyword=4, workers=4)
+    crawled, summary = run(scheduler, {keyword: (lambda page: (20, 5)) for keyword in "abc"})
+
+    assert len(crawled) == len(set(crawled)) == 12
+    assert summary["pages_used"] == 12
@@ -0,0 +1,105 @@
+import asyncio
+import functools
+
+import pytest
+
+import run_all_sources
+from ComputrabajoScraper import writer as writer_module
+from ComputrabajoScraper.writer import JobWriter
+from ScraperCommon.job_record import JobRecord, Source
+from ScraperCommon.sources import JobSource
+
+
+def make_jobs(count):
+    return [JobRecord(title=f"Analista {n}", link=f"https://mx.computrabajo.com/ofertas-de-trabajo/oferta-{n}",
+                      source=Source.COMPUTRABAJO) for n in range(count)]
+
+
+class FlakyDatabase:
+    """bulk_upsert_jobs stand-in that fails its first `failures` calls (all of them with None)"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+        self.saved = []
+
+    async def __call__(self, jobs, on_conflict="nothing"):
+        self.calls += 1
+        if self.failures is None or self.calls <= self.failures:
+            raise RuntimeError("database is locked")
+        self.saved.append(len(jobs))
+        return {"inserted": len(jobs), "skipped": 0}
+
+
+@pytest.fixture
+def database(monkeypatch):
+    def install(failures=0):
+        database = FlakyDatabase(failures)
+        monkeypatch.setattr(writer_module, "bulk_upsert_jobs", database)
+        return database
+    return install
+
+
+async def write(jobs, **kwargs):
+    kwargs.setdefault("retry_delay", 0)
+    async with JobWriter(**kwargs) as writer:
+        await writer.put(jobs)
+    return writer
+
+
+def test_jobs_are_saved_in_batches(database):
+    db = database()
+    writer = asyncio.run(write(make_jobs(7), batch_size=3, flush_interval=60))
+    assert db.saved == [3, 3, 1]
+    assert writer.stats() == {"inserted": 7, "skipped": 0, "batches": 3, "errors": 0, "lost": 0}
+
+
+def test_failed_batch_is_retried(database):
+    db = database(failures=1)
+    writer = asyncio.run(write(make_jobs(4), batch_size=10))
+    assert db.calls == 2
+    assert writer.stats() == {"inserted": 4, "skipped": 0, "batches": 1, "errors": 0, "lost": 0}
+
+
+def test_batch_failing_every_attempt_gets_a_last_try_on_close(database):
+    # Both attempts of the first batch fail; the set-aside batch is saved on close
+    db = database(failures=2)
+    writer = asyncio.run(write(make_jobs(5), batch_size=3, flush_interval=60, save_attempts=2))
+    assert db.saved == [2, 3]
+    assert writer.stats() == {"inserted": 5, "skipped": 0, "batches": 2, "errors": 0, "lost": 0}
+
+
+def test_batches_that_never_save_are_counted_as_lost(database):
+    db = database(failures=None)
+    writer = asyncio.run(write(make_jobs(5), batch_size=2, flush_interval=60, save_attempts=2))
+    # 3 batches x 2 attempts during the run, and again on close
+    assert db.calls == 12
+    assert writer.stats() == {"inserted": 0, "skipped": 0, "batches": 0, "errors": 3, "lost": 5}
+
+
+class FakeSource(JobSource):
+    name = "fake"
+
+    async def iter_jobs(self, known_links=None):
+        for job in make_jobs(3):
+            yield job
+
+
+@pytest.mark.parametrize("failures, status", [(0, 0), (None, 1)])
+def test_run_all_sources_exits_non_zero_when_jobs_are_lost(database, monkeypatch, tmp_path, failures, status):
+    database(failures)
+    monkeypatch.chdir(tmp_path)
+
+    async def init_db():
+        pass
+
+    async def load_known_links():
+        return set()
+
+    monkeypatch.setattr(run_all_sources, "init_db", init_db)
+    monkeypatch.setattr(run_all_sources, "load_known_links", load_known_links)
+    monkeypatch.setattr(run_all_sources, "build_sources", lambda cache, retry_queue: [FakeSource()])
+    # Keep the test fast: no pause between save attempts
+    monkeypatch.setattr(run_all_sources, "JobWriter", functools.partial(JobWriter, retry_delay=0))
+
+    assert run_all_sources.main() == status